@@ -1,3 +1,3 @@
-from .datacollector import DataCollector, DataGroup
+from .datacollector import DataCollector, DataGroup, ResultAccumulator
 from .graphic import GraphicGenerator
-from .simulations_functions import asyncSimulations_Linux, asyncSimulations
\ No newline at end of file
+from .simulations_functions import asyncSimulations_Linux, asyncSimulations, sweepSimulations_Linux
\ No newline at end of file
@@ -0,0 +1,106 @@
+import os
+import json
+
+import pandas as pd
+
+
+def _jsonValue(value):
+    # NumPy scalars and other values that json doesn't know
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class RunCheckpoint:
+    """
+    Append-only store of the finished runs of a sweep
+
+    Each finished run is written as one JSON line with the parameter point key, the run index and
+    the run summary row, and flushed to disk right away. A truncated last line, left by a crash
+    while writing, is dropped when the file is opened again.
+
+    Args:
+        path: Path of the JSONL file, created if it doesn't exist
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._rows: dict[str, dict[int, dict]] = {}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb+') as file:
+            content = file.read()
+            # Drops a line left incomplete by a crash, so new lines don't get glued to it
+            end = content.rfind(b'\n') + 1
+            if end < len(content):
+                file.truncate(end)
+        for line in content[:end].decode('utf-8').splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self._rows.setdefault(entry['point'], {})[entry['run']] = entry['row']
+
+    def __len__(self) -> int:
+        return sum(len(runs) for runs in self._rows.values())
+
+    def completed(self, point: str) -> set[int]:
+        """
+        Runs of a point that are already stored
+
+        Args:
+            point: Parameter point key
+
+        Returns:
+            set: Run indexes
+        """
+        return set(self._rows.get(point, {}))
+
+    def append(self, point: str, run: int, row: dict) -> None:
+        """
+        Store the summary row of a finished run
+
+        Args:
+            point: Parameter point key
+            run: Run index inside the point
+            row: Summary of the run, one value per column
+        """
+        line = json.dumps({'point': point, 'run': run, 'row': row}, default=_jsonValue)
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(line + '\n')
+            file.flush()
+            os.fsync(file.fileno())
+        self._rows.setdefault(point, {})[run] = row
+
+    def append_records(self, point: str, run_offset: int, records: list[dict]) -> None:
+        """
+        Store the rows of consecutive runs
+
+        Args:
+            point: Parameter point key
+            run_offset: Index of the run of the first row
+            records: One dict of column and value per run
+        """
+        for position, row in enumerate(records):
+            self.append(point, run_offset + position, row)
+
+    def rows(self, point: str, runs: list[int] | None = None) -> pd.DataFrame:
+        """
+        Stored rows of a point as a DataFrame indexed by run
+
+        Args:
+            point: Parameter point key
+            runs (optional): Runs to return, default is all stored runs of the point
+
+        Returns:
+            DataFrame: One row per run, in the order of the runs
+        """
+        stored = self._rows.get(point, {})
+        if runs is None:
+            runs = sorted(stored)
+        return pd.DataFrame([stored[run] for run in runs], index=runs)
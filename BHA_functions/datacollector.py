@@ -262,6 +262,71 @@ class DataGroup:
         """
         return self._group.pop(indexgroup)
 
+class ResultAccumulator:
+    """
+    Columnar accumulator of simulation results, one list per column and one value per run
+
+    Rows are appended as plain tuples, so no DataFrame is built until to_DataFrame is called.
+
+    Args:
+        columns (required): Names of the columns, in the order of the values of each row
+    """
+    def __init__(self, columns: list[str]) -> None:
+        self.columns: list[str] = list(columns)
+        self.data: dict[str, list] = {column: [] for column in self.columns}
+
+    def __len__(self) -> int:
+        return len(self.data[self.columns[0]]) if self.columns else 0
+
+    def append(self, row: tuple) -> None:
+        """
+        Add the results of one run
+
+        Args:
+            row (required): One value per column
+        """
+        for column, value in zip(self.columns, row):
+            self.data[column].append(value)
+
+    def extend(self, other: 'ResultAccumulator') -> None:
+        """
+        Add all runs of another accumulator with the same columns
+
+        Args:
+            other (required): Accumulator to add
+        """
+        if other.columns != self.columns:
+            raise Exception("Os acumuladores não têm as mesmas colunas")
+        for column in self.columns:
+            self.data[column].extend(other.data[column])
+
+    def rows(self) -> list[tuple]:
+        """
+        Runs as tuples, in the order of the columns
+
+        Returns:
+            list: One tuple per run
+        """
+        return list(zip(*self.data.values()))
+
+    def records(self) -> list[dict]:
+        """
+        Runs as dicts of column and value
+
+        Returns:
+            list: One dict per run
+        """
+        return [dict(zip(self.columns, row)) for row in zip(*self.data.values())]
+
+    def to_DataFrame(self) -> pd.DataFrame:
+        """
+        Build the DataFrame of all runs
+
+        Returns:
+            DataFrame: One row per run
+        """
+        return pd.DataFrame(self.data, columns=self.columns)
+
 if __name__ == '__main__':
     a: DataGroup = DataGroup()
 
@@ -288,4 +353,4 @@ if __name__ == '__main__':
     print(a + b)
 
     for value in a:
-        print(value)
\ No newline at end of file
+        print(value)
@@ -0,0 +1,131 @@
+import os
+import glob
+
+import numpy as np
+import pandas as pd
+
+
+class RequestLog:
+    """
+    Compact on-disk log of the requests of a simulation
+
+    Each request is one row of integer columns (Alice, Bob, route id, outcome and attempts), kept in
+    preallocated arrays and written to requests_<n>.npz files in chunks. Routes are interned: each
+    distinct route is stored once in routes.npz, as a flat array of nodes with the offsets of each route.
+
+    Args:
+        path: Directory of the log, created if it doesn't exist
+        chunk_size (optional): Number of requests per file
+    """
+    COLUMNS = {
+        'alice': np.int32,
+        'bob': np.int32,
+        'route': np.int32,      # Id in the route table, -1 if there was no route
+        'entangled': np.int8,   # 1 success, 0 swapping failure, -1 impossible
+        'attempts': np.int32,
+    }
+
+    def __init__(self, path: str, chunk_size: int = 4096) -> None:
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.chunk_size = chunk_size
+        self._buffers = {name: np.empty(chunk_size, dtype=dtype) for name, dtype in self.COLUMNS.items()}
+        self._size = 0
+        self._chunk_count = 0
+        self._route_ids: dict[tuple, int] = {}
+        self._routes: list[tuple] = []
+
+    def __enter__(self) -> 'RequestLog':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def route_id(self, route: list | None) -> int:
+        """
+        Id of a route in the route table, adding it if it is new
+
+        Args:
+            route: List of nodes, or None
+
+        Returns:
+            int: Id of the route, -1 if route is None
+        """
+        if route is None:
+            return -1
+        key = tuple(route)
+        route_id = self._route_ids.get(key)
+        if route_id is None:
+            route_id = self._route_ids[key] = len(self._routes)
+            self._routes.append(key)
+        return route_id
+
+    def record(self, alice: int, bob: int, route: list | None, entangled: int, attempts: int) -> None:
+        """
+        Add one request to the log
+
+        Args:
+            alice: Id of Alice
+            bob: Id of Bob
+            route: Route of the request, or None
+            entangled: Outcome of the request
+            attempts: Number of attempts
+        """
+        i = self._size
+        self._buffers['alice'][i] = alice
+        self._buffers['bob'][i] = bob
+        self._buffers['route'][i] = self.route_id(route)
+        self._buffers['entangled'][i] = entangled
+        self._buffers['attempts'][i] = attempts
+        self._size = i + 1
+        if self._size == self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the buffered requests to a new chunk file
+        """
+        if self._size == 0:
+            return
+        chunk = {name: buffer[:self._size] for name, buffer in self._buffers.items()}
+        np.savez(os.path.join(self.path, f'requests_{self._chunk_count:06d}.npz'), **chunk)
+        self._chunk_count += 1
+        self._size = 0
+
+    def close(self) -> None:
+        """
+        Write the pending requests and the route table
+        """
+        self.flush()
+        lengths = np.array([len(route) for route in self._routes], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        nodes = np.fromiter((node for route in self._routes for node in route), dtype=np.int32, count=int(offsets[-1]))
+        np.savez(os.path.join(self.path, 'routes.npz'), nodes=nodes, offsets=offsets)
+
+    @classmethod
+    def load(cls, path: str, routes: bool = True) -> pd.DataFrame:
+        """
+        Read a request log
+
+        Args:
+            path: Directory of the log
+            routes (optional): If True the route ids are replaced by the lists of nodes
+
+        Returns:
+            DataFrame: One request per row, in order
+        """
+        chunks = []
+        for file in sorted(glob.glob(os.path.join(path, 'requests_*.npz'))):
+            with np.load(file) as data:
+                chunks.append({name: data[name] for name in cls.COLUMNS})
+        if chunks:
+            df = pd.DataFrame({name: np.concatenate([chunk[name] for chunk in chunks]) for name in cls.COLUMNS})
+        else:
+            df = pd.DataFrame({name: np.empty(0, dtype=dtype) for name, dtype in cls.COLUMNS.items()})
+
+        if routes:
+            with np.load(os.path.join(path, 'routes.npz')) as data:
+                nodes, offsets = data['nodes'], data['offsets']
+            table = [nodes[offsets[i]:offsets[i + 1]].tolist() for i in range(len(offsets) - 1)]
+            df['route'] = [table[route_id] if route_id >= 0 else None for route_id in df['route'].tolist()]
+        return df
@@ -1,18 +1,31 @@
 from quantumnet.components import Network, Host
 from quantumnet.objects import Logger, Qubit
 
-from random import randint, choice, uniform
+import random
 from copy import copy
+from functools import partial
 
 # For collect data
+import numpy as np
 import pandas as pd
 
 # For async run
 import asyncio
-from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # For collect Data
-from BHA_functions.datacollector import DataCollector
+from BHA_functions.datacollector import DataCollector, ResultAccumulator
+
+# For logs and traces of the worker processes
+from BHA_functions.worker_logging import (LogAggregator, init_worker_logging, flush_worker_logs, set_run_context,
+                                          point_key, trace_run_path, write_point_params)
+
+# For resume of sweeps
+from BHA_functions.checkpoint import RunCheckpoint
+
+# For the per-request log
+from BHA_functions.request_log import RequestLog
 
 # For the simulation BenchMark
 from datetime import datetime
@@ -30,6 +43,7 @@ def initNetwork(
                 topology_args: tuple,
                 simulation_log: bool = False,
                 simulator_log: bool = False,
+                seed: int | np.random.SeedSequence | None = None,
                 ) -> Network:
     """
     Will initiate the network
@@ -40,12 +54,13 @@ def initNetwork(
         topology_args: Is a tuple with all args to selected the topology
         simulation_log: If True will activate logs of simulation
         simulator_log: If True will activate logs of simulator
+        seed: Root seed of the network random generators, if None uses fresh entropy
 
     Returns:
         Network: Will return the Network
     """
     # Defining the network
-    network = Network()
+    network = Network(seed=seed)
 
     # Defining the topology
     topology = topology.lower()
@@ -89,7 +104,7 @@ def selectBlackHoles(network: Network,
         for host in range(0, num_black_holes):
             valid = False
             while not valid:
-                black_hole = choice(all_hosts)
+                black_hole = network.rng.choice(all_hosts)
                 if black_hole not in black_hole_list:
                     black_hole.setBlackHole(black_hole=True)
                     valid = True
@@ -101,7 +116,7 @@ def selectBlackHoles(network: Network,
             for black_hole in black_hole_list:
                 valid = False
                 while not valid:
-                    target = choice(all_hosts)
+                    target = network.rng.choice(all_hosts)
                     if target not in black_hole_list:
                         black_hole.addBlackHoleTarget(target=target)
                         valid = True
@@ -128,7 +143,7 @@ def selectAliceBob(network: Network,
     """
     valid = False
     while not valid:
-        alice_id = randint(0, len(network.hosts)-1)
+        alice_id = network.rng.randint(0, len(network.hosts)-1)
         alice = network.get_host(alice_id)
         if alice not in black_hole_list:
             valid = True
@@ -137,7 +152,7 @@ def selectAliceBob(network: Network,
 
     valid = False
     while not valid:
-        bob_id = randint(0, len(network.hosts)-1)
+        bob_id = network.rng.randint(0, len(network.hosts)-1)
         bob = network.get_host(bob_id)
         if bob_id != alice_id:
             valid = True
@@ -197,7 +212,8 @@ def setNetworkSwappProb(network: Network,
 
 def addQubits(host_A: Host, 
                 host_B: Host, 
-                counter: int) -> int:
+                counter: int,
+                rng: random.Random | None = None) -> int:
     """
     Will add qubits to both hosts
 
@@ -205,16 +221,18 @@ def addQubits(host_A: Host,
         host_A: Host that wants to add the qubit
         host_B: Host that wants to add the qubit
         counter: Counter to index qubits
+        rng: Random generator of the network, if None uses the random module
 
     Returns:
         Counter: Return updated counter
     """
+    rng = rng if rng is not None else random
     temp_qubit_counter = counter
     
-    qubit = Qubit(temp_qubit_counter, uniform(0.8, 1))
+    qubit = Qubit(temp_qubit_counter, rng.uniform(0.8, 1))
     host_A.add_qubit(qubit)
 
-    qubit = Qubit(temp_qubit_counter+1, uniform(0.8, 1))
+    qubit = Qubit(temp_qubit_counter+1, rng.uniform(0.8, 1))
     host_B.add_qubit(qubit)
 
     temp_qubit_counter += 2
@@ -253,8 +271,8 @@ def createEntanglements(route: list,
         while not entangled:
 
             # If dont't have qubit on memory will add
-            if host_A.memory == [] or host_B.memory == []:
-                temp_qubit_counter = addQubits(host_A=host_A, host_B=host_B, counter=temp_qubit_counter)
+            if not host_A.memory or not host_B.memory:
+                temp_qubit_counter = addQubits(host_A=host_A, host_B=host_B, counter=temp_qubit_counter, rng=network.rng)
             if log:
                 print(f"Tentativa de entanglement entre {host_A} e {host_B}")
 
@@ -262,7 +280,7 @@ def createEntanglements(route: list,
             entangled = network.physical.entanglement_creation_heralding_protocol(host_A, host_B)
 
             if not entangled:
-                temp_qubit_counter = addQubits(host_A=host_A, host_B=host_B, counter=temp_qubit_counter)
+                temp_qubit_counter = addQubits(host_A=host_A, host_B=host_B, counter=temp_qubit_counter, rng=network.rng)
                 
         # Update counter to qubit index
         qubit_counter += temp_qubit_counter
@@ -285,8 +303,10 @@ def replenishNetwork(network: Network,
     """
     if log:
         print("Repondo os recursos da rede")
-    for edge in edges:
-        createEntanglements(route=edge, network=network, number_of_entanglements=number_of_entanglements, log=log)
+        for edge in edges:
+            createEntanglements(route=edge, network=network, number_of_entanglements=number_of_entanglements, log=log)
+    else:
+        network.physical.bulk_entanglement_generation(edges=edges, number_of_entanglements=number_of_entanglements)
 
 def createRequest(network: Network, 
                   alice: Host, 
@@ -328,52 +348,70 @@ def createRequest(network: Network,
 
     return entangled, counter
 
-def collectDataFrame(data: dict, 
-                     index: int) -> pd.DataFrame:
+# Columns of the summary of each simulation
+RESULT_COLUMNS = [
+    "Requests",
+    "Topology",
+    "Number of Nodes",
+    "Success Tax",
+    "Swapp Error Tax",
+    "Impossible Swapp Tax",
+    "Average Attempts",
+    "Used Eprs",
+    "Avg Fidelity Route",
+    "Black Holes",
+]
+
+def summaryRow(data: dict) -> tuple:
     """
-    Will create a pandas DataFrame to analyze data of simulation
+    Will summarize the simulation in one row
 
     Args:
-        data: Dict with all simulation informations
-        index: Index of DataFrame row
+        data: Dict with all simulation informations, with the request counters in data['Summary'] or
+              each request in data['Requests']
 
     Returns:
-        DataFrame: DataFrame with all simulation informations
+        tuple: One value per column of RESULT_COLUMNS
     """
-    success = impossible = fail = attempts = 0
-    for run in data['Requests']:
-        if data['Requests'][run]['Entangled'] == 1:
-                success += 1
-        elif data['Requests'][run]['Entangled'] == -1:
-                impossible += 1
-        elif data['Requests'][run]['Entangled'] == 0:
-                fail += 1
-    
-        attempts += data['Requests'][run]['Attempts']
+    if 'Summary' in data:
+        summary = data['Summary']
+        runs, success, fail = summary['Requests'], summary['Success'], summary['Fail']
+        impossible, attempts = summary['Impossible'], summary['Attempts']
+    else:
+        success = impossible = fail = attempts = 0
+        for run in data['Requests']:
+            if data['Requests'][run]['Entangled'] == 1:
+                    success += 1
+            elif data['Requests'][run]['Entangled'] == -1:
+                    impossible += 1
+            elif data['Requests'][run]['Entangled'] == 0:
+                    fail += 1
         
-    runs = len(data['Requests'].keys())
+            attempts += data['Requests'][run]['Attempts']
+            
+        runs = len(data['Requests'].keys())
 
     success_tax = (success/runs) * 100
     impossible_tax = (impossible/runs) * 100
     fail_tax = (fail/runs) * 100
     avg_attempts = attempts/runs
 
-    data_df = {
-    "Requests":[runs],
-    "Topology":[data['Topology']],
-    "Number of Nodes":[data['Number of Nodes']],
-    "Success Tax":[success_tax],
-    "Swapp Error Tax":[fail_tax],
-    "Impossible Swapp Tax":[impossible_tax],
-    "Average Attempts":[avg_attempts],
-    "Used Eprs":[data['Used Eprs']],
-    "Avg Fidelity Route":[data["Avg Fidelity Route"]],
-    "Black Holes":[len(data["Black Holes"])]
-    }
+    return (runs, data['Topology'], data['Number of Nodes'], success_tax, fail_tax, impossible_tax,
+            avg_attempts, data['Used Eprs'], data["Avg Fidelity Route"], len(data["Black Holes"]))
 
-    data_df = pd.DataFrame(data_df, index=[index])
+def collectDataFrame(data: dict, 
+                     index: int) -> pd.DataFrame:
+    """
+    Will create a pandas DataFrame to analyze data of simulation
 
-    return data_df
+    Args:
+        data: Dict with all simulation informations
+        index: Index of DataFrame row
+
+    Returns:
+        DataFrame: DataFrame with all simulation informations
+    """
+    return pd.DataFrame([summaryRow(data)], columns=RESULT_COLUMNS, index=[index])
 
 def simulation(
         topology: str,
@@ -389,6 +427,13 @@ def simulation(
         data_Frame_index: int = 1,
         simulation_log: bool = False,
         simulator_log: bool = False,
+        routing_mode: str = 'shortest',
+        routing_weight: str | None = None,
+        trace_path: str | None = None,
+        seed: int | np.random.SeedSequence | None = None,
+        row_only: bool = False,
+        summary_only: bool = False,
+        request_log: str | None = None,
         ) -> dict:
         """Run the simulation with the desired parameters
 
@@ -406,6 +451,13 @@ def simulation(
                 data_Frame_index: Index of pandas DataFrame
                 simulation_log: If True will activate logs of simulation
                 simulator_log: If True will activate logs of simulator
+                routing_mode: 'shortest' uses the physical shortest path, 'available' only routes through channels with EPRs
+                routing_weight: Edge weight of 'available' routing: None (hops), 'inventory' or 'fidelity'
+                trace_path: If set, protocol events are recorded to .npz chunks in this directory (see TraceRecorder)
+                seed: Root seed of the run, the same seed reproduces the same run
+                row_only: If True returns only the summary row (see summaryRow), without building a DataFrame
+                summary_only: If True only the request counters are kept (data['Summary']), without data['Requests']
+                request_log: If set, each request is written to a compact log in this directory (see RequestLog)
 
 
             Returns:
@@ -418,8 +470,16 @@ def simulation(
                               topology_args=topology_args,
                               simulation_log=simulation_log,
                               simulator_log=simulator_log,
+                              seed=seed,
                               )
 
+        # Set routing mode
+        network.networklayer.set_routing_mode(mode=routing_mode, weight=routing_weight)
+
+        # Record protocol events
+        if trace_path is not None:
+                network.trace.start(trace_path)
+
         # Set real edges
         real_edges = network.edges
 
@@ -453,8 +513,16 @@ def simulation(
         # Add average fidelity of route
         data["Avg Fidelity Route"] = 0
 
+        # Counters of the requests
+        summary = {"Requests": 0, "Success": 0, "Fail": 0, "Impossible": 0, "Attempts": 0}
+        data["Summary"] = summary
+
         # Add hash to requests
-        data["Requests"] = {}
+        if not summary_only:
+                data["Requests"] = {}
+
+        # Per-request log on disk
+        log = RequestLog(request_log) if request_log is not None else None
 
         # Run requests
         for request in range(0, requests):
@@ -478,10 +546,25 @@ def simulation(
                                                             route=route, log=simulation_log)
 
                 # Collect request data
-                data['Requests'][f"request:{request+1}"] = {"Alice & Bob": [alice.host_id, bob.host_id], 
-                                                            "Route": route, 
-                                                            "Entangled": entangled, 
-                                                            "Attempts": attempts_counter}
+                summary["Requests"] += 1
+                summary["Attempts"] += attempts_counter
+                if entangled == 1:
+                        summary["Success"] += 1
+                elif entangled == -1:
+                        summary["Impossible"] += 1
+                elif entangled == 0:
+                        summary["Fail"] += 1
+
+                if not summary_only:
+                        data['Requests'][f"request:{request+1}"] = {"Alice & Bob": [alice.host_id, bob.host_id], 
+                                                                    "Route": route, 
+                                                                    "Entangled": entangled, 
+                                                                    "Attempts": attempts_counter}
+                if log is not None:
+                        log.record(alice.host_id, bob.host_id, route, entangled, attempts_counter)
+
+        if log is not None:
+                log.close()
 
         # Add eprs data
         data["Used Eprs"] = network.get_total_useds_eprs()
@@ -489,6 +572,12 @@ def simulation(
         # Collect data of Average fidelity route
         data["Avg Fidelity Route"] = network.avg_fidelity_route
 
+        # Write the remaining events
+        network.trace.stop()
+
+        if row_only:
+                return summaryRow(data)
+
         # Collect to the Data Frame
         data_df = collectDataFrame(data=data, index=data_Frame_index)
         
@@ -507,6 +596,11 @@ async def runSimulations(
         num_black_holes: int = 1, 
         black_hole_prob: float | None = None,
         black_hole_target: bool = False,
+        routing_mode: str = 'shortest',
+        routing_weight: str | None = None,
+        run_offset: int = 0,
+        point: str | None = None,
+        seed: int | None = None,
         ) -> pd.DataFrame:
     '''
     Will run some simulations and collect data with pandas DataFrame        
@@ -523,14 +617,19 @@ async def runSimulations(
         num_black_holes: Number of Black Holes in the network
         black_hole_prob: Malicious host probability
         black_hole_target: If True each black hole will have one target, else, each Black Hole will attack the entire network
+        routing_mode: 'shortest' uses the physical shortest path, 'available' only routes through channels with EPRs
+        routing_weight: Edge weight of 'available' routing: None (hops), 'inventory' or 'fidelity'
+        run_offset: Index of the first run inside the parameter point
+        point: Parameter point key (see worker_logging.point_key)
+        seed: Seed of the sweep, each run is seeded from (seed, point, run index); if None runs use fresh entropy
 
     Returns:
         DataFrame: Will return pandas DataFrame with all data storage
     '''
-    simulations_df = None
+    results = ResultAccumulator(RESULT_COLUMNS)
     for run in range(0, runs):
         await asyncio.sleep(0)
-        data, temp_data_df = simulation(
+        row = simulation(
             topology=topology,
             number_nodes=number_nodes,
             topology_args=topology_args,
@@ -543,54 +642,108 @@ async def runSimulations(
             black_hole_target = black_hole_target,
             data_Frame_index=run,
             simulation_log=False,
+            routing_mode=routing_mode,
+            routing_weight=routing_weight,
+            seed=runSeed(seed, point, run_offset + run),
+            row_only=True,
+            summary_only=True,
             )
-        if simulations_df == None:
-            simulations_df = [temp_data_df]
-        else:
-            simulations_df.append(temp_data_df)
+        results.append(row)
+
+    return results.to_DataFrame()
+
 
-    return pd.concat(simulations_df)
+async def iterSimulations(cores: int, max_in_flight: int | None = None, seed: int | None = None, **params):
+    """
+    Will run the simulations in a process pool and yield each run as it finishes
+
+    Each run is dispatched with loop.run_in_executor, and at most max_in_flight runs are submitted
+    at a time. If the consumer is cancelled or stops iterating, the runs not started yet are cancelled
+    (runs already inside a worker finish in background).
 
+    Args:
+        cores: Number of processes
+        max_in_flight: Maximum number of runs submitted to the pool at the same time, default is twice the cores
+        seed: Seed of the sweep, each run is seeded from (seed, point, run index); if None runs use fresh entropy
+        **params: Args of simulations
 
-async def asyncSimulations(number_tasks: int, **kwargs) -> DataCollector:
+    Yields:
+        (int, tuple): Index of the run and its summary row, with the columns of RESULT_COLUMNS
+    """
+    loop = asyncio.get_running_loop()
+    runs = params['runs']
+    args = _simulationArgs(params)
+    point = point_key({key: value for key, value in params.items() if key != 'runs'})
+    if max_in_flight is None:
+        max_in_flight = 2 * cores
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+
+    executor = ProcessPoolExecutor(max_workers=max(1, min(cores, runs)))
+    pending = {}
+    next_run = 0
+    try:
+        while next_run < runs or pending:
+            while next_run < runs and len(pending) < max_in_flight:
+                future = loop.run_in_executor(executor, partial(runSimulations_Linux, 1, *args, next_run, point, seed=seed))
+                pending[future] = next_run
+                next_run += 1
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result().rows()[0]
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def asyncSimulations(number_tasks: int, max_in_flight: int | None = None, progress=None, seed: int | None = None, **kwargs) -> DataCollector:
     """
-    Will partition all simulation in async tasks
+    Will run all simulations in a process pool without blocking the event loop
 
     Args:
-        number_tasks: Number of partitions
+        number_tasks: Number of processes
+        max_in_flight: Maximum number of runs submitted to the pool at the same time, default is twice the processes
+        progress (optional): Function called as progress(finished_runs, runs) each time a run finishes
+        seed: Seed of the sweep, each run is seeded from (seed, point, run index); if None runs use fresh entropy
         **kwargs: Args of simulations
     
     Returns:
         DataCollector: DataCollector with all simulations data
     """
-    
     runs = kwargs['runs']
-    if runs < number_tasks:
-        number_tasks = runs
-    runs_per_task = int(runs/number_tasks)
+    results = {}
+    async for run, row in iterSimulations(number_tasks, max_in_flight, seed, **kwargs):
+        results[run] = row
+        if progress is not None:
+            progress(len(results), runs)
 
-    args = [arg for arg in kwargs.values()]
-    args[0] = runs_per_task
+    print(f"As simulações foram divididas em {runs} tasks em {min(number_tasks, runs)} processos")
 
-    module = runs % number_tasks
+    # Keeps the order of the runs, whatever the order they finished
+    simulations = ResultAccumulator(RESULT_COLUMNS)
+    for run in sorted(results):
+        simulations.append(results[run])
 
-    tasks = []
-    for task in range(0, number_tasks):
-        temp_args = copy(args)
-        if task < module and module > 0:
-            temp_args[0] = runs_per_task + 1
-        tasks.append(asyncio.create_task(runSimulations(*temp_args)))
+    return DataCollector(simulations.to_DataFrame())
 
-    print(f"As simulações foram divididas em {len(tasks)} tasks")
-    
-    # return await asyncio.gather(*tasks)
-    results = await asyncio.gather(*tasks)
-    
-    simulations_df = pd.concat(results)
-    simulations_df.reset_index(inplace=True)
-    simulations_df.pop('index')
 
-    return DataCollector(simulations_df)
+def runSeed(seed: int | None, point: str | None, run: int) -> np.random.SeedSequence | None:
+    """
+    Seed of one run, independent of the seeds of the other runs and points
+
+    Args:
+        seed: Seed of the sweep
+        point: Parameter point key (see worker_logging.point_key)
+        run: Run index inside the point
+
+    Returns:
+        SeedSequence: Root seed of the run network, or None if seed is None
+    """
+    if seed is None:
+        return None
+    return np.random.SeedSequence(seed, spawn_key=(int(point, 16) if point else 0, run))
 
 
 def runSimulations_Linux(
@@ -605,9 +758,16 @@ def runSimulations_Linux(
         num_black_holes: int = 1, 
         black_hole_prob: float | None = None,
         black_hole_target: bool = False,
-        ) -> pd.DataFrame:
+        routing_mode: str = 'shortest',
+        routing_weight: str | None = None,
+        run_offset: int = 0,
+        point: str | None = None,
+        simulator_log: bool = False,
+        trace_dir: str | None = None,
+        seed: int | None = None,
+        ) -> ResultAccumulator:
     '''
-    Will run some simulations and collect data with pandas DataFrame        
+    Will run some simulations and collect the summary of each run
 
     Args:
         runs: Number of times of simulation will run
@@ -621,13 +781,21 @@ def runSimulations_Linux(
         num_black_holes: Number of Black Holes in the network
         black_hole_prob: Malicious host probability
         black_hole_target: If True each black hole will have one target, else, each Black Hole will attack the entire network
+        routing_mode: 'shortest' uses the physical shortest path, 'available' only routes through channels with EPRs
+        routing_weight: Edge weight of 'available' routing: None (hops), 'inventory' or 'fidelity'
+        run_offset: Index of the first run inside the parameter point, used to tag logs and traces
+        point: Parameter point key (see worker_logging.point_key)
+        simulator_log: If True will activate logs of simulator
+        trace_dir: If set, each run records its events in trace_dir/<point>/run_<index>
+        seed: Seed of the sweep, each run is seeded from (seed, point, run index); if None runs use fresh entropy
 
     Returns:
-        DataFrame: Will return pandas DataFrame with all data storage
+        ResultAccumulator: One row per run, with the columns of RESULT_COLUMNS
     '''
-    simulations_df: list | None = None
+    results = ResultAccumulator(RESULT_COLUMNS)
     for run in range(0, runs):
-        data, temp_data_df = simulation(
+        set_run_context(run_offset + run, point)
+        row = simulation(
             topology=topology,
             number_nodes=number_nodes,
             topology_args=topology_args,
@@ -640,35 +808,31 @@ def runSimulations_Linux(
             black_hole_target = black_hole_target,
             data_Frame_index=run,
             simulation_log=False,
+            simulator_log=simulator_log,
+            routing_mode=routing_mode,
+            routing_weight=routing_weight,
+            trace_path=trace_run_path(trace_dir, point, run_offset + run) if trace_dir else None,
+            seed=runSeed(seed, point, run_offset + run),
+            row_only=True,
+            summary_only=True,
             )
-        
-        if simulations_df == None:
-            simulations_df = [temp_data_df]
-        else:
-            simulations_df.append(temp_data_df)
+        flush_worker_logs()
+        results.append(row)
 
-    return pd.concat(simulations_df)
+    return results
 
 
-def asyncSimulations_Linux(cores: int, **params) -> DataCollector:
+def _simulationArgs(params: dict) -> list:
     """
-    Will partition all simulation in async processes
+    Positional args of runSimulations_Linux for a parameter point, after the number of runs
 
     Args:
-        number_tasks: Number of partitions
-        **params: Args of simulations
-    
+        params: Args of simulations
+
     Returns:
-        DataCollector: DataCollector with all simulations data
+        list: Args in the order of runSimulations_Linux
     """
-
-    runs = params['runs']
-    if runs < cores:
-        cores = runs
-    runs_per_task = int(runs/cores)
-
-    args: list = [
-        runs_per_task,
+    return [
         params['topology'],
         params['number_nodes'],
         params['topology_args'],
@@ -678,27 +842,175 @@ def asyncSimulations_Linux(cores: int, **params) -> DataCollector:
         params['network_prob'],
         params['num_black_holes'],
         params['black_hole_prob'],
-        params['black_hole_target']
+        params['black_hole_target'],
+        params.get('routing_mode', 'shortest'),
+        params.get('routing_weight', None),
     ]
 
-    module = runs % cores
 
-    tasks = []
-    with ProcessPoolExecutor(max_workers=cores) as executor:
-        for task in range(0, cores):
-            temp_args = copy(args)
-            if task < module and module > 0:
-                temp_args[0] = runs_per_task + 1
-            tasks.append(executor.submit(runSimulations_Linux, *temp_args))
+def _runChunks(runs: list[int], chunk_size: int) -> list[tuple[int, int]]:
+    """
+    Group runs in chunks of consecutive runs
 
-    results = [task.result() for task in tasks]
-    print(f"As simulações foram divididas em {len(tasks)} processos")
-        
-    simulations_df = pd.concat(results)
-    simulations_df.reset_index(inplace=True)
-    simulations_df.pop('index')
+    Args:
+        runs: Sorted run indexes
+        chunk_size: Maximum number of runs per chunk
 
-    return DataCollector(simulations_df)
+    Returns:
+        list: (first run, number of runs) of each chunk
+    """
+    chunks = []
+    for run in runs:
+        if chunks and chunks[-1][0] + chunks[-1][1] == run and chunks[-1][1] < chunk_size:
+            chunks[-1] = (chunks[-1][0], chunks[-1][1] + 1)
+        else:
+            chunks.append((run, 1))
+    return chunks
+
+
+def sweepSimulations_Linux(
+        points: list[dict],
+        cores: int,
+        chunk_size: int = 1,
+        max_tasks_per_child: int | None = None,
+        log: bool = False,
+        log_dir: str | None = None,
+        log_file: str | None = None,
+        trace_dir: str | None = None,
+        checkpoint: str | None = None,
+        seed: int | None = None,
+        ) -> list[DataCollector]:
+    """
+    Will run a whole parameter sweep in a single process pool
+
+    The runs of every point are split in chunks and all chunks go to the same job queue, so the
+    workers are started once for the sweep and a point doesn't wait for the slowest run of the previous one.
+
+    Args:
+        points: List with the args of simulations of each point, as in asyncSimulations_Linux
+        cores: Number of processes
+        chunk_size: Number of runs per task
+        max_tasks_per_child: If set, each worker is replaced after this number of tasks to bound its memory
+            (the pool then starts workers with spawn, so each new worker imports the simulator again)
+        log: If True the simulator logs of the workers are aggregated, tagged with point and run
+        log_dir: If set, each worker writes its logs to log_dir/worker_<pid>.log, else they are sent to the parent
+        log_file: File of the logs sent to the parent, if None they go to stderr
+        trace_dir: If set, events of each run are recorded in trace_dir/<point>/run_<index> (see worker_logging.load_traces)
+        checkpoint: If set, path of a JSONL file where each finished run is stored; runs already there with the same seed are not run again
+        seed: Seed of the sweep, each run is seeded from (seed, point, run index); if None runs use fresh entropy
+
+    Returns:
+        list[DataCollector]: One DataCollector per point, in the order of points
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    # Parameter points, without the number of runs
+    points_params = [{key: value for key, value in params.items() if key != 'runs'} for params in points]
+    points_keys = [point_key(point_params) for point_params in points_params]
+    if trace_dir is not None:
+        for point, point_params in zip(points_keys, points_params):
+            write_point_params(trace_dir, point, point_params)
+
+    # Runs still missing of each point, grouped in chunks. Stored runs are keyed by point and seed,
+    # so a sweep with another seed doesn't reuse them
+    store = RunCheckpoint(checkpoint) if checkpoint is not None else None
+    store_keys = [point_key({**point_params, 'seed': seed}) for point_params in points_params]
+    points_chunks = []
+    for store_key, params in zip(store_keys, points):
+        done = store.completed(store_key) if store is not None else set()
+        points_chunks.append(_runChunks([run for run in range(params['runs']) if run not in done], chunk_size))
+
+    total_tasks = sum(len(chunks) for chunks in points_chunks)
+    cores = max(1, min(cores, total_tasks))
+
+    aggregator = None
+    # Recycling workers needs a spawn pool; the log queue must come from the same context as the pool
+    context = multiprocessing.get_context('spawn' if max_tasks_per_child is not None else None)
+    pool_args = {'mp_context': context}
+    if max_tasks_per_child is not None:
+        pool_args['max_tasks_per_child'] = max_tasks_per_child
+    if log:
+        if log_dir is None:
+            aggregator = LogAggregator(log_file, context=context)
+            aggregator.start()
+            for point, point_params in zip(points_keys, points_params):
+                aggregator.announce(point, point_params)
+            pool_args.update(initializer=init_worker_logging, initargs=aggregator.initargs)
+        else:
+            pool_args.update(initializer=init_worker_logging, initargs=(None, log_dir))
+
+    results = [{} for _ in points]
+    try:
+        with ProcessPoolExecutor(max_workers=cores, **pool_args) as executor:
+            tasks = {}
+            for index, params in enumerate(points):
+                args = _simulationArgs(params)
+                for run_offset, chunk_runs in points_chunks[index]:
+                    task = executor.submit(runSimulations_Linux, chunk_runs, *args, run_offset, points_keys[index], log, trace_dir, seed)
+                    tasks[task] = (index, run_offset)
+
+            for task in as_completed(tasks):
+                index, run_offset = tasks[task]
+                results[index][run_offset] = task.result()
+                if store is not None:
+                    store.append_records(store_keys[index], run_offset, results[index][run_offset].records())
+    finally:
+        if aggregator is not None:
+            aggregator.stop()
+
+    print(f"As simulações foram divididas em {total_tasks} tasks em {cores} processos")
+
+    collectors = []
+    for store_key, params, point_results in zip(store_keys, points, results):
+        if store is not None:
+            # Stored runs, from this call and from the previous ones
+            simulations_df = store.rows(store_key, list(range(params['runs'])))
+            simulations_df.reset_index(drop=True, inplace=True)
+        else:
+            # One DataFrame per point, with the runs in order, whatever the order they finished
+            simulations = ResultAccumulator(RESULT_COLUMNS)
+            for run_offset in sorted(point_results):
+                simulations.extend(point_results[run_offset])
+            simulations_df = simulations.to_DataFrame()
+        collectors.append(DataCollector(simulations_df))
+
+    return collectors
+
+
+def asyncSimulations_Linux(
+        cores: int,
+        chunk_size: int = 1,
+        log: bool = False,
+        log_dir: str | None = None,
+        log_file: str | None = None,
+        trace_dir: str | None = None,
+        checkpoint: str | None = None,
+        seed: int | None = None,
+        **params) -> DataCollector:
+    """
+    Will run all simulations in a process pool, in small chunks of runs
+
+    Each chunk is a task of the pool, so a free worker takes the next chunk as soon as it finishes
+    the previous one and slow runs don't leave the other cores idle. Results are collected as they finish.
+    To run many points, sweepSimulations_Linux reuses the same pool for all of them.
+
+    Args:
+        cores: Number of processes
+        chunk_size: Number of runs per task
+        log: If True the simulator logs of the workers are aggregated, tagged with point and run
+        log_dir: If set, each worker writes its logs to log_dir/worker_<pid>.log, else they are sent to the parent
+        log_file: File of the logs sent to the parent, if None they go to stderr
+        trace_dir: If set, events of each run are recorded in trace_dir/<point>/run_<index> (see worker_logging.load_traces)
+        checkpoint: If set, path of a JSONL file where each finished run is stored; runs already there with the same seed are not run again
+        seed: Seed of the sweep, each run is seeded from (seed, point, run index); if None runs use fresh entropy
+        **params: Args of simulations
+    
+    Returns:
+        DataCollector: DataCollector with all simulations data
+    """
+    return sweepSimulations_Linux([params], cores, chunk_size=chunk_size, log=log, log_dir=log_dir,
+                                  log_file=log_file, trace_dir=trace_dir, checkpoint=checkpoint, seed=seed)[0]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,268 @@
+import os
+import json
+import glob
+import hashlib
+import logging
+import threading
+import multiprocessing
+
+import pandas as pd
+
+from quantumnet.objects import TraceRecorder
+
+# Name of the simulator logger (see quantumnet.objects.Logger)
+LOGGER_NAME = 'qkdnet'
+
+# Format of aggregated records, tagged with the parameter point and the run index
+RECORD_FORMAT = '%(asctime)s [point %(point)s | run %(run)s | pid %(process)d] %(levelname)s: %(message)s'
+
+# Run currently executed by this process
+_context = {'run': None, 'point': None}
+
+
+def point_key(params: dict) -> str:
+    """
+    Short and stable identifier of a parameter point
+
+    Args:
+        params: Simulation parameters of the point
+
+    Returns:
+        str: Hash of the parameters, the same in every process
+    """
+    text = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+
+def set_run_context(run: int | None, point: str | None) -> None:
+    """
+    Set the run that the records of this process belong to
+
+    Args:
+        run: Run index inside the parameter point
+        point: Parameter point key (see point_key)
+    """
+    _context['run'] = run
+    _context['point'] = point
+
+
+class RunContextFilter(logging.Filter):
+    """
+    Tag each record with the current run index and parameter point
+    """
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.run = _context['run']
+        record.point = _context['point']
+        return True
+
+
+class BatchQueueHandler(logging.Handler):
+    """
+    Send records to the parent process in batches
+
+    Records are reduced to plain dicts and buffered in the worker; a whole batch goes through the
+    queue at once, so workers don't contend for the pipe on every record.
+
+    Args:
+        queue: Queue read by the parent LogAggregator
+        batch_size: Number of records per batch
+    """
+    def __init__(self, queue, batch_size: int = 256) -> None:
+        super().__init__()
+        self.queue = queue
+        self.batch_size = batch_size
+        self.buffer: list[dict] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.buffer.append({
+                'created': record.created,
+                'levelno': record.levelno,
+                'levelname': record.levelname,
+                'msg': record.getMessage(),
+                'process': record.process,
+                'run': getattr(record, 'run', None),
+                'point': getattr(record, 'point', None),
+            })
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.buffer:
+            batch, self.buffer = self.buffer, []
+            self.queue.put(batch)
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+
+def init_worker_logging(queue=None, log_dir: str | None = None, batch_size: int = 256) -> None:
+    """
+    Route the simulator logger of a worker process to the parent or to a per-worker file
+
+    Used as the initializer of the process pool. With a queue, records go to the parent in batches;
+    with log_dir, each worker writes its own worker_<pid>.log file.
+
+    Args:
+        queue: Queue of a LogAggregator in the parent process
+        log_dir: Directory of the per-worker log files
+        batch_size: Number of records per batch sent through the queue
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+    if queue is not None:
+        handler = BatchQueueHandler(queue, batch_size)
+    elif log_dir is not None:
+        os.makedirs(log_dir, exist_ok=True)
+        handler = logging.FileHandler(os.path.join(log_dir, f'worker_{os.getpid()}.log'), encoding='utf-8')
+        handler.setFormatter(logging.Formatter(RECORD_FORMAT))
+    else:
+        raise Exception("A queue or a log directory is required")
+
+    handler.addFilter(RunContextFilter())
+    logger.addHandler(handler)
+
+
+def flush_worker_logs() -> None:
+    """
+    Send the records buffered in this process
+    """
+    for handler in logging.getLogger(LOGGER_NAME).handlers:
+        handler.flush()
+
+
+class LogAggregator:
+    """
+    Receive batches of records from the workers and write them in the parent process
+
+    Args:
+        log_file (optional): File of the aggregated records, if None they go to stderr
+        batch_size (optional): Number of records per batch in the workers
+        context (optional): Multiprocessing context of the worker pool, if None uses the default context
+    """
+    def __init__(self, log_file: str | None = None, batch_size: int = 256, context=None) -> None:
+        self.queue = (context or multiprocessing).Queue()
+        self.batch_size = batch_size
+        self.handler = logging.FileHandler(log_file, encoding='utf-8') if log_file else logging.StreamHandler()
+        self.handler.setFormatter(logging.Formatter(RECORD_FORMAT))
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> 'LogAggregator':
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @property
+    def initargs(self) -> tuple:
+        """
+        Arguments of init_worker_logging for the process pool
+        """
+        return (self.queue, None, self.batch_size)
+
+    def start(self) -> None:
+        """
+        Start the thread that writes the received batches
+        """
+        self._thread = threading.Thread(target=self._receive, daemon=True)
+        self._thread.start()
+
+    def _receive(self) -> None:
+        while True:
+            batch = self.queue.get()
+            if batch is None:
+                break
+            for fields in batch:
+                self.handler.handle(logging.makeLogRecord(fields))
+
+    def announce(self, point: str, params: dict) -> None:
+        """
+        Write the parameters of a point, so its key can be read in the log
+
+        Args:
+            point: Parameter point key
+            params: Simulation parameters of the point
+        """
+        record = logging.makeLogRecord({'msg': f"Parameters: {params}", 'levelno': logging.INFO,
+                                        'levelname': 'INFO', 'run': None, 'point': point})
+        self.handler.handle(record)
+
+    def stop(self) -> None:
+        """
+        Wait for the pending batches and close the output
+        """
+        if self._thread is not None:
+            self.queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self.handler.close()
+
+
+def trace_run_path(trace_dir: str, point: str, run: int) -> str:
+    """
+    Directory of the event trace of one run
+
+    Args:
+        trace_dir: Root directory of the traces
+        point: Parameter point key
+        run: Run index inside the point
+
+    Returns:
+        str: Path of the run directory
+    """
+    return os.path.join(trace_dir, point, f'run_{run:06d}')
+
+
+def write_point_params(trace_dir: str, point: str, params: dict) -> None:
+    """
+    Save the parameters of a point next to its traces
+
+    Args:
+        trace_dir: Root directory of the traces
+        point: Parameter point key
+        params: Simulation parameters of the point
+    """
+    os.makedirs(os.path.join(trace_dir, point), exist_ok=True)
+    with open(os.path.join(trace_dir, point, 'params.json'), 'w', encoding='utf-8') as file:
+        json.dump(params, file, default=str)
+
+
+def load_traces(trace_dir: str) -> pd.DataFrame:
+    """
+    Load the traces of every point and run in a single DataFrame
+
+    Args:
+        trace_dir: Root directory of the traces
+
+    Returns:
+        DataFrame: One event per row, tagged with point, run and the point parameters
+    """
+    frames = []
+    for point_dir in sorted(glob.glob(os.path.join(trace_dir, '*'))):
+        if not os.path.isdir(point_dir):
+            continue
+        params = {}
+        params_file = os.path.join(point_dir, 'params.json')
+        if os.path.exists(params_file):
+            with open(params_file, encoding='utf-8') as file:
+                params = json.load(file)
+        for run_dir in sorted(glob.glob(os.path.join(point_dir, 'run_*'))):
+            df = TraceRecorder.load(run_dir)
+            df.insert(0, 'run', int(os.path.basename(run_dir)[len('run_'):]))
+            df.insert(0, 'point', os.path.basename(point_dir))
+            for name, value in params.items():
+                df[name] = str(value) if isinstance(value, (list, tuple, dict)) else value
+            frames.append(df)
+
+    if not frames:
+        return TraceRecorder.load(trace_dir)
+    return pd.concat(frames, ignore_index=True)
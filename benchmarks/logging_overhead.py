@@ -0,0 +1,84 @@
+"""
+Custo do log desativado por request.
+
+Conta quantas chamadas ao Logger uma simulação faz por request e mede, com o log desativado,
+quanto custa cada chamada no estilo antigo (f-string montada antes da chamada) e no estilo
+preguiçoso (texto `%` com argumentos em separado, formatado só com o log ativo).
+
+Uso:
+    python benchmarks/logging_overhead.py
+"""
+import os
+import sys
+import random
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from quantumnet.objects import Logger
+from BHA_functions.simulations_functions import simulation
+
+REQUESTS = 100
+REPEAT = 200_000
+
+def count_log_calls() -> tuple[int, float]:
+    """
+    Roda uma simulação contando as chamadas ao Logger.
+
+    Returns:
+        (int, float) : Número de chamadas e tempo da simulação, em segundos.
+    """
+    calls = 0
+    originals = {name: getattr(Logger, name) for name in ('log', 'debug', 'warn', 'error')}
+
+    def counting(method):
+        def wrapper(self, message, *args):
+            nonlocal calls
+            calls += 1
+            return method(self, message, *args)
+        return wrapper
+
+    for name, method in originals.items():
+        setattr(Logger, name, counting(method))
+    try:
+        random.seed(1234)
+        start = timeit.default_timer()
+        simulation(topology='grade', number_nodes=0, topology_args=(8, 12), requests=REQUESTS,
+                   network_prob=0.8, num_black_holes=2, black_hole_prob=0.1, black_hole_target=True)
+        elapsed = timeit.default_timer() - start
+    finally:
+        for name, method in originals.items():
+            setattr(Logger, name, method)
+    return calls, elapsed
+
+def cost_per_call() -> tuple[float, float]:
+    """
+    Mede o custo de uma chamada típica ao Logger desativado nos dois estilos.
+
+    Returns:
+        (float, float) : Custo em nanossegundos do estilo antigo e do preguiçoso.
+    """
+    logger = Logger.get_instance()
+    route = [12, 4, 33, 87, 90]
+    timeslot, fidelity = 4821, 0.912345678
+
+    def eager():
+        logger.log(f'Timeslot {timeslot}: rota {route} com fidelidade {fidelity}')
+
+    def lazy():
+        logger.log('Timeslot %s: rota %s com fidelidade %s', timeslot, route, fidelity)
+
+    eager_ns = min(timeit.repeat(eager, number=REPEAT, repeat=5)) / REPEAT * 1e9
+    lazy_ns = min(timeit.repeat(lazy, number=REPEAT, repeat=5)) / REPEAT * 1e9
+    return eager_ns, lazy_ns
+
+if __name__ == '__main__':
+    Logger.get_instance().deactivate()
+    calls, elapsed = count_log_calls()
+    eager_ns, lazy_ns = cost_per_call()
+    per_request = calls / REQUESTS
+
+    print(f'Chamadas ao Logger: {calls} ({per_request:.1f} por request)')
+    print(f'Tempo da simulação: {elapsed / REQUESTS * 1e3:.3f} ms por request')
+    print(f'Custo por chamada com o log desativado: f-string {eager_ns:.0f} ns, preguiçoso {lazy_ns:.0f} ns')
+    print(f'Custo do log por request: f-string {per_request * eager_ns / 1e3:.1f} us, preguiçoso {per_request * lazy_ns / 1e3:.1f} us')
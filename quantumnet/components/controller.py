@@ -1,41 +1,184 @@
-import networkx as nx
+import numpy as np
+from collections.abc import Mapping
 from ..components import Network, Host
 
+class RoutingTable(Mapping):
+    """
+    Read-only routing table of a host backed by the controller's predecessor matrix.
+    Paths are rebuilt on demand, so the table costs no memory per destination.
+    """
+    def __init__(self, controller: 'Controller', host_id: int):
+        self._controller = controller
+        self._host_id = host_id
+
+    def __getitem__(self, destination: int) -> list:
+        route = self._controller.get_route(self._host_id, destination)
+        if route is None:
+            raise KeyError(destination)
+        return route
+
+    def __iter__(self):
+        return iter(self._controller.reachable(self._host_id))
+
+    def __len__(self) -> int:
+        return len(self._controller.reachable(self._host_id))
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
 class Controller():
     def __init__(self, network):
         self.network = network
         self.hosts = None
         self.links = None
+        # Compact routing state: one row per source, indexed by node position
+        self._nodes = []    # index -> host_id
+        self._index = {}    # host_id -> index
+        self._predecessors = np.empty((0, 0), dtype=np.int32)  # Predecessor of each destination (-1 if none)
+        self._distances = np.empty((0, 0), dtype=np.int32)     # Hop count to each destination (-1 if unreachable)
+        self._version = None  # Topology version the tables match, None until they are built
+        network.add_topology_listener(self)
 
-    def create_routing_table(self, host_id: int) -> dict:
+    def _update_sources(self, sources) -> None:
+        csr = self.network.csr
+        for source in sources:
+            predecessors, distances = csr.bfs(self._nodes[source])
+            self._predecessors[source] = predecessors
+            self._distances[source] = distances
+
+    def build_routing_tables(self) -> None:
         """
-        Create a routing table for a node in a graph.
+        Build the predecessor and distance matrices for every node, running a BFS
+        over the CSR snapshot of the physical topology from each source.
+        """
+        csr = self.network.csr
+        self._nodes = csr.nodes.tolist()
+        self._index = {node: i for i, node in enumerate(self._nodes)}
+        size = len(self._nodes)
+        self._predecessors = np.full((size, size), -1, dtype=np.int32)
+        self._distances = np.full((size, size), -1, dtype=np.int32)
+        self._update_sources(range(size))
+        self._version = self.network.topology_version
+
+    def _ensure_tables(self) -> None:
+        # Edge changes are applied as they happen; any other change to the topology rebuilds the tables
+        if self._version != self.network.topology_version:
+            self.build_routing_tables()
+
+    def get_route(self, source: int, destination: int) -> list | None:
+        """
+        Rebuild the shortest route between two hosts from the predecessor matrix.
         Args:
-            host_id (int): The node ID to create the routing table for.
+            source (int): Source host ID.
+            destination (int): Destination host ID.
         Returns:
-            dict: A routing table for the node.
+            list | None: Route from source to destination, or None if unreachable.
         """
-        shortest_paths = nx.shortest_path(self.network.graph, source=host_id)  # Get shortest paths from the node to all other nodes
-        routing_table = {}
+        self._ensure_tables()
+        s = self._index[source]
+        d = self._index.get(destination)
+        if d is None or self._distances[s, d] < 0:
+            return None
+
+        predecessors = self._predecessors[s]
+        route = [destination]
+        while d != s:
+            d = int(predecessors[d])
+            route.append(self._nodes[d])
+        route.reverse()
+        return route
 
-        for destination, path in shortest_paths.items():
-            if len(path) > 1:  # Ensure there's a valid path
-                routing_table[destination] = path  # Store the next hop on the shortest path
-            else:
-                routing_table[destination] = [host_id]  # Self-routing
+    def next_hop(self, source: int, destination: int) -> int | None:
+        """
+        Next hop from source towards destination.
+        Returns:
+            int | None: Host ID of the next hop, or None if unreachable.
+        """
+        route = self.get_route(source, destination)
+        if route is None:
+            return None
+        return route[1] if len(route) > 1 else source
 
-        return routing_table
+    def reachable(self, host_id: int) -> list:
+        """
+        Hosts reachable from a host, including itself.
+        """
+        self._ensure_tables()
+        row = self._distances[self._index[host_id]]
+        return [self._nodes[i] for i in np.flatnonzero(row >= 0)]
+
+    def create_routing_table(self, host_id: int) -> RoutingTable:
+        """
+        Create a routing table for a node in a graph.
+        Args:
+            host_id (int): The node ID to create the routing table for.
+        Returns:
+            RoutingTable: A routing table for the node, with routes rebuilt on demand.
+        """
+        self._ensure_tables()
+        return RoutingTable(self, host_id)
 
     def register_routing_tables(self):
         """
         Register routing tables for all hosts in the network.
         """
         self.hosts = self.network.hosts
+        self.build_routing_tables()
 
         for host_id in self.hosts:
             routing_table = self.create_routing_table(host_id)
             self.hosts[host_id].set_routing_table(routing_table)
 
+    def edge_added(self, u: int, v: int) -> list:
+        """
+        Update the routing tables after an edge was added to the physical topology.
+        Called by the network on every new edge of the routing view.
+        Only the sources whose distance to u and v differ by more than one hop are recomputed.
+        Args:
+            u (int): One end of the new edge.
+            v (int): The other end of the new edge.
+        Returns:
+            list: Host IDs whose routing tables were recomputed.
+        """
+        if self._version is None:
+            return []
+        if self._version != self.network.topology_version - 1 or u not in self._index or v not in self._index:
+            self.build_routing_tables()
+            return list(self._nodes)
+
+        du = self._distances[:, self._index[u]]
+        dv = self._distances[:, self._index[v]]
+        affected = ((du >= 0) != (dv >= 0)) | ((du >= 0) & (dv >= 0) & (np.abs(du - dv) > 1))
+        sources = np.flatnonzero(affected)
+        self._update_sources(sources)
+        self._version = self.network.topology_version
+        return [self._nodes[i] for i in sources]
+
+    def edge_removed(self, u: int, v: int) -> list:
+        """
+        Update the routing tables after an edge was removed from the physical topology.
+        Called by the network whenever an edge leaves the routing view (e.g. marked as swapped).
+        Only the sources whose shortest path tree used the edge are recomputed.
+        Args:
+            u (int): One end of the removed edge.
+            v (int): The other end of the removed edge.
+        Returns:
+            list: Host IDs whose routing tables were recomputed.
+        """
+        if self._version is None:
+            return []
+        if self._version != self.network.topology_version - 1 or u not in self._index or v not in self._index:
+            self.build_routing_tables()
+            return list(self._nodes)
+
+        iu = self._index[u]
+        iv = self._index[v]
+        affected = (self._predecessors[:, iv] == iu) | (self._predecessors[:, iu] == iv)
+        sources = np.flatnonzero(affected)
+        self._update_sources(sources)
+        self._version = self.network.topology_version
+        return [self._nodes[i] for i in sources]
+
     def check_route(self, route):
         """
         Check if a route is valid.
@@ -43,7 +186,7 @@ class Controller():
             route (list): A list of nodes in the route.
         Returns:
             bool: True if the route is valid, False otherwise.
-        """       
+        """
         return True
 
     def announce_to_route_nodes(self, route):
@@ -66,4 +209,3 @@ class Controller():
         """
 
         print(f"Alice {route[0]} e Bob {route[-1]} informados.")
-
@@ -1,14 +1,40 @@
 
+from collections import deque
 from ..objects import Logger, Qubit
 
+# Políticas de estouro da memória: recebem a memória cheia e o qubit que está chegando,
+# e retornam a posição na memória do qubit a ser descartado (None se o qubit que chega deve ser rejeitado)
+def reject_new(memory: deque, qubit: Qubit) -> int | None:
+    return None
+
+def drop_oldest(memory: deque, qubit: Qubit) -> int | None:
+    return 0
+
+def drop_lowest_fidelity(memory: deque, qubit: Qubit) -> int | None:
+    index, lowest = min(enumerate(memory), key=lambda item: item[1].get_current_fidelity())
+    return None if qubit.get_current_fidelity() < lowest.get_current_fidelity() else index
+
+OVERFLOW_POLICIES = {
+    'reject': reject_new,
+    'drop_oldest': drop_oldest,
+    'drop_lowest_fidelity': drop_lowest_fidelity,
+}
+
 class Host():
-    def __init__(self, host_id: int, probability_on_demand_qubit_create: float = 0.5, probability_replay_qubit_create: float = 0.5, max_qubits_create: int = 10, memory_size: int = 10) -> None:
+    __slots__ = ('_host_id', '_connections', '_memory', '_memory_size', '_max_qubits_create',
+                 '_probability_on_demand_qubit_create', '_probability_replay_qubit_create', '_routing_table',
+                 '_Black_Hole', '_prob_entanglement_swapping', '_prob_target_entanglement_swapping',
+                 '_Black_Hole_target', '_decoherence_clock', '_overflow_policy', 'logger')
+
+    def __init__(self, host_id: int, probability_on_demand_qubit_create: float = 0.5, probability_replay_qubit_create: float = 0.5, max_qubits_create: int = 10, memory_size: int = 10, overflow_policy = None) -> None:
         # Sobre a rede
         self._host_id = host_id
         self._connections = []
         # Sobre o host
-        self._memory = []
-        self._memory_size = memory_size
+        self._memory = deque()  # Do qubit mais antigo para o mais novo
+        self._memory_size = memory_size  # Capacidade da memória, aplicada só com uma política de estouro
+        self._overflow_policy = None
+        self.set_overflow_policy(overflow_policy)
         self._max_qubits_create = max_qubits_create
         self._probability_on_demand_qubit_create = probability_on_demand_qubit_create
         self._probability_replay_qubit_create = probability_replay_qubit_create
@@ -18,6 +44,7 @@ class Host():
         self._prob_entanglement_swapping = None
         self._prob_target_entanglement_swapping = None
         self._Black_Hole_target = None
+        self._decoherence_clock = None
         # Sobre a execução
         self.logger = Logger.get_instance()
     def __str__(self):
@@ -46,10 +73,10 @@ class Host():
     @property
     def memory(self):
         """
-        Memória do host.
+        Memória do host, do qubit mais antigo para o mais novo.
 
         Returns:
-            list : Lista de qubits.
+            deque : Qubits em memória.
         """
         return self._memory
     
@@ -104,8 +131,22 @@ class Host():
             Qubit : Último qubit da memória.
         """
         try:
-            q = self.memory[-1]
-            self.memory.remove(q)
+            q = self._memory.pop()
+            q.stop_decoherence()
+            return q
+        except IndexError:
+            raise Exception('Não há mais qubits na memória.')
+
+    def get_first_qubit(self):
+        """
+        Retorna o primeiro qubit da memória.
+
+        Returns:
+            Qubit : Primeiro qubit da memória.
+        """
+        try:
+            q = self._memory.popleft()
+            q.stop_decoherence()
             return q
         except IndexError:
             raise Exception('Não há mais qubits na memória.')
@@ -124,18 +165,66 @@ class Host():
         if host_id_for_connection not in self.connections:
             self.connections.append(host_id_for_connection),
 
-    def add_qubit(self, qubit: Qubit):
+    def add_qubit(self, qubit: Qubit) -> bool:
         """
-        Adiciona um qubit à memória do host.
+        Adiciona um qubit à memória do host. Sem política de estouro a memória não tem limite;
+        com uma política e a memória cheia, ela escolhe qual qubit é descartado, podendo ser
+        o próprio qubit que chega.
 
         Args:
             qubit (Qubit): O qubit a ser adicionado.
+
+        Returns:
+            bool : True se o qubit foi armazenado, False se foi rejeitado.
+        """
+        if self._overflow_policy is not None and self._memory_size is not None and len(self._memory) >= self._memory_size:
+            index = self._overflow_policy(self._memory, qubit)
+            if index is None:
+                self.logger.debug('Memória do Host %s cheia. Qubit %s rejeitado.', self.host_id, qubit.qubit_id)
+                return False
+            dropped = self._memory[index]
+            del self._memory[index]
+            dropped.stop_decoherence()
+            self.logger.debug('Memória do Host %s cheia. Qubit %s descartado.', self.host_id, dropped.qubit_id)
+
+        self._memory.append(qubit)
+        if self._decoherence_clock is not None:
+            qubit.start_decoherence(self._decoherence_clock)
+        self.logger.debug('Qubit %s adicionado à memória do Host %s.', qubit.qubit_id, self.host_id)
+        return True
+
+    def set_overflow_policy(self, policy) -> None:
         """
-        
-        self.memory.append(qubit)
-        Logger.get_instance().debug(f'Qubit {qubit.qubit_id} adicionado à memória do Host {self.host_id}.')
+        Define a política usada quando um qubit chega com a memória cheia. A capacidade
+        memory_size só é aplicada quando há uma política.
+
+        Args:
+            policy (str | callable | None): 'reject', 'drop_oldest', 'drop_lowest_fidelity' ou uma função
+                (memória, qubit) -> posição do qubit a descartar, ou None para rejeitar o qubit que chega.
+                Com None a memória volta a ser ilimitada.
+        """
+        if policy is not None and not callable(policy):
+            if policy not in OVERFLOW_POLICIES:
+                raise ValueError(f"Política de estouro inválida. Escolha entre {', '.join(OVERFLOW_POLICIES)} ou uma função.")
+            policy = OVERFLOW_POLICIES[policy]
+        self._overflow_policy = policy
+
 
 
+    def set_decoherence_clock(self, clock) -> None:
+        """
+        Define o relógio da decoerência preguiçosa dos qubits em memória.
+        Com None, a decoerência acumulada é consolidada e os qubits deixam de decair.
+
+        Args:
+            clock: Objeto com get_timeslot() e decoherence_decay(timeslot), normalmente a rede.
+        """
+        self._decoherence_clock = clock
+        for qubit in self.memory:
+            if clock is None:
+                qubit.stop_decoherence()
+            else:
+                qubit.start_decoherence(clock)
 
     def set_routing_table(self, routing_table: dict):
         """
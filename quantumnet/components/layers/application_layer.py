@@ -1,4 +1,3 @@
-import random
 from quantumnet.components import Host
 from quantumnet.objects import Qubit, Logger
 
@@ -32,7 +31,7 @@ class ApplicationLayer:
         Returns:
             int: Número de qubits usados na camada de aplicação.
         """
-        self.logger.debug(f"Qubits usados na camada {self.__class__.__name__}: {self.used_qubits}")
+        self.logger.debug('Qubits usados na camada %s: %s', self.__class__.__name__, self.used_qubits)
         return self.used_qubits
     
     def run_app(self, app_name, *args):
@@ -47,7 +46,7 @@ class ApplicationLayer:
             alice_id, bob_id, num_qubits = args
             return self.qkd_e91_protocol(alice_id,bob_id, num_qubits)
         else:
-            self.logger.log(f"Aplicação não realizada ou não encontrada.")
+            self.logger.log("Aplicação não realizada ou não encontrada.")
             return False
     
 
@@ -63,17 +62,22 @@ class ApplicationLayer:
             list: Lista de qubits preparados.
         """
         self._network.timeslot()  # Incrementa o timeslot
-        self.logger.debug(f"Timeslot incrementado na função prepare_e91_qubits: {self._network.get_timeslot()}")
+        self.logger.debug('Timeslot incrementado na função prepare_e91_qubits: %s', self._network.get_timeslot())
         qubits = []
         for bit, base in zip(key, bases):
-            qubit = Qubit(qubit_id=random.randint(0, 1000))  # Cria um novo qubit com ID aleatório
+            qubit = self._network.physical.acquire_qubit(self._network.rng.randint(0, 1000))  # Cria um novo qubit com ID aleatório
             if bit == 1:
                 qubit.apply_x()  # Aplica a porta X (NOT) ao qubit se o bit for 1
             if base == 1:
-                qubit.apply_hadamard()  # Aplica a porta Hadamard ao qubit se a base for 1
+                qubit.apply_hadamard(self._network.rng)  # Aplica a porta Hadamard ao qubit se a base for 1
             qubits.append(qubit)  # Adiciona o qubit preparado à lista de qubits
         return qubits
 
+    def _release_qubits(self, qubits):
+        """Devolve ao pool da camada física os qubits consumidos pelo protocolo."""
+        for qubit in qubits:
+            self._network.physical.release_qubit(qubit)
+
     def apply_bases_and_measure_e91(self, qubits, bases):
         """
         Aplica as bases de medição e mede os qubits no protocolo E91.
@@ -86,11 +90,11 @@ class ApplicationLayer:
             list: Resultados das medições.
         """
         self._network.timeslot()  # Incrementa o timeslot
-        self.logger.debug(f"Timeslot incrementado na função apply_bases_and_measure_e91: {self._network.get_timeslot()}")
+        self.logger.debug('Timeslot incrementado na função apply_bases_and_measure_e91: %s', self._network.get_timeslot())
         results = []
         for qubit, base in zip(qubits, bases):
             if base == 1:
-                qubit.apply_hadamard()  # Aplica a porta Hadamard antes de medir, se a base for 1
+                qubit.apply_hadamard(self._network.rng)  # Aplica a porta Hadamard antes de medir, se a base for 1
             measurement = qubit.measure()  # Mede o qubit
             results.append(measurement)  # Adiciona o resultado da medição à lista de resultados
         return results
@@ -115,31 +119,33 @@ class ApplicationLayer:
         while len(final_key) < num_bits:
             num_qubits = int((num_bits - len(final_key)) * 2)  # Calcula o número de qubits necessários
             self.used_qubits += num_qubits
-            self.logger.log(f'Iniciando protocolo E91 com {num_qubits} qubits.')
+            self.logger.log('Iniciando protocolo E91 com %s qubits.', num_qubits)
 
             # Etapa 1: Alice prepara os qubits
-            key = [random.choice([0, 1]) for _ in range(num_qubits)]  # Gera uma chave aleatória de bits
-            bases_alice = [random.choice([0, 1]) for _ in range(num_qubits)]  # Gera bases de medição aleatórias para Alice
+            key = [self._network.rng.choice([0, 1]) for _ in range(num_qubits)]  # Gera uma chave aleatória de bits
+            bases_alice = [self._network.rng.choice([0, 1]) for _ in range(num_qubits)]  # Gera bases de medição aleatórias para Alice
             qubits = self.prepare_e91_qubits(key, bases_alice)  # Prepara os qubits com base na chave e nas bases
-            self.logger.log(f'Qubits preparados com a chave: {key} e bases: {bases_alice}')
+            self.logger.log('Qubits preparados com a chave: %s e bases: %s', key, bases_alice)
 
             # Etapa 2: Transmissão dos qubits de Alice para Bob
             success = self._transport_layer.run_transport_layer(alice_id, bob_id, num_qubits)
             if not success:
-                self.logger.log(f'Falha na transmissão dos qubits de Alice para Bob.')
+                self.logger.log('Falha na transmissão dos qubits de Alice para Bob.')
+                self._release_qubits(qubits)
                 return None
 
             self._network.timeslot()  # Incrementa o timeslot após a transmissão
-            self.logger.debug(f"Timeslot incrementado após transmissão: {self._network.get_timeslot()}")
+            self.logger.debug('Timeslot incrementado após transmissão: %s', self._network.get_timeslot())
 
             # Etapa 3: Bob escolhe bases aleatórias e mede os qubits
-            bases_bob = [random.choice([0, 1]) for _ in range(num_qubits)]  # Gera bases de medição aleatórias para Bob
+            bases_bob = [self._network.rng.choice([0, 1]) for _ in range(num_qubits)]  # Gera bases de medição aleatórias para Bob
             results_bob = self.apply_bases_and_measure_e91(qubits, bases_bob)  # Bob mede os qubits usando suas bases
-            self.logger.log(f'Resultados das medições: {results_bob} com bases: {bases_bob}')
+            self._release_qubits(qubits)  # Os qubits medidos não são mais usados
+            self.logger.log('Resultados das medições: %s com bases: %s', results_bob, bases_bob)
 
             # Etapa 4: Alice e Bob compartilham suas bases e encontram os índices comuns
             common_indices = [i for i in range(len(bases_alice)) if bases_alice[i] == bases_bob[i]]  # Índices onde as bases coincidem
-            self.logger.log(f'Índices comuns: {common_indices}')
+            self.logger.log('Índices comuns: %s', common_indices)
 
             # Etapa 5: Extração da chave com base nos índices comuns
             shared_key_alice = [key[i] for i in common_indices]  # Chave compartilhada gerada por Alice
@@ -150,11 +156,11 @@ class ApplicationLayer:
                 if a == b and len(final_key) < num_bits:  # Limita o tamanho da chave final
                     final_key.append(a)
 
-            self.logger.log(f"Chaves obtidas até agora: {final_key}")
+            self.logger.log('Chaves obtidas até agora: %s', final_key)
 
             if len(final_key) >= num_bits:
                 final_key = final_key[:num_bits]  # Garante que a chave final tenha o tamanho exato solicitado
-                self.logger.log(f"Protocolo E91 bem-sucedido. Chave final compartilhada: {final_key}")
+                self.logger.log('Protocolo E91 bem-sucedido. Chave final compartilhada: %s', final_key)
                 return final_key
 
         return None
\ No newline at end of file
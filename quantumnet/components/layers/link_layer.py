@@ -1,7 +1,6 @@
 import networkx as nx
 from quantumnet.components import Host
-from quantumnet.objects import Logger, Epr
-from random import uniform
+from quantumnet.objects import Logger, Epr, FidelityStats, TraceRecorder
 
 class LinkLayer:
     def __init__(self, network, physical_layer):
@@ -19,7 +18,7 @@ class LinkLayer:
         self.logger = Logger.get_instance()
         self.used_eprs = 0  # Inicializa o contador de EPRs utilizados
         self.used_qubits = 0  # Inicializa o contador de Qubits utilizados
-        self.created_eprs = []  # Armazenar os EPRs criados pela camada física
+        self.created_fidelity = FidelityStats()  # Agregados de fidelidade dos EPRs criados pela camada física
 
     @property
     def requests(self):
@@ -38,11 +37,11 @@ class LinkLayer:
         return 'Link Layer'
     
     def get_used_eprs(self):
-        self.logger.debug(f"Eprs usados na camada {self.__class__.__name__}: {self.used_eprs}")
+        self.logger.debug('Eprs usados na camada %s: %s', self.__class__.__name__, self.used_eprs)
         return self.used_eprs
     
     def get_used_qubits(self):
-        self.logger.debug(f"Qubits usados na camada {self.__class__.__name__}: {self.used_qubits}")
+        self.logger.debug('Qubits usados na camada %s: %s', self.__class__.__name__, self.used_qubits)
         return self.used_qubits
     
     def request(self, alice_id: int, bob_id: int):
@@ -57,12 +56,13 @@ class LinkLayer:
             alice = self._network.get_host(alice_id)
             bob = self._network.get_host(bob_id)
         except KeyError:
-            self.logger.log(f'Host {alice_id} ou {bob_id} não encontrado na rede.')
+            self.logger.log('Host %s ou %s não encontrado na rede.', alice_id, bob_id)
             return False
 
         for attempt in range(1, 3):
             self._network.timeslot()
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: Tentativa de emaranhamento entre {alice_id} e {bob_id}.')
+            if self.logger.enabled:
+                self.logger.log('Timeslot %s: Tentativa de emaranhamento entre %s e %s.', self._network.get_timeslot(), alice_id, bob_id)
 
             entangle = self._physical_layer.entanglement_creation_heralding_protocol(alice, bob)
 
@@ -72,15 +72,13 @@ class LinkLayer:
                 self.used_qubits += 2
                 self._requests.append((alice_id, bob_id))
 
-                # Adiciona os EPRs criados pela camada física à lista de EPRs criados da camada de enlace
-                if self._physical_layer.created_eprs:
-                    self.created_eprs.extend(self._physical_layer.created_eprs)
-                    self._physical_layer.created_eprs.clear()  # Limpa a lista da camada física
+                # Incorpora os EPRs criados pela camada física aos agregados da camada de enlace
+                self.created_fidelity.merge(self._physical_layer.claim_created_fidelity())
                 
-                self.logger.log(f'Timeslot {self._network.get_timeslot()}: Entrelaçamento criado entre {alice} e {bob} na tentativa {attempt}.')
+                self.logger.log('Timeslot %s: Entrelaçamento criado entre %s e %s na tentativa %s.', self._network.get_timeslot(), alice, bob, attempt)
                 return True
             else:
-                self.logger.log(f'Timeslot {self._network.get_timeslot()}: Entrelaçamento falhou entre {alice} e {bob} na tentativa {attempt}.')
+                self.logger.log('Timeslot %s: Entrelaçamento falhou entre %s e %s na tentativa %s.', self._network.get_timeslot(), alice, bob, attempt)
                 self._failed_requests.append((alice_id, bob_id))
 
         # Verifica se deve realizar a purificação após duas falhas
@@ -88,16 +86,12 @@ class LinkLayer:
             purification_success = self.purification(alice_id, bob_id)
             
             # Independente de a purificação ser bem-sucedida ou não, sempre transferimos os EPRs criados
-            if self._physical_layer.created_eprs:
-                self.created_eprs.extend(self._physical_layer.created_eprs)
-                self._physical_layer.created_eprs.clear()  # Limpa a lista da camada física
+            self.created_fidelity.merge(self._physical_layer.claim_created_fidelity())
             
             return purification_success
 
         # Após a segunda tentativa, garante que todos os EPRs criados sejam transferidos
-        if self._physical_layer.created_eprs:
-            self.created_eprs.extend(self._physical_layer.created_eprs)
-            self._physical_layer.created_eprs.clear()  # Limpa a lista da camada física
+        self.created_fidelity.merge(self._physical_layer.claim_created_fidelity())
             
         return False
 
@@ -147,7 +141,7 @@ class LinkLayer:
         eprs_fail = self._physical_layer.failed_eprs
 
         if len(eprs_fail) < 2:
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: Não há EPRs suficientes para purificação no canal ({alice_id}, {bob_id}).')
+            self.logger.log('Timeslot %s: Não há EPRs suficientes para purificação no canal (%s, %s).', self._network.get_timeslot(), alice_id, bob_id)
             return False
 
         eprs_fail1 = eprs_fail[-1]
@@ -169,18 +163,21 @@ class LinkLayer:
                 self._physical_layer.add_epr_to_channel(epr_purified, (alice_id, bob_id))
                 self._physical_layer.failed_eprs.remove(eprs_fail1)
                 self._physical_layer.failed_eprs.remove(eprs_fail2)
-                self.logger.log(f'EPRS Usados {self.used_eprs}')
-                self.logger.log(f'Timeslot {self._network.get_timeslot()}: Purificação bem sucedida no canal ({alice_id}, {bob_id}) com nova fidelidade {new_fidelity}.')
+                self._network.trace.record(TraceRecorder.PURIFICATION_SUCCESS, TraceRecorder.LINK, alice_id, bob_id, fidelity=new_fidelity)
+                self.logger.log('EPRS Usados %s', self.used_eprs)
+                self.logger.log('Timeslot %s: Purificação bem sucedida no canal (%s, %s) com nova fidelidade %s.', self._network.get_timeslot(), alice_id, bob_id, new_fidelity)
                 return True
             else:
                 self._physical_layer.failed_eprs.remove(eprs_fail1)
                 self._physical_layer.failed_eprs.remove(eprs_fail2)
-                self.logger.log(f'Timeslot {self._network.get_timeslot()}: Purificação falhou no canal ({alice_id}, {bob_id}) devido a baixa fidelidade após purificação.')
+                self._network.trace.record(TraceRecorder.PURIFICATION_FAIL, TraceRecorder.LINK, alice_id, bob_id, fidelity=new_fidelity)
+                self.logger.log('Timeslot %s: Purificação falhou no canal (%s, %s) devido a baixa fidelidade após purificação.', self._network.get_timeslot(), alice_id, bob_id)
                 return False
         else:
             self._physical_layer.failed_eprs.remove(eprs_fail1)
             self._physical_layer.failed_eprs.remove(eprs_fail2)
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: Purificação falhou no canal ({alice_id}, {bob_id}) devido a baixa probabilidade de sucesso da purificação.')
+            self._network.trace.record(TraceRecorder.PURIFICATION_FAIL, TraceRecorder.LINK, alice_id, bob_id)
+            self.logger.log('Timeslot %s: Purificação falhou no canal (%s, %s) devido a baixa probabilidade de sucesso da purificação.', self._network.get_timeslot(), alice_id, bob_id)
             return False
         
     def avg_fidelity_on_linklayer(self):
@@ -190,19 +187,12 @@ class LinkLayer:
         Returns:
             float : Fidelidade média dos EPRs da camada de enlace.
         """
-        total_fidelity = 0
-        total_eprs = len(self.created_eprs)
-
-        for epr in self.created_eprs:   
-            total_fidelity += epr.get_current_fidelity()
-
-        if total_eprs == 0:
+        if self.created_fidelity.count == 0:
             self.logger.log('Não há EPRs criados na camada de enlace.')
             return 0
 
-
-        print(f'Total de EPRs criados na camada de enlace: {total_eprs}')
-        print(f'Total de fidelidade dos EPRs criados na camada de enlace: {total_fidelity}')
-        avg_fidelity = total_fidelity / total_eprs
-        self.logger.log(f'A fidelidade média dos EPRs criados na camada de enlace é {avg_fidelity}')
+        self.logger.debug('Total de EPRs criados na camada de enlace: %s', self.created_fidelity.count)
+        self.logger.debug('Total de fidelidade dos EPRs criados na camada de enlace: %s', self.created_fidelity.total)
+        avg_fidelity = self.created_fidelity.mean()
+        self.logger.log('A fidelidade média dos EPRs criados na camada de enlace é %s', avg_fidelity)
         return avg_fidelity
@@ -1,10 +1,10 @@
 import networkx as nx
+from collections import OrderedDict
 from quantumnet.components import Host
-from quantumnet.objects import Logger, Epr
-from random import uniform
+from quantumnet.objects import Logger, Epr, TraceRecorder
 
 class NetworkLayer:
-    def __init__(self, network, link_layer, physical_layer):
+    def __init__(self, network, link_layer, physical_layer, route_cache_size: int = 1024):
         """
         Inicializa a camada de rede.
         
@@ -12,6 +12,7 @@ class NetworkLayer:
             network : Network : Rede.
             link_layer : LinkLayer : Camada de enlace.
             physical_layer : PhysicalLayer : Camada física.
+            route_cache_size : int : Quantidade máxima de rotas no cache LRU (0 desativa o cache).
         """
         self._network = network
         self._physical_layer = physical_layer
@@ -21,6 +22,11 @@ class NetworkLayer:
         self.used_eprs = 0  # Inicializa o contador de EPRs utilizados
         self.used_qubits = 0  # Inicializa o contador de Qubits utilizados
         self.routes_used = {}  # Inicializa o dicionário de rotas usadas 
+        self.route_cache_size = route_cache_size
+        self._route_cache = OrderedDict()  # Cache LRU {(Alice, Bob): rota ou None}
+        self._route_cache_version = None  # Versão da topologia em que o cache foi preenchido
+        self.routing_mode = 'shortest'  # 'shortest' (menor caminho físico) ou 'available' (só canais com EPRs)
+        self.routing_weight = None  # Peso do modo 'available': None (saltos), 'inventory' ou 'fidelity'
 
     def __str__(self):
         """ Retorna a representação em string da camada de rede. 
@@ -31,13 +37,116 @@ class NetworkLayer:
 
     def get_used_eprs(self):
         """Retorna a contagem de EPRs utilizados na camada de rede."""
-        self.logger.debug(f"Eprs usados na camada {self.__class__.__name__}: {self.used_eprs}")
+        self.logger.debug('Eprs usados na camada %s: %s', self.__class__.__name__, self.used_eprs)
         return self.used_eprs
     
     def get_used_qubits(self):
-        self.logger.debug(f"Qubits usados na camada {self.__class__.__name__}: {self.used_qubits}")
+        self.logger.debug('Qubits usados na camada %s: %s', self.__class__.__name__, self.used_qubits)
         return self.used_qubits
 
+    def shortest_route(self, Alice: int, Bob: int) -> tuple:
+        """
+        Retorna o menor caminho entre dois hosts na visão de roteamento, usando o cache LRU de rotas.
+        O cache é descartado sempre que a versão da topologia da rede muda.
+
+        args:
+            Alice (int): ID do host de origem.
+            Bob (int): ID do host de destino.
+
+        returns:
+            tuple : Menor caminho entre os hosts.
+
+        raises:
+            nx.NetworkXNoPath: Se não houver caminho entre os hosts.
+        """
+        if self._route_cache_version != self._network.topology_version:
+            self._route_cache.clear()
+            self._route_cache_version = self._network.topology_version
+
+        key = (Alice, Bob)
+        if key in self._route_cache:
+            self._route_cache.move_to_end(key)
+            route = self._route_cache[key]
+        else:
+            route = self._network.csr.shortest_path(Alice, Bob)
+            if route is not None:
+                route = tuple(route)
+            if self.route_cache_size > 0:
+                self._route_cache[key] = route
+                if len(self._route_cache) > self.route_cache_size:
+                    self._route_cache.popitem(last=False)
+
+        if route is None:
+            raise nx.NetworkXNoPath(f'Sem caminho entre {Alice} e {Bob}.')
+        return route
+
+    def set_routing_mode(self, mode: str = 'shortest', weight: str | None = None) -> None:
+        """
+        Define como o short_route_valid escolhe as rotas.
+
+        args:
+            mode (str): 'shortest' usa o menor caminho físico e falha se algum canal estiver sem EPRs.
+                'available' busca apenas entre os canais que possuem EPRs disponíveis.
+            weight (str, optional): Peso das arestas no modo 'available'. None conta apenas saltos,
+                'inventory' favorece canais com mais EPRs e 'fidelity' favorece canais com maior fidelidade média.
+        """
+        if mode not in ('shortest', 'available'):
+            raise ValueError("Modo de roteamento inválido. Escolha entre 'shortest' ou 'available'.")
+        if weight not in (None, 'inventory', 'fidelity'):
+            raise ValueError("Peso de roteamento inválido. Escolha entre None, 'inventory' ou 'fidelity'.")
+        self.routing_mode = mode
+        self.routing_weight = weight
+
+    def available_route(self, Alice: int, Bob: int, weight: str | None = None, exclude: set | None = None) -> list:
+        """
+        Retorna o melhor caminho entre dois hosts usando apenas canais que possuem EPRs disponíveis.
+        Os canais esgotados vêm do conjunto mantido pelo armazenamento de EPRs, então a busca
+        encontra um caminho viável sempre que ele existir.
+
+        args:
+            Alice (int): ID do host de origem.
+            Bob (int): ID do host de destino.
+            weight (str, optional): None conta apenas saltos. Com 'inventory' ou 'fidelity' cada salto
+                custa entre 1 e 2, menos quanto mais EPRs ou maior a fidelidade média do canal.
+            exclude (set, optional): Ids de canais que também devem ser ignorados.
+
+        returns:
+            list : Caminho entre os hosts.
+
+        raises:
+            nx.NetworkXNoPath: Se não houver caminho com EPRs disponíveis entre os hosts.
+        """
+        channels = self._network.channels
+        depleted = channels.depleted
+        exclude = exclude or set()  # Testado à parte, para não copiar o conjunto de canais esgotados
+
+        if weight is None:
+            def cost(u, v, data):
+                edge_id = channels.edge_id(u, v)
+                return None if edge_id in depleted or edge_id in exclude else 1
+        elif weight == 'inventory':
+            def cost(u, v, data):
+                edge_id = channels.edge_id(u, v)
+                return None if edge_id in depleted or edge_id in exclude else 1 + 1 / channels.size(edge_id)
+        else:
+            def cost(u, v, data):
+                edge_id = channels.edge_id(u, v)
+                return None if edge_id in depleted or edge_id in exclude else 2 - channels.mean_fidelity(edge_id)
+
+        return nx.shortest_path(self._network.routing_graph, Alice, Bob, weight=cost)
+
+    def record_route_fidelity(self, f_route: float) -> None:
+        """
+        Acumula a fidelidade de uma rota usada na média móvel avg_fidelity_route da rede.
+
+        args:
+            f_route (float): Fidelidade média dos pares EPR da rota.
+        """
+        if self._network.avg_fidelity_route == -1.0:
+            self._network.avg_fidelity_route = f_route
+        else:
+            self._network.avg_fidelity_route = (f_route + self._network.avg_fidelity_route) / 2
+
     def short_route_valid(self, Alice: int, Bob: int, increment_timeslot=True) -> list:
         """
         Escolhe a melhor rota entre dois hosts com critérios adicionais.
@@ -52,64 +161,126 @@ class NetworkLayer:
         """
         if increment_timeslot:
             self._network.timeslot()  # Incrementa o timeslot sempre que uma rota é verificada
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: Buscando rota válida entre {Alice} e {Bob}.')
+            if self.logger.enabled:
+                self.logger.log('Timeslot %s: Buscando rota válida entre %s e %s.', self._network.get_timeslot(), Alice, Bob)
 
         if Alice is None or Bob is None:
             self.logger.log('IDs de hosts inválidos fornecidos.')
             return None
 
         if not self._network.graph.has_node(Alice) or not self._network.graph.has_node(Bob):
-            self.logger.log(f'Um dos nós ({Alice} ou {Bob}) não existe no grafo.')
+            self.logger.log('Um dos nós (%s ou %s) não existe no grafo.', Alice, Bob)
             return None
-        
-        
-         #TODO: CRIEI UM FILTRO PARA REMOVER AS ARESTAS QUE FORAM SWAPPED
-            # Filtrar arestas criadas por entanglement swapping
-        filtered_graph = self._network.graph.copy()
-        for edge in list(filtered_graph.edges(data=True)):
-            if edge[2].get('swapped', False):  # Ignorar arestas marcadas como swapped
-                filtered_graph.remove_edge(edge[0], edge[1])
 
+
+        # A rota vem do cache e da visão de roteamento, que já exclui as arestas do entanglement swapping.
+        # Os EPRs disponíveis são sempre verificados no estado atual dos canais
+        channels = self._network.channels
         try:
-            shortest_path = list(nx.shortest_path(filtered_graph, Alice, Bob))  # Pegando apenas um melhor caminho
-            fidelities = [] 
+            if self.routing_mode == 'available':
+                shortest_path = self.available_route(Alice, Bob, self.routing_weight)  # Apenas canais com EPRs
+                cached_path = tuple(shortest_path)
+            else:
+                cached_path = self.shortest_route(Alice, Bob)  # Pegando apenas um melhor caminho
+                shortest_path = list(cached_path)
+            total_fidelity = 0.0
+            total_eprs = 0
             for i in range(len(shortest_path) - 1): # Coletando as fidelidades da rota
-                epr_pairs = self._network.get_eprs_from_edge(shortest_path[i], shortest_path[i+1])
-                fidelities.extend([epr.get_current_fidelity() for epr in epr_pairs])
-            if fidelities != []:
-                f_route = sum(fidelities) / len(fidelities)
+                fidelities = channels.fidelities(channels.edge_id(shortest_path[i], shortest_path[i+1]))
+                total_fidelity += float(fidelities.sum())
+                total_eprs += len(fidelities)
+            if total_eprs > 0:
                 # print(f"AQUI AS FIDELIDADES: {fidelities}")
-
-                if self._network.avg_fidelity_route == -1.0:
-                    self._network.avg_fidelity_route = f_route
-                else:
-                    self._network.avg_fidelity_route = (f_route + self._network.avg_fidelity_route) / 2
+                self.record_route_fidelity(total_fidelity / total_eprs)
 
         except nx.NetworkXNoPath:
-            self.logger.log(f'Sem rota encontrada entre {Alice} e {Bob}')
+            self.logger.log('Sem rota encontrada entre %s e %s', Alice, Bob)
             return None
 
         valid_path = True
         for i in range(len(shortest_path) - 1):
             node = shortest_path[i]
             next_node = shortest_path[i + 1]
-            if len(self._network.get_eprs_from_edge(node, next_node)) < 1:
-                self.logger.log(f'Sem pares EPRs entre {node} e {next_node} na rota {shortest_path}')
+            if channels.size(channels.edge_id(node, next_node)) < 1:
+                self.logger.log('Sem pares EPRs entre %s e %s na rota %s', node, next_node, shortest_path)
                 valid_path = False
                 break
 
             if valid_path:
-                self.logger.log(f'Rota válida encontrada: {shortest_path}')
+                self.logger.log('Rota válida encontrada: %s', shortest_path)
 
                 # Armazena a rota se for a primeira vez que é usada
                 if (Alice, Bob) not in self.routes_used:
-                    self.routes_used[(Alice, Bob)] = shortest_path.copy()
+                    self.routes_used[(Alice, Bob)] = cached_path
 
                 return shortest_path
 
         self.logger.log('Nenhuma rota válida encontrada.')
         return None
 
+    def reserve_routes(self, Alice: int, Bob: int, num_routes: int, increment_timeslot=True) -> list:
+        """
+        Retorna até num_routes rotas entre dois hosts com uma única busca de rota, reservando no
+        armazenamento dos canais um EPR por salto para cada rota devolvida. A rota do short_route_valid
+        é repetida enquanto todos os seus canais tiverem EPRs livres. No modo 'available', os canais
+        saturados são excluídos e novas rotas são buscadas até completar o pedido.
+
+        Cada qubit precisa do seu próprio EPR em cada salto, então um canal com k EPRs livres atende
+        no máximo k rotas. As reservas devem ser liberadas com release_routes quando a transmissão
+        terminar ou falhar.
+
+        args:
+            Alice (int): ID do host de origem.
+            Bob (int): ID do host de destino.
+            num_routes (int): Número de rotas desejadas (uma por qubit).
+            increment_timeslot (bool): Indica se o timeslot deve ser incrementado.
+
+        returns:
+            list : Lista com até num_routes rotas. Vazia se não houver rota válida.
+        """
+        routes = []
+        route = self.short_route_valid(Alice, Bob, increment_timeslot)
+        channels = self._network.channels
+        saturated = set()
+
+        while route is not None and len(routes) < num_routes:
+            edge_ids = [channels.edge_id(route[i], route[i + 1]) for i in range(len(route) - 1)]
+            if not edge_ids:
+                break
+
+            # Capacidade da rota: menor quantidade de EPRs livres entre os seus canais
+            capacity = min(channels.available(edge_id) for edge_id in edge_ids)
+            copies = min(capacity, num_routes - len(routes))
+            if copies > 0:
+                channels.reserve(edge_ids, copies)
+                routes.extend(list(route) for _ in range(copies))
+
+            if self.routing_mode != 'available' or len(routes) == num_routes:
+                break
+
+            saturated.update(edge_id for edge_id in edge_ids if channels.available(edge_id) <= 0)
+            try:
+                route = self.available_route(Alice, Bob, self.routing_weight, exclude=saturated)
+            except nx.NetworkXNoPath:
+                route = None
+
+        self.logger.log('%s de %s rotas reservadas entre %s e %s.', len(routes), num_routes, Alice, Bob)
+        return routes
+
+    def release_routes(self, routes: list) -> None:
+        """
+        Libera as reservas de EPR feitas por reserve_routes para as rotas informadas.
+
+        args:
+            routes (list): Rotas devolvidas por reserve_routes (uma reserva por rota).
+        """
+        channels = self._network.channels
+        counts = {}
+        for route in routes:
+            counts[tuple(route)] = counts.get(tuple(route), 0) + 1
+        for route, count in counts.items():
+            channels.release([channels.edge_id(route[i], route[i + 1]) for i in range(len(route) - 1)], count)
+
     def entanglement_swapping(self, Alice: int = None, Bob: int = None, route: list = None) -> bool:
         """
         Realiza o Entanglement Swapping em toda a rota determinada pelo short_route_valid.
@@ -132,11 +303,14 @@ class NetworkLayer:
         Alice = route[0]
         Bob = route[-1]
 
+        channels = self._network.channels
+
         # Itera sobre a rota realizando o entanglement swapping para cada segmento da rota
         while len(route) > 1:
             # Incrementa o timeslot antes de cada operação de entanglement swapping
             self._network.timeslot()
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: Realizando Entanglement Swapping.')
+            if self.logger.enabled:
+                self.logger.log('Timeslot %s: Realizando Entanglement Swapping.', self._network.get_timeslot())
 
             node1 = route[0]    # Primeiro nó na rota
             node2 = route[1]    # Segundo nó na rota
@@ -144,30 +318,30 @@ class NetworkLayer:
 
             # Verifica se existe um canal entre node1 e node2
             if not self._network.graph.has_edge(node1, node2):
-                self.logger.log(f'Canal entre {node1}-{node2} não existe')
+                self.logger.log('Canal entre %s-%s não existe', node1, node2)
                 return -1
 
             try:
                 # Obtém o primeiro par EPR entre node1 e node2
-                epr1 = self._network.get_eprs_from_edge(node1, node2)[0]
+                epr1 = channels.get(channels.edge_id(node1, node2), 0)
             except IndexError:
                 # Se não houver pares EPR suficientes, loga a falha e retorna False
-                self.logger.log(f'Não há pares EPRs suficientes entre {node1}-{node2}')
+                self.logger.log('Não há pares EPRs suficientes entre %s-%s', node1, node2)
                 return -1
 
             # Se houver um terceiro nó, realiza o swapping entre node1, node2 e node3
             if node3 is not None:
                 # Verifica se existe um canal entre node2 e node3
                 if not self._network.graph.has_edge(node2, node3):
-                    self.logger.log(f'Canal entre {node2}-{node3} não existe')
+                    self.logger.log('Canal entre %s-%s não existe', node2, node3)
                     return -1
 
                 try:
                     # Obtém o primeiro par EPR entre node2 e node3
-                    epr2 = self._network.get_eprs_from_edge(node2, node3)[0]
+                    epr2 = channels.get(channels.edge_id(node2, node3), 0)
                 except IndexError:
                     # Se não houver pares EPR suficientes, loga a falha e retorna False
-                    self.logger.log(f'Não há pares EPRs suficientes entre {node2}-{node3}')
+                    self.logger.log('Não há pares EPRs suficientes entre %s-%s', node2, node3)
                     return -1
 
                 # Mede a fidelidade dos pares EPR
@@ -200,34 +374,34 @@ class NetworkLayer:
                 success_prob *= tax
                 
                 # Verifica se o swapping foi bem-sucedido com base na probabilidade de sucesso
-                if uniform(0, 1) > success_prob:
-                    self.logger.log(f'Entanglement Swapping falhou entre {node1}-{node2} e {node2}-{node3}')
+                if self._network.rng.uniform(0, 1) > success_prob:
+                    self.logger.log('Entanglement Swapping falhou entre %s-%s e %s-%s', node1, node2, node2, node3)
                     # Remove os pares Eprs utilizados
                     self._network.physical.remove_epr_from_channel([epr1], (node1, node2))
                     self._network.physical.remove_epr_from_channel([epr2], (node2, node3))
                     # Atualiza o contador de Eprs utilizados
                     self.used_eprs += 2
+                    self._network.trace.record(TraceRecorder.SWAP_FAIL, TraceRecorder.NETWORK, node1, node2, node3)
                     return 0
 
                 # Calcula a nova fidelidade do par EPR virtual
                 new_fidelity = (fidelity1 * fidelity2) / ((fidelity1 * fidelity2) + (1 - fidelity1) * (1 - fidelity2))
-                epr_virtual = Epr((node1, node3), new_fidelity)
+                epr_virtual = self._network.physical.acquire_epr((node1, node3), new_fidelity)
 
-                # Se o canal entre node1 e node3 não existir, adiciona um novo canal
-                if not self._network.graph.has_edge(node1, node3):
-                    self._network.graph.add_edge(node1, node3, eprs=[], swapped=True)
-                else:
-                    # Caso já exista a aresta, apenas atualiza o atributo swapped
-                    self._network.graph.edges[(node1, node3)]['swapped'] = True   #TODO: ADICIONEI  O SWAPPED AQUI
+                # Adiciona o canal virtual entre node1 e node3 ou, caso já exista a aresta, apenas a marca como swapped.
+                # Em ambos os casos ela deixa a visão de roteamento da rede
+                self._network.add_channel(node1, node3, swapped=True)
 
                 # Adiciona o par EPR virtual ao canal entre node1 e node3
                 self._network.physical.add_epr_to_channel(epr_virtual, (node1, node3))
+                self._network.physical.release_epr(epr_virtual)  # O canal guarda uma cópia compacta do par
                 # Remove os pares EPR antigos dos canais entre node1-node2 e node2-node3
                 self._network.physical.remove_epr_from_channel([epr1], (node1, node2))
                 self._network.physical.remove_epr_from_channel([epr2], (node2, node3))
 
                 # Atualiza o contador de EPRs utilizados
                 self.used_eprs += 2
+                self._network.trace.record(TraceRecorder.SWAP_SUCCESS, TraceRecorder.NETWORK, node1, node2, node3, new_fidelity)
 
                 # Remove o segundo nó da rota, pois o swapping foi realizado
                 route.pop(1)
@@ -236,7 +410,7 @@ class NetworkLayer:
                 route.pop(1)
 
         # Loga o sucesso do entanglement swapping
-        self.logger.log(f'Entanglement Swapping concluído com sucesso entre {Alice} e {Bob}')
+        self.logger.log('Entanglement Swapping concluído com sucesso entre %s e %s', Alice, Bob)
         return 1
 
     def get_avg_size_routes(self):
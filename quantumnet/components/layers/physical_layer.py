@@ -1,29 +1,42 @@
-from ...objects import Logger, Qubit, Epr
+from ...objects import Logger, Qubit, Epr, FidelityStats, ChannelFidelityStats, TraceRecorder
 from ...components import Host
-from random import uniform
-import random
+from collections import deque
+import numpy as np
 
 class PhysicalLayer:
-    def __init__(self, network, physical_layer_id: int = 0):
+    def __init__(self, network, physical_layer_id: int = 0, failed_eprs_size: int = 1024, pool_size: int = 1024):
         """
         Inicializa a camada física.
         
         Args:
             physical_layer_id (int): Id da camada física.
+            failed_eprs_size (int): Quantidade de EPRs falhos mais recentes guardados para a purificação.
+            pool_size (int): Quantidade máxima de Qubits e de Eprs descartados guardados para reuso (0 desativa o pool).
         """
         self.max_prob = 1
         self.min_prob = 0.2
         self._physical_layer_id = physical_layer_id
         self._network = network
         self._qubits = []
-        self._failed_eprs = []
-        self.created_eprs = []  # Lista para armazenar todos os EPRs criados
-        self._initial_qubits_fidelity = random.uniform(self.min_prob, self.max_prob)
+        self._failed_eprs = deque(maxlen=failed_eprs_size)  # EPRs falhos mais recentes, candidatos à purificação
+        # Agregados de fidelidade em fluxo, em vez de guardar todos os EPRs
+        self.created_fidelity = FidelityStats()       # EPRs criados pelo heralding
+        self.failed_fidelity = FidelityStats()        # EPRs descartados por fidelidade baixa
+        self.channel_fidelity = ChannelFidelityStats()  # EPRs depositados em cada canal, pelo id do canal
+        self._unclaimed_fidelity = FidelityStats()    # Criados desde a última coleta da camada de enlace
+        # Pools de objetos descartados, reaproveitados nas próximas criações
+        self.pool_size = pool_size
+        self._qubit_pool = []
+        self._epr_pool = []
+        self._initial_qubits_fidelity = network.rng.uniform(self.min_prob, self.max_prob)
         self._count_qubit = 0
         self._count_epr = 0
         self.logger = Logger.get_instance()
         self.used_eprs = 0
         self.used_qubits = 0
+        # Faixa de fidelidade dos qubits novos usados na reposição e limiar de aceitação do heralding
+        self.fresh_qubit_fidelity = (0.8, 1)
+        self.heralding_threshold = 0.8
         
         
     def __str__(self):
@@ -54,19 +67,100 @@ class PhysicalLayer:
     
     @property
     def failed_eprs(self):
-        """Retorna os pares EPR que falharam.
+        """Retorna os pares EPR que falharam mais recentes.
         
         Returns:
-            dict: Dicionário de pares EPR que falharam.
+            deque: Pares EPR que falharam, do mais antigo para o mais novo.
         """
         return self._failed_eprs
     
+    def claim_created_fidelity(self) -> FidelityStats:
+        """Entrega os agregados dos EPRs criados desde a última coleta e recomeça a contagem.
+
+        Returns:
+            FidelityStats: Agregados dos EPRs ainda não coletados.
+        """
+        unclaimed = self._unclaimed_fidelity
+        self._unclaimed_fidelity = FidelityStats()
+        return unclaimed
+
+    def acquire_qubit(self, qubit_id: int, initial_fidelity: float = None) -> Qubit:
+        """Retorna um qubit novo, reaproveitando um do pool se houver.
+
+        Args:
+            qubit_id (int): ID do qubit.
+            initial_fidelity (float): Fidelidade inicial. Se None, é sorteada com o gerador da rede.
+        """
+        if self._qubit_pool:
+            qubit = self._qubit_pool.pop()
+            qubit.reset(qubit_id, initial_fidelity, self._network.rng)
+        else:
+            qubit = Qubit(qubit_id, initial_fidelity, self._network.rng)
+        qubit._owner = self
+        return qubit
+
+    def acquire_epr(self, epr_id, initial_fidelity: float = None) -> Epr:
+        """Retorna um par EPR novo, reaproveitando um do pool se houver.
+
+        Args:
+            epr_id: ID do par EPR.
+            initial_fidelity (float): Fidelidade inicial. Se None, é sorteada com o gerador da rede.
+        """
+        if self._epr_pool:
+            epr = self._epr_pool.pop()
+            epr.reset(epr_id, initial_fidelity, self._network.rng)
+        else:
+            epr = Epr(epr_id, initial_fidelity, self._network.rng)
+        epr._owner = self
+        return epr
+
+    def release_qubit(self, qubit: Qubit):
+        """Devolve ao pool um qubit consumido pela camada.
+
+        Só qubits criados por acquire_qubit e ainda não devolvidos voltam ao pool; qubits criados
+        fora da camada podem estar referenciados por quem os criou e são ignorados.
+        """
+        if qubit._owner is not self:
+            return
+        qubit._owner = None
+        if len(self._qubit_pool) < self.pool_size:
+            self._qubit_pool.append(qubit)
+
+    def release_epr(self, epr: Epr):
+        """Devolve ao pool um par EPR consumido pela camada.
+
+        Só pares criados por acquire_epr e ainda não devolvidos voltam ao pool.
+        """
+        if epr._owner is not self:
+            return
+        epr._owner = None
+        if len(self._epr_pool) < self.pool_size:
+            self._epr_pool.append(epr)
+
+    def retain(self, obj):
+        """Marca um qubit ou par EPR como referenciado fora da camada, para que ele nunca volte ao pool.
+
+        Returns:
+            O próprio objeto.
+        """
+        obj._owner = None
+        return obj
+
+    def _record_created(self, fidelity: float):
+        self.created_fidelity.add(fidelity)
+        self._unclaimed_fidelity.add(fidelity)
+
+    def _deposit(self, edge_id: int, epr: Epr):
+        """Adiciona um EPR a um canal e registra sua fidelidade nos agregados do canal."""
+        self._network.channels.append(edge_id, epr)
+        self.channel_fidelity.add(edge_id, epr.get_current_fidelity())
+
     def get_used_eprs(self):
-        self.logger.debug(f"Eprs usados na camada {self.__class__.__name__}: {self.used_eprs}")
+        self.logger.debug('Eprs usados na camada %s: %s', self.__class__.__name__, self.used_eprs)
         return self.used_eprs
     
     def get_used_qubits(self):
-        self.logger.debug(f"Qubits usados na camada {self.__class__.__name__}: {self.used_qubits}")
+        self.logger.debug('Qubits usados na camada %s: %s', self.__class__.__name__, self.used_qubits)
         return self.used_qubits
     
     def create_qubit(self, host_id: int, increment_timeslot: bool = True, increment_qubits : bool = True):
@@ -88,14 +182,14 @@ class PhysicalLayer:
             raise Exception(f'Host {host_id} não existe na rede.')
 
         qubit_id = self._count_qubit
-        qubit = Qubit(qubit_id)
+        qubit = self.acquire_qubit(qubit_id)
         self._network.hosts[host_id].add_qubit(qubit)
         
         current_timeslot = self._network.get_timeslot()
         self._network.register_qubit_creation(qubit_id, current_timeslot, "Physical Layer")
     
         self._count_qubit += 1
-        self.logger.debug(f'Qubit {qubit_id} criado com fidelidade inicial {qubit.get_initial_fidelity()} e adicionado à memória do Host {host_id}.')
+        self.logger.debug('Qubit %s criado com fidelidade inicial %s e adicionado à memória do Host %s.', qubit_id, qubit.get_initial_fidelity(), host_id)
 
     def create_epr_pair(self, fidelity: float = 1.0, increment_timeslot: bool = True, increment_eprs: bool = False):
         """Cria um par de qubits entrelaçados.
@@ -110,7 +204,7 @@ class PhysicalLayer:
             self.used_eprs += 1
             
             
-        epr = Epr(self._count_epr, fidelity)
+        epr = self.acquire_epr(self._count_epr, fidelity)
         self._count_epr += 1
         return epr
 
@@ -122,13 +216,13 @@ class PhysicalLayer:
             channel (tuple): Canal.
         """
         u, v = channel
-        if not self._network.graph.has_edge(u, v):
-            self._network.graph.add_edge(u, v, eprs=[])
-        self._network.graph.edges[u, v]['eprs'].append(epr)
-        self.logger.debug(f'Par EPR {epr} adicionado ao canal {channel}.')
+        edge_id = self._network.add_channel(u, v)
+        self._deposit(edge_id, epr)
+        self.logger.debug('Par EPR %s adicionado ao canal %s.', epr, channel)
 
     def remove_epr_from_channel(self, epr_list: list, channel: tuple):
-            """Remove uma lista de pares EPR do canal.
+            """Remove uma lista de pares EPR do canal. Os canais são indexados pelo id do EPR,
+            então cada remoção custa O(1).
 
             Args:
                 epr_list (list): Lista de pares EPR a serem removidos.
@@ -136,21 +230,16 @@ class PhysicalLayer:
             """
             u, v = channel
             if not self._network.graph.has_edge(u, v):
-                self.logger.debug(f'Canal {channel} não existe.')
+                self.logger.debug('Canal %s não existe.', channel)
                 return
 
-            eprs_in_channel = self._network.graph.edges[u, v]['eprs']
-            
-            # Cria uma nova lista sem os EPRs que estão na epr_list
-            updated_eprs = [epr_in_channel for epr_in_channel in eprs_in_channel 
-                            if all(epr_in_channel.epr_id != epr.epr_id for epr in epr_list)]
-            
-            # Atualiza a lista de EPRs no canal com a nova lista
-            self._network.graph.edges[u, v]['eprs'] = updated_eprs
+            # Remove do canal os EPRs que estão na epr_list
+            edge_id = self._network.channels.edge_id(u, v)
+            self._network.channels.remove(edge_id, [epr.epr_id for epr in epr_list])
 
-            # Log para cada EPR removido
+            # Os objetos da epr_list pertencem ao chamador e não voltam ao pool
             for epr in epr_list:
-                self.logger.debug(f'Par EPR {epr.epr_id} removido do canal {channel}.')
+                self.logger.debug('Par EPR %s removido do canal %s.', epr.epr_id, channel)
 
     def fidelity_measurement_only_one(self, qubit: Qubit):
         """Mede a fidelidade de um qubit.
@@ -167,10 +256,12 @@ class PhysicalLayer:
             # Aplica um fator de decoerência (0.99 neste exemplo)
             new_fidelity = max(0, fidelity * 0.99)  
             qubit.set_current_fidelity(new_fidelity)  # Atualiza a fidelidade do qubit
-            self.logger.log(f'A fidelidade do qubit {qubit} é {new_fidelity}')
+            if self.logger.enabled:
+                self.logger.log('A fidelidade do qubit %s é %s', qubit, new_fidelity)
             return new_fidelity
 
-        self.logger.log(f'A fidelidade do qubit {qubit} é {fidelity}')
+        if self.logger.enabled:
+            self.logger.log('A fidelidade do qubit %s é %s', qubit, fidelity)
         return fidelity
 
     def fidelity_measurement(self, qubit1: Qubit, qubit2: Qubit):
@@ -178,7 +269,7 @@ class PhysicalLayer:
         fidelity1 = self.fidelity_measurement_only_one(qubit1)
         fidelity2 = self.fidelity_measurement_only_one(qubit2)
         combined_fidelity = fidelity1 * fidelity2
-        self.logger.log(f'A fidelidade entre o qubit {fidelity1} e o qubit {fidelity2} é {combined_fidelity}')
+        self.logger.log('A fidelidade entre o qubit %s e o qubit %s é %s', fidelity1, fidelity2, combined_fidelity)
         return combined_fidelity
     
     def entanglement_creation_heralding_protocol(self, alice: Host, bob: Host):
@@ -195,25 +286,32 @@ class PhysicalLayer:
 
         q1 = qubit1.get_current_fidelity()
         q2 = qubit2.get_current_fidelity()
+        self.release_qubit(qubit1)
+        self.release_qubit(qubit2)
 
         epr_fidelity = q1 * q2
-        self.logger.log(f'Timeslot {self._network.get_timeslot()}: Par epr criado com fidelidade {epr_fidelity}')
+        if self.logger.enabled:
+            self.logger.log('Timeslot %s: Par epr criado com fidelidade %s', self._network.get_timeslot(), epr_fidelity)
         epr = self.create_epr_pair(epr_fidelity)
 
-        # Armazena o EPR criado na lista de EPRs criados
-        self.created_eprs.append(epr)
+        # Registra o EPR criado nos agregados de fidelidade
+        self._record_created(epr_fidelity)
 
         alice_host_id = alice.host_id
         bob_host_id = bob.host_id
 
-        if epr_fidelity >= 0.8:
+        if epr_fidelity >= self.heralding_threshold:
             # Se a fidelidade for adequada, adiciona o EPR ao canal da rede
-            self._network.graph.edges[(alice_host_id, bob_host_id)]['eprs'].append(epr)
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: O protocolo de criação de emaranhamento foi bem sucedido com a fidelidade necessária.')
+            self._deposit(self._network.channels.edge_id(alice_host_id, bob_host_id), epr)
+            self.release_epr(epr)  # O canal guarda uma cópia compacta do par
+            self._network.trace.record(TraceRecorder.HERALDING_SUCCESS, TraceRecorder.PHYSICAL, alice_host_id, bob_host_id, fidelity=epr_fidelity)
+            self.logger.log('Timeslot %s: O protocolo de criação de emaranhamento foi bem sucedido com a fidelidade necessária.', self._network.get_timeslot())
             return True
         else:
             self._failed_eprs.append(epr)
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: O protocolo de criação de emaranhamento foi bem sucedido, mas com fidelidade baixa. Eprs descartados.')
+            self.failed_fidelity.add(epr_fidelity)
+            self._network.trace.record(TraceRecorder.HERALDING_FAIL, TraceRecorder.PHYSICAL, alice_host_id, bob_host_id, fidelity=epr_fidelity)
+            self.logger.log('Timeslot %s: O protocolo de criação de emaranhamento foi bem sucedido, mas com fidelidade baixa. Eprs descartados.', self._network.get_timeslot())
             return False
 
     def echp_on_demand(self, alice_host_id: int, bob_host_id: int):
@@ -234,17 +332,22 @@ class PhysicalLayer:
             
         fidelity_qubit1 = self.fidelity_measurement_only_one(qubit1)
         fidelity_qubit2 = self.fidelity_measurement_only_one(qubit2)
+        self.release_qubit(qubit1)
+        self.release_qubit(qubit2)
                 
         prob_on_demand_epr_create = self._network.edges[alice_host_id, bob_host_id]['prob_on_demand_epr_create']
         echp_success_probability = prob_on_demand_epr_create * fidelity_qubit1 * fidelity_qubit2
             
-        if uniform(0, 1) < echp_success_probability:
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: Par EPR criado com a fidelidade de {fidelity_qubit1 * fidelity_qubit2}')
+        if self._network.rng.uniform(0, 1) < echp_success_probability:
+            self.logger.log('Timeslot %s: Par EPR criado com a fidelidade de %s', self._network.get_timeslot(), fidelity_qubit1 * fidelity_qubit2)
             epr = self.create_epr_pair(fidelity_qubit1 * fidelity_qubit2)
-            self._network.edges[alice_host_id, bob_host_id]['eprs'].append(epr)
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: A probabilidade de sucesso do ECHP é {echp_success_probability}')
+            self._deposit(self._network.channels.edge_id(alice_host_id, bob_host_id), epr)
+            self.release_epr(epr)
+            self._network.trace.record(TraceRecorder.ECHP_SUCCESS, TraceRecorder.PHYSICAL, alice_host_id, bob_host_id, fidelity=fidelity_qubit1 * fidelity_qubit2)
+            self.logger.log('Timeslot %s: A probabilidade de sucesso do ECHP é %s', self._network.get_timeslot(), echp_success_probability)
             return True
-        self.logger.log(f'Timeslot {self._network.get_timeslot()}: A probabilidade de sucesso do ECHP falhou.')
+        self._network.trace.record(TraceRecorder.ECHP_FAIL, TraceRecorder.PHYSICAL, alice_host_id, bob_host_id, fidelity=fidelity_qubit1 * fidelity_qubit2)
+        self.logger.log('Timeslot %s: A probabilidade de sucesso do ECHP falhou.', self._network.get_timeslot())
         return False
 
     def echp_on_replay(self, alice_host_id: int, bob_host_id: int):
@@ -265,15 +368,247 @@ class PhysicalLayer:
         
         fidelity_qubit1 = self.fidelity_measurement_only_one(qubit1)
         fidelity_qubit2 = self.fidelity_measurement_only_one(qubit2)
+        self.release_qubit(qubit1)
+        self.release_qubit(qubit2)
                
         prob_replay_epr_create = self._network.edges[alice_host_id, bob_host_id]['prob_replay_epr_create']
         echp_success_probability = prob_replay_epr_create * fidelity_qubit1 * fidelity_qubit2
         
-        if uniform(0, 1) < echp_success_probability:
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: Par EPR criado com a fidelidade de {fidelity_qubit1 * fidelity_qubit2}')
+        if self._network.rng.uniform(0, 1) < echp_success_probability:
+            self.logger.log('Timeslot %s: Par EPR criado com a fidelidade de %s', self._network.get_timeslot(), fidelity_qubit1 * fidelity_qubit2)
             epr = self.create_epr_pair(fidelity_qubit1 * fidelity_qubit2)
-            self._network.edges[alice_host_id, bob_host_id]['eprs'].append(epr)
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: A probabilidade de sucesso do ECHP é {echp_success_probability}')
+            self._deposit(self._network.channels.edge_id(alice_host_id, bob_host_id), epr)
+            self.release_epr(epr)
+            self._network.trace.record(TraceRecorder.ECHP_SUCCESS, TraceRecorder.PHYSICAL, alice_host_id, bob_host_id, fidelity=fidelity_qubit1 * fidelity_qubit2)
+            self.logger.log('Timeslot %s: A probabilidade de sucesso do ECHP é %s', self._network.get_timeslot(), echp_success_probability)
             return True
-        self.logger.log(f'Timeslot {self._network.get_timeslot()}: A probabilidade de sucesso do ECHP falhou.')
-        return False
\ No newline at end of file
+        self._network.trace.record(TraceRecorder.ECHP_FAIL, TraceRecorder.PHYSICAL, alice_host_id, bob_host_id, fidelity=fidelity_qubit1 * fidelity_qubit2)
+        self.logger.log('Timeslot %s: A probabilidade de sucesso do ECHP falhou.', self._network.get_timeslot())
+        return False
+
+    def _numpy_rng(self) -> np.random.Generator:
+        """Gerador NumPy da rede, usado nas amostragens em lote."""
+        return self._network.np_rng
+
+    def _add_fresh_qubits(self, alice: Host, bob: Host):
+        """Adiciona um qubit novo à memória de cada host, com fidelidade na faixa de reposição."""
+        for host in (alice, bob):
+            host.add_qubit(self.acquire_qubit(self._count_qubit, self._network.rng.uniform(*self.fresh_qubit_fidelity)))
+            self._network.register_qubit_creation(self._count_qubit, self._network.get_timeslot(), "Physical Layer")
+            self._count_qubit += 1
+
+    def _sample_fresh_attempts(self, rng: np.random.Generator, successes: int) -> np.ndarray:
+        """Amostra tentativas de heralding com qubits novos até obter o número de sucessos pedido.
+
+        Args:
+            rng (np.random.Generator): Gerador de números aleatórios.
+            successes (int): Número de sucessos necessários.
+
+        Returns:
+            np.ndarray: Fidelidade de cada tentativa, em ordem, terminando no último sucesso.
+        """
+        if successes == 0:
+            return np.empty(0)
+
+        low, high = self.fresh_qubit_fidelity
+        blocks = []
+        found = 0
+        while found < successes:
+            # Cerca de metade das tentativas passa no limiar, então o primeiro bloco quase sempre basta
+            size = 2 * (successes - found) + 16
+            block = rng.uniform(low, high, size=(2, size)).prod(axis=0)
+            blocks.append(block)
+            found += int(np.count_nonzero(block >= self.heralding_threshold))
+
+        stream = np.concatenate(blocks)
+        last = np.flatnonzero(stream >= self.heralding_threshold)[successes - 1]
+        return stream[:last + 1]
+
+    def bulk_entanglement_generation(self, edges, number_of_entanglements: int) -> int:
+        """Cria pares EPR em lote em vários canais, como na reposição da rede.
+
+        Equivale a repetir, para cada canal e cada par pedido, o protocolo de heralding até o sucesso:
+        a primeira tentativa de cada par usa os últimos qubits da memória dos hosts (se ambos tiverem),
+        e as demais usam qubits novos. As tentativas com qubits novos são amostradas com NumPy de uma vez,
+        e os contadores (used_qubits, timeslots, ids de qubit e de EPR, EPRs criados e falhos) avançam como no laço.
+        Os qubits novos não viram objetos, mas recebem ids e são registrados no timeslot da sua tentativa.
+
+        Se a decoerência por timeslot estiver ativa, a fidelidade depende do momento de cada tentativa,
+        então o laço tentativa a tentativa é usado.
+
+        Args:
+            edges: Canais (u, v) a serem reabastecidos.
+            number_of_entanglements (int): Número de pares EPR a criar em cada canal.
+
+        Returns:
+            int: Número total de tentativas de heralding realizadas.
+        """
+        edges = list(edges)
+        n = number_of_entanglements
+        if n <= 0 or not edges:
+            return 0
+
+        hosts = self._network.hosts
+        channels = self._network.channels
+
+        if self._network.timeslot_decoherence:
+            attempts = 0
+            for u, v in edges:
+                alice, bob = hosts[u], hosts[v]
+                for _ in range(n):
+                    if not alice.memory or not bob.memory:
+                        self._add_fresh_qubits(alice, bob)
+                    attempts += 1
+                    while not self.entanglement_creation_heralding_protocol(alice, bob):
+                        self._add_fresh_qubits(alice, bob)
+                        attempts += 1
+            return attempts
+
+        # A primeira tentativa de cada par consome os qubits da memória, que é compartilhada entre canais
+        existing_pairs = []
+        existing_fidelities = []
+        for position, (u, v) in enumerate(edges):
+            alice, bob = hosts[u], hosts[v]
+            for i in range(min(n, len(alice.memory), len(bob.memory))):
+                existing_pairs.append(position * n + i)
+                qubit1 = alice.get_last_qubit()
+                qubit2 = bob.get_last_qubit()
+                existing_fidelities.append(qubit1.get_current_fidelity() * qubit2.get_current_fidelity())
+                self.release_qubit(qubit1)
+                self.release_qubit(qubit2)
+        existing_pairs = np.array(existing_pairs, dtype=np.int64)
+        existing_fidelities = np.array(existing_fidelities, dtype=float)
+
+        # Pares que ainda precisam de tentativas com qubits novos, em ordem
+        pending = np.ones(len(edges) * n, dtype=bool)
+        pending[existing_pairs[existing_fidelities >= self.heralding_threshold]] = False
+        pending = np.flatnonzero(pending)
+
+        rng = self._numpy_rng()
+        fresh_fidelities = self._sample_fresh_attempts(rng, len(pending))
+        fresh_success = fresh_fidelities >= self.heralding_threshold
+        fresh_pairs = pending[np.cumsum(fresh_success) - fresh_success]
+
+        # Intercala as tentativas na ordem em que o laço as faria
+        pairs = np.concatenate((existing_pairs, fresh_pairs))
+        order = np.argsort(pairs, kind='stable')
+        pairs = pairs[order]
+        fidelities = np.concatenate((existing_fidelities, fresh_fidelities))[order]
+
+        attempts = len(fidelities)
+        self.used_qubits += 2 * attempts
+
+        # Cada tentativa com qubits novos cria um qubit em cada host, no timeslot em que o laço o criaria
+        fresh_attempts = np.flatnonzero(order >= len(existing_pairs))
+        first_qubit_id = self._count_qubit
+        self._count_qubit += 2 * len(fresh_attempts)
+        self._network.register_qubit_creations(np.arange(first_qubit_id, self._count_qubit),
+                                               np.repeat(self._network.get_timeslot() + 2 * fresh_attempts, 2), "Physical Layer")
+        self._network.timeslot_total += 2 * attempts  # Heralding e criação do par, sem decoerência por timeslot
+
+        first_epr_id = self._count_epr
+        self._count_epr += attempts
+        self.created_fidelity.add_many(fidelities)
+        self._unclaimed_fidelity.add_many(fidelities)
+
+        # Os pares bem sucedidos vão direto para os canais, sem criar objetos Epr
+        edge_ids = np.array([channels.edge_id(u, v) for u, v in edges], dtype=np.int64)
+        success = fidelities >= self.heralding_threshold
+        succeeded = np.flatnonzero(success)
+        succeeded_edges = edge_ids[pairs[succeeded] // n]
+        for i, edge_id, fidelity in zip(succeeded.tolist(), succeeded_edges.tolist(), fidelities[succeeded].tolist()):
+            channels.push(edge_id, first_epr_id + i, fidelity)
+        self.channel_fidelity.add_many(succeeded_edges, fidelities[succeeded])
+
+        # Dos falhos, só os mais recentes precisam existir como Epr para a purificação
+        failed = np.flatnonzero(~success)
+        self.failed_fidelity.add_many(fidelities[failed])
+        if self._failed_eprs.maxlen is not None:
+            failed = failed[len(failed) - min(len(failed), self._failed_eprs.maxlen):]
+        self._failed_eprs.extend(self.acquire_epr(first_epr_id + i, fidelity) for i, fidelity in zip(failed.tolist(), fidelities[failed].tolist()))
+
+        trace = self._network.trace
+        if trace.enabled:
+            endpoints = np.array(edges, dtype=np.int64)[pairs // n]
+            events = np.where(success, TraceRecorder.HERALDING_SUCCESS, TraceRecorder.HERALDING_FAIL)
+            trace.record_many(events, TraceRecorder.PHYSICAL, endpoints[:, 0], endpoints[:, 1], fidelity=fidelities)
+
+        self.logger.log('Timeslot %s: %s pares EPR criados em %s canais com %s tentativas.', self._network.get_timeslot(), len(edges) * n, len(edges), attempts)
+        return attempts
+
+    def _echp_batch(self, edges, replay: bool) -> np.ndarray:
+        """Executa numa única rodada uma tentativa de ECHP em cada canal.
+
+        Args:
+            edges: Canais (alice_host_id, bob_host_id), como lista de tuplas ou array N x 2.
+            replay (bool): Se True, usa a probabilidade de replay; senão, a sob demanda.
+
+        Returns:
+            np.ndarray: Array booleano com o sucesso de cada canal, na ordem recebida.
+        """
+        edges = [(int(u), int(v)) for u, v in edges]
+        if not edges:
+            return np.zeros(0, dtype=bool)
+
+        self._network.timeslot()  # Todas as tentativas ocupam o mesmo timeslot
+        self.used_qubits += 2 * len(edges)
+
+        hosts = self._network.hosts
+        channels = self._network.channels
+        edge_ids = np.fromiter((channels.edge_id(u, v) for u, v in edges), dtype=np.int64, count=len(edges))
+        fidelities = np.empty((2, len(edges)))
+        for i, (u, v) in enumerate(edges):
+            for row, host_id in enumerate((u, v)):
+                qubit = hosts[host_id].get_last_qubit()
+                fidelities[row, i] = qubit.get_current_fidelity()
+                self.release_qubit(qubit)
+
+        # Decoerência da medição, como em fidelity_measurement_only_one
+        if self._network.get_timeslot() > 0:
+            fidelities = np.maximum(0, fidelities * 0.99)
+        epr_fidelities = fidelities[0] * fidelities[1]
+
+        echp_success_probability = channels.echp_probabilities(edge_ids, replay=replay) * epr_fidelities
+        success = self._numpy_rng().uniform(0, 1, size=len(edges)) < echp_success_probability
+
+        if success.any():
+            self._network.timeslot()  # Criação dos pares
+            succeeded = np.flatnonzero(success)
+            for edge_id, fidelity in zip(edge_ids[succeeded].tolist(), epr_fidelities[succeeded].tolist()):
+                channels.push(edge_id, self._count_epr, fidelity)
+                self._count_epr += 1
+            self.channel_fidelity.add_many(edge_ids[succeeded], epr_fidelities[succeeded])
+
+        trace = self._network.trace
+        if trace.enabled:
+            endpoints = np.array(edges, dtype=np.int64)
+            events = np.where(success, TraceRecorder.ECHP_SUCCESS, TraceRecorder.ECHP_FAIL)
+            trace.record_many(events, TraceRecorder.PHYSICAL, endpoints[:, 0], endpoints[:, 1], fidelity=epr_fidelities)
+
+        self.logger.log('Timeslot %s: ECHP em lote criou %s pares EPR em %s canais.', self._network.get_timeslot(), int(success.sum()), len(edges))
+        return success
+
+    def echp_on_demand_batch(self, edges) -> np.ndarray:
+        """Versão em lote do echp_on_demand: uma tentativa por canal, todas no mesmo timeslot.
+
+        Os qubits de cada canal são retirados da memória como no protocolo individual; probabilidades,
+        decoerência da medição e sorteios são calculados de forma vetorizada.
+
+        Args:
+            edges: Canais (alice_host_id, bob_host_id), como lista de tuplas ou array N x 2.
+
+        Returns:
+            np.ndarray: Array booleano com o sucesso de cada canal.
+        """
+        return self._echp_batch(edges, replay=False)
+
+    def echp_on_replay_batch(self, edges) -> np.ndarray:
+        """Versão em lote do echp_on_replay: uma tentativa por canal, todas no mesmo timeslot.
+
+        Args:
+            edges: Canais (alice_host_id, bob_host_id), como lista de tuplas ou array N x 2.
+
+        Returns:
+            np.ndarray: Array booleano com o sucesso de cada canal.
+        """
+        return self._echp_batch(edges, replay=True)
@@ -1,7 +1,6 @@
 import networkx as nx
 from quantumnet.components import Host
-from quantumnet.objects import Logger, Epr
-from random import uniform
+from quantumnet.objects import Logger, Epr, TraceRecorder
 
 class TransportLayer:
     def __init__(self, network, network_layer, link_layer, physical_layer):
@@ -32,16 +31,20 @@ class TransportLayer:
         return f'Transport Layer'
     
     def get_used_eprs(self):
-        self.logger.debug(f"Eprs usados na camada {self.__class__.__name__}: {self.used_eprs}")
+        self.logger.debug('Eprs usados na camada %s: %s', self.__class__.__name__, self.used_eprs)
         return self.used_eprs
     
     def get_used_qubits(self):
-        self.logger.debug(f"Qubits usados na camada {self.__class__.__name__}: {self.used_qubits}")
+        self.logger.debug('Qubits usados na camada %s: %s', self.__class__.__name__, self.used_qubits)
         return self.used_qubits
     
     def request_transmission(self, alice_id: int, bob_id: int, num_qubits: int):
         """
         Requisição de transmissão de n qubits entre Alice e Bob.
+
+        Cada qubit precisa do seu próprio par EPR em cada salto da rota: os pares são reservados
+        de uma vez por reserve_routes e a requisição só é atendida se houver rotas para todos os qubits.
+        As reservas são liberadas ao final, com sucesso ou falha.
         
         args:
             alice_id : int : Id do host Alice.
@@ -55,11 +58,11 @@ class TransportLayer:
         available_qubits = len(alice.memory)
 
         if available_qubits < num_qubits:
-            self.logger.log(f'Número insuficiente de qubits na memória de Alice (Host:{alice_id}). Tentando transmitir os {available_qubits} qubits disponíveis.')
+            self.logger.log('Número insuficiente de qubits na memória de Alice (Host:%s). Tentando transmitir os %s qubits disponíveis.', alice_id, available_qubits)
             num_qubits = available_qubits
 
         if num_qubits == 0:
-            self.logger.log(f'Nenhum qubit disponível na memória de Alice ({alice_id}) para transmissão.')
+            self.logger.log('Nenhum qubit disponível na memória de Alice (%s) para transmissão.', alice_id)
             return False
 
         max_attempts = 2
@@ -68,29 +71,16 @@ class TransportLayer:
 
         while attempts < max_attempts and not success:
             self._network.timeslot()  # Incrementa o timeslot para cada tentativa de transmissão
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: Tentativa de transmissão {attempts + 1} entre {alice_id} e {bob_id}.')
+            self.logger.log('Timeslot %s: Tentativa de transmissão %s entre %s e %s.', self._network.get_timeslot(), attempts + 1, alice_id, bob_id)
             
-            routes = []
-            for _ in range(num_qubits):
-                route = self._network_layer.short_route_valid(alice_id, bob_id)
-                if route is None:
-                    self.logger.log(f'Não foi possível encontrar uma rota válida na tentativa {attempts + 1}. Timeslot: {self._network.get_timeslot()}')
-                    break
-                routes.append(route)
+            # Uma única busca de rota reserva um par EPR por salto para cada qubit
+            routes = self._network_layer.reserve_routes(alice_id, bob_id, num_qubits)
             
             if len(routes) == num_qubits:
                 success = True
-                for route in routes:
-                    for i in range(len(route) - 1):
-                        node1 = route[i]
-                        node2 = route[i + 1]
-                        # Verifica se há pelo menos um par EPR disponível no canal
-                        if len(self._network.get_eprs_from_edge(node1, node2)) < 1:
-                            self.logger.log(f'Falha ao encontrar par EPR entre {node1} e {node2} na tentativa {attempts + 1}. Timeslot: {self._network.get_timeslot()}')
-                            success = False
-                            break
-                    if not success:
-                        break
+            else:
+                self._network_layer.release_routes(routes)
+                self.logger.log('Não foi possível reservar rotas válidas para os %s qubits na tentativa %s. Timeslot: %s', num_qubits, attempts + 1, self._network.get_timeslot())
             
             if not success:
                 attempts += 1
@@ -104,10 +94,11 @@ class TransportLayer:
                     'bob_id': bob_id,
                 }
                 self.transmitted_qubits.append(qubit_info)
-            self.logger.log(f'Transmissão de {num_qubits} qubits entre {alice_id} e {bob_id} concluída com sucesso. Timeslot: {self._network.get_timeslot()}')
+            self._network_layer.release_routes(routes)
+            self.logger.log('Transmissão de %s qubits entre %s e %s concluída com sucesso. Timeslot: %s', num_qubits, alice_id, bob_id, self._network.get_timeslot())
             return True
         else:
-            self.logger.log(f'Falha na transmissão de {num_qubits} qubits entre {alice_id} e {bob_id} após {attempts} tentativas. Timeslot: {self._network.get_timeslot()}')
+            self.logger.log('Falha na transmissão de %s qubits entre %s e %s após %s tentativas. Timeslot: %s', num_qubits, alice_id, bob_id, attempts, self._network.get_timeslot())
             return False
 
     def teleportation_protocol(self, alice_id: int, bob_id: int):
@@ -122,12 +113,13 @@ class TransportLayer:
             bool : True se o teletransporte foi bem-sucedido, False caso contrário.
         """
         self._network.timeslot()  # Incrementa o timeslot para o protocolo de teletransporte
-        self.logger.log(f'Timeslot {self._network.get_timeslot()}: Iniciando teletransporte entre {alice_id} e {bob_id}.')
+        self.logger.log('Timeslot %s: Iniciando teletransporte entre %s e %s.', self._network.get_timeslot(), alice_id, bob_id)
         
         # Estabelece uma rota válida
         route = self._network_layer.short_route_valid(alice_id, bob_id)
         if route is None:
-            self.logger.log(f'Não foi possível encontrar uma rota válida para teletransporte entre {alice_id} e {bob_id}. Timeslot: {self._network.get_timeslot()}')
+            self.logger.log('Não foi possível encontrar uma rota válida para teletransporte entre %s e %s. Timeslot: %s', alice_id, bob_id, self._network.get_timeslot())
+            self._network.trace.record(TraceRecorder.TELEPORT_FAIL, TraceRecorder.TRANSPORT, alice_id, bob_id)
             return False
         
         # Pega um qubit de Alice e um qubit de Bob
@@ -135,27 +127,32 @@ class TransportLayer:
         bob = self._network.get_host(bob_id)
         
         if len(alice.memory) < 1 or len(bob.memory) < 1:
-            self.logger.log(f'Alice ou Bob não possuem qubits suficientes para teletransporte. Timeslot: {self._network.get_timeslot()}')
+            self.logger.log('Alice ou Bob não possuem qubits suficientes para teletransporte. Timeslot: %s', self._network.get_timeslot())
+            self._network.trace.record(TraceRecorder.TELEPORT_FAIL, TraceRecorder.TRANSPORT, alice_id, bob_id)
             return False
         
-        qubit_alice = alice.memory.pop(0)  # Remove o primeiro qubit da memória de Alice
-        qubit_bob = bob.memory.pop()       # Remove o último qubit da memória de Bob
+        qubit_alice = alice.get_first_qubit()  # Remove o primeiro qubit da memória de Alice
+        qubit_bob = bob.get_last_qubit()       # Remove o último qubit da memória de Bob
         
         # Calcula a fidelidade final do teletransporte
         f_alice = qubit_alice.get_current_fidelity()
         f_bob = qubit_bob.get_current_fidelity()
         
         # Assume fidelidade do link como a média das fidelidades dos pares EPR na rota
-        fidelities = []
+        channels = self._network.channels
+        total_fidelity = 0.0
+        total_eprs = 0
         for i in range(len(route) - 1):
-            epr_pairs = self._network.get_eprs_from_edge(route[i], route[i+1])
-            fidelities.extend([epr.get_current_fidelity() for epr in epr_pairs])
+            fidelities = channels.fidelities(channels.edge_id(route[i], route[i+1]))
+            total_fidelity += float(fidelities.sum())
+            total_eprs += len(fidelities)
         
-        if not fidelities:
-            self.logger.log(f'Não foi possível encontrar pares EPR na rota entre {alice_id} e {bob_id}. Timeslot: {self._network.get_timeslot()}')
+        if total_eprs == 0:
+            self.logger.log('Não foi possível encontrar pares EPR na rota entre %s e %s. Timeslot: %s', alice_id, bob_id, self._network.get_timeslot())
+            self._network.trace.record(TraceRecorder.TELEPORT_FAIL, TraceRecorder.TRANSPORT, alice_id, bob_id)
             return False
         
-        f_route = sum(fidelities) / len(fidelities)
+        f_route = total_fidelity / total_eprs
         
         # Fidelidade final do qubit teletransportado
         F_final = f_alice * f_bob * f_route + (1 - f_alice) * (1 - f_bob) * (1 - f_route)
@@ -168,20 +165,27 @@ class TransportLayer:
             'fidelity_bob': f_bob,
             'fidelity_route': f_route,
             'F_final': F_final,
-            'qubit_alice': qubit_alice,
-            'qubit_bob': qubit_bob,
+            'qubit_alice': self._physical_layer.retain(qubit_alice),
+            'qubit_bob': self._physical_layer.retain(qubit_bob),
             'success': True
         }
         
-        # Adiciona o qubit teletransportado à memória de Bob com a fidelidade final calculada
-        qubit_alice.fidelity = F_final
-        bob.memory.append(qubit_alice)
-        self.logger.log(f'Teletransporte de qubit de {alice_id} para {bob_id} foi bem-sucedido com fidelidade final de {F_final}. Timeslot: {self._network.get_timeslot()}')
+        # Adiciona o qubit teletransportado à memória de Bob (a fidelidade final fica registrada em qubit_info)
+        stored = bob.add_qubit(qubit_alice)
         
         # Par virtual é deletado no final
         for i in range(len(route) - 1):
             self._network.remove_epr(route[i], route[i + 1])
         
+        if not stored:
+            self._physical_layer.release_qubit(qubit_alice)
+            self._network.trace.record(TraceRecorder.TELEPORT_FAIL, TraceRecorder.TRANSPORT, alice_id, bob_id, fidelity=F_final)
+            self.logger.log('Teletransporte de qubit de %s para %s falhou: a memória de Bob rejeitou o qubit. Timeslot: %s', alice_id, bob_id, self._network.get_timeslot())
+            return False
+        
+        self._network.trace.record(TraceRecorder.TELEPORT_SUCCESS, TraceRecorder.TRANSPORT, alice_id, bob_id, fidelity=F_final)
+        self.logger.log('Teletransporte de qubit de %s para %s foi bem-sucedido com fidelidade final de %s. Timeslot: %s', alice_id, bob_id, F_final, self._network.get_timeslot())
+        
         self.transmitted_qubits.append(qubit_info)
         return True
 
@@ -200,7 +204,8 @@ class TransportLayer:
             fidelity = qubit_info['F_final']
             total_fidelity += fidelity
             total_qubits_used += 1
-            self.logger.log(f'Fidelidade do qubit utilizado de {qubit_info["alice_id"]} para {qubit_info["bob_id"]}: {fidelity}')
+            if self.logger.enabled:
+                self.logger.log('Fidelidade do qubit utilizado de %s para %s: %s', qubit_info["alice_id"], qubit_info["bob_id"], fidelity)
 
         # Considera apenas os qubits efetivamente transmitidos (não inclui os qubits que permanecem na memória dos hosts)
         if total_qubits_used == 0:
@@ -208,7 +213,7 @@ class TransportLayer:
             return 0.0
 
         avg_fidelity = total_fidelity / total_qubits_used
-        self.logger.log(f'A fidelidade média de todos os qubits utilizados na camada de transporte é {avg_fidelity}')
+        self.logger.log('A fidelidade média de todos os qubits utilizados na camada de transporte é %s', avg_fidelity)
         
         return avg_fidelity
 
@@ -241,20 +246,20 @@ class TransportLayer:
         # Se Alice tiver menos qubits do que o necessário, crie mais qubits
         if available_qubits < num_qubits:
             qubits_needed = num_qubits - available_qubits
-            self.logger.log(f'Número insuficiente de qubits na memória de Alice (Host {alice_id}). Criando mais {qubits_needed} qubits para completar os {num_qubits} necessários.')
+            self.logger.log('Número insuficiente de qubits na memória de Alice (Host %s). Criando mais %s qubits para completar os %s necessários.', alice_id, qubits_needed, num_qubits)
 
             for _ in range(qubits_needed):
                 self._network.timeslot()  # Incrementa o timeslot a cada criação de qubit
-                self.logger.log(f"Timeslot antes da criação do qubit: {self._network.get_timeslot()}")
+                self.logger.log('Timeslot antes da criação do qubit: %s', self._network.get_timeslot())
                 self._physical_layer.create_qubit(alice_id)  # Cria novos qubits para Alice
-                self.logger.log(f"Qubit criado para Alice (Host {alice_id}) no timeslot: {self._network.get_timeslot()}")
+                self.logger.log('Qubit criado para Alice (Host %s) no timeslot: %s', alice_id, self._network.get_timeslot())
 
             # Atualiza a quantidade de qubits disponíveis após a criação
             available_qubits = len(alice.memory)
 
         # Certifique-se de que Alice tenha exatamente o número de qubits necessários após a criação
         if available_qubits != num_qubits:
-            self.logger.log(f'Erro: Alice tem {available_qubits} qubits, mas deveria ter {num_qubits} qubits. Abortando transmissão.')
+            self.logger.log('Erro: Alice tem %s qubits, mas deveria ter %s qubits. Abortando transmissão.', available_qubits, num_qubits)
             return False
 
         # Começa a transmissão dos qubits
@@ -263,39 +268,31 @@ class TransportLayer:
         success_count = 0
 
         while attempts < max_attempts and success_count < num_qubits:
-            self.logger.log(f'Tentativa {attempts + 1} de transmissão de qubits entre {alice_id} e {bob_id}.')
+            self.logger.log('Tentativa %s de transmissão de qubits entre %s e %s.', attempts + 1, alice_id, bob_id)
 
-            for _ in range(num_qubits - success_count):
-                # Tenta encontrar uma rota válida
-                route = self._network_layer.short_route_valid(alice_id, bob_id)
+            # Reserva de uma só vez as rotas dos qubits que faltam, um par EPR por salto
+            routes = self._network_layer.reserve_routes(alice_id, bob_id, num_qubits - success_count)
 
-                if route is None:
-                    self.logger.log(f'Não foi possível encontrar uma rota válida na tentativa {attempts + 1}. Timeslot: {self._network.get_timeslot()}')
-                    break
+            if not routes:
+                self.logger.log('Não foi possível encontrar uma rota válida na tentativa %s. Timeslot: %s', attempts + 1, self._network.get_timeslot())
 
-                # Verifica a fidelidade dos pares EPR ao longo da rota
-                fidelities = []
+            channels = self._network.channels
+            for position, route in enumerate(routes):
+                # Fidelidade dos pares EPR ao longo da rota, no estado atual dos canais (somas mantidas em O(1) por canal)
+                total_fidelity = 0.0
+                total_eprs = 0
                 for i in range(len(route) - 1):
-                    node1 = route[i]
-                    node2 = route[i + 1]
-
-
-                    epr_pairs = self._network.get_eprs_from_edge(node1, node2)
-                    if len(epr_pairs) == 0:
-                        self.logger.log(f'Não foi possível encontrar pares EPR suficientes na rota {route[i]} -> {route[i + 1]}.')
-                        break
-                    fidelities.extend([epr.get_current_fidelity() for epr in epr_pairs])
-
-                # Se falhar em encontrar pares EPR suficientes, tenta na próxima tentativa
-                if len(fidelities) == 0:
-                    attempts += 1
-                    continue
-
-                f_route = sum(fidelities) / len(fidelities)
+                    edge_id = channels.edge_id(route[i], route[i + 1])
+                    total_fidelity += channels.fidelity_sum(edge_id)
+                    total_eprs += channels.size(edge_id)
+                f_route = total_fidelity / total_eprs
+                if position > 0:
+                    # A primeira rota já foi contabilizada pelo short_route_valid
+                    self._network_layer.record_route_fidelity(f_route)
 
                 # Se a rota for encontrada, transmite o qubit imediatamente
                 if len(alice.memory) > 0:  # Verifica se ainda há qubits na memória de Alice
-                    qubit_alice = alice.memory.pop(0)  # REMOVE o qubit de Alice
+                    qubit_alice = alice.get_first_qubit()  # REMOVE o qubit de Alice
                     f_alice = qubit_alice.get_current_fidelity()
                     F_final = f_alice * f_route
 
@@ -308,31 +305,39 @@ class TransportLayer:
                         'fidelity_route': f_route,
                         'F_final': F_final,
                         'timeslot': self._network.get_timeslot(),
-                        'qubit': qubit_alice
+                        'qubit': self._physical_layer.retain(qubit_alice)
                     }
 
-                    # Adiciona o qubit transmitido à memória de Bob
-                    qubit_alice.fidelity = F_final
-                    bob.memory.append(qubit_alice)
+                    # Adiciona o qubit transmitido à memória de Bob (a fidelidade final fica registrada em qubit_info)
+                    if not bob.add_qubit(qubit_alice):
+                        self._physical_layer.release_qubit(qubit_alice)
+                        self._network.trace.record(TraceRecorder.TELEPORT_FAIL, TraceRecorder.TRANSPORT, alice_id, bob_id, fidelity=F_final)
+                        self.logger.log('A memória de Bob rejeitou o qubit teletransportado de %s para %s.', alice_id, bob_id)
+                        break
 
                     # Incrementa o contador de qubits e timeslot
                     success_count += 1
                     self.used_qubits += 1
-                    self.logger.log(f'Teletransporte de qubit de {alice_id} para {bob_id} na rota {route} foi bem-sucedido com fidelidade final de {F_final}.')
+                    self._network.trace.record(TraceRecorder.TELEPORT_SUCCESS, TraceRecorder.TRANSPORT, alice_id, bob_id, fidelity=F_final)
+                    if self.logger.enabled:
+                        self.logger.log('Teletransporte de qubit de %s para %s na rota %s foi bem-sucedido com fidelidade final de %s.', alice_id, bob_id, route, F_final)
 
                     # Armazena as informações do qubit transmitido
                     self.transmitted_qubits.append(qubit_info)
                 else:
-                    self.logger.log(f'Alice não possui qubits suficientes para continuar a transmissão.')
+                    self.logger.log('Alice não possui qubits suficientes para continuar a transmissão.')
                     break
 
+            # Fim da tentativa: as reservas das rotas voltam a ficar livres
+            self._network_layer.release_routes(routes)
             attempts += 1
 
         if success_count == num_qubits:
-            self.logger.log(f'Transmissão e teletransporte de {num_qubits} qubits entre {alice_id} e {bob_id} concluídos com sucesso. Timeslot: {self._network.get_timeslot()}')
+            self.logger.log('Transmissão e teletransporte de %s qubits entre %s e %s concluídos com sucesso. Timeslot: %s', num_qubits, alice_id, bob_id, self._network.get_timeslot())
             return True
         else:
-            self.logger.log(f'Falha na transmissão de {num_qubits} qubits entre {alice_id} e {bob_id}. Apenas {success_count} qubits foram transmitidos com sucesso. Timeslot: {self._network.get_timeslot()}')
+            self._network.trace.record(TraceRecorder.TELEPORT_FAIL, TraceRecorder.TRANSPORT, alice_id, bob_id)
+            self.logger.log('Falha na transmissão de %s qubits entre %s e %s. Apenas %s qubits foram transmitidos com sucesso. Timeslot: %s', num_qubits, alice_id, bob_id, success_count, self._network.get_timeslot())
             return False
 
 
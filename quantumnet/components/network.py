@@ -1,5 +1,6 @@
 import networkx as nx
-from ..objects import Logger, Qubit
+import numpy as np
+from ..objects import Logger, Qubit, ChannelStore, CSRGraph, QubitRegistry, TraceRecorder
 from ..components import Host
 from .layers import *
 import random
@@ -10,11 +11,19 @@ class Network():
     """
     Um objeto para utilizar como rede.
     """
-    def __init__(self) -> None:
+    def __init__(self, seed: int | np.random.SeedSequence | None = None) -> None:
+        # Geradores de números aleatórios da rede, usados por todas as camadas
+        self.set_seed(seed)
         # Sobre a rede
         self._graph = nx.Graph()
+        self._routing_graph = nx.Graph()  # Topologia física, sem as arestas virtuais (swapped)
+        self.topology_version = 0  # Incrementado sempre que a topologia física (visão de roteamento) muda
+        self._csr = None  # Snapshot CSR da visão de roteamento, refeito apenas quando a versão muda
+        self._topology_listeners = []  # Objetos avisados a cada aresta adicionada ou removida da visão de roteamento
         self._topology = None
         self._hosts = {}
+        self._channels = ChannelStore(clock=self.get_timeslot)
+        self.trace = TraceRecorder(clock=self.get_timeslot)  # Desativado até trace.start()
         # Camadas
         self._physical = PhysicalLayer(self)
         self._link = LinkLayer(self, self._physical)
@@ -25,13 +34,35 @@ class Network():
         self.logger = Logger.get_instance()
         self.count_qubit = 0
         self.timeslot_decoherence = False
+        self.lazy_decoherence = False
+        self.decoherence_factor = 0.9
         #minimo e maximo
         self.max_prob = 1
         self.min_prob = 0.2
         self.timeslot_total = 0
-        self.qubit_timeslots = {}  # Dicionário para armazenar qubits criados e seus timeslots
+        self.qubit_timeslots = QubitRegistry()  # Timeslot e camada de criação de cada qubit, indexados pelo id
         self.avg_fidelity_route: float = -1 # Inicializa a fidelidade média da rota
 
+    def set_seed(self, seed: int | np.random.SeedSequence | None = None) -> None:
+        """
+        Define a semente da rede. Da semente raiz saem dois fluxos independentes (SeedSequence.spawn):
+        `rng`, um random.Random para os sorteios escalares, e `np_rng`, um np.random.Generator para os
+        sorteios em lote. Redes com sementes diferentes não compartilham estado, mesmo em processos
+        criados por fork.
+
+        Args:
+            seed (int | np.random.SeedSequence, optional): Semente raiz. Se None, usa entropia do sistema.
+        """
+        if isinstance(seed, np.random.SeedSequence):
+            # Cópia, para que a mesma semente gere sempre os mesmos fluxos
+            seed = np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key)
+        else:
+            seed = np.random.SeedSequence(seed)
+        self.seed_sequence = seed
+        python_stream, numpy_stream = seed.spawn(2)
+        self.rng = random.Random(int.from_bytes(python_stream.generate_state(4).tobytes(), 'little'))
+        self.np_rng = np.random.default_rng(numpy_stream)
+
     @property
     def hosts(self):
         """
@@ -52,6 +83,30 @@ class Network():
         """
         return self._graph
     
+    @property
+    def routing_graph(self):
+        """
+        Visão de roteamento da rede: o grafo sem as arestas criadas ou marcadas pelo entanglement swapping.
+        É atualizada incrementalmente a cada alteração de canal.
+
+        Returns:
+            nx.Graph : Grafo de roteamento da rede.
+        """
+        return self._routing_graph
+
+    @property
+    def csr(self) -> CSRGraph:
+        """
+        Snapshot imutável da visão de roteamento em formato CSR (indptr/indices/edge_ids).
+        É refeito apenas quando a topologia física muda.
+
+        Returns:
+            CSRGraph : Snapshot da topologia física.
+        """
+        if self._csr is None or self._csr.version != self.topology_version:
+            self._csr = CSRGraph(self._routing_graph, self.topology_version)
+        return self._csr
+
     @property
     def nodes(self):
         """
@@ -72,6 +127,16 @@ class Network():
         """
         return self._graph.edges()
     
+    @property
+    def channels(self):
+        """
+        Armazenamento dos pares EPR de todos os canais da rede.
+
+        Returns:
+            ChannelStore : Canais da rede, indexados por id de aresta.
+        """
+        return self._channels
+
     @property
     def topology(self):
         """
@@ -149,21 +214,75 @@ class Network():
         # Adiciona o host ao dicionário de hosts, se não existir
         if host.host_id not in self._hosts:        
             self._hosts[host.host_id] = host
-            Logger.get_instance().debug(f'Host {host.host_id} adicionado aos hosts da rede.')
+            if self.lazy_decoherence:
+                host.set_decoherence_clock(self)
+            Logger.get_instance().debug('Host %s adicionado aos hosts da rede.', host.host_id)
         else:
             raise Exception(f'Host {host.host_id} já existe nos hosts da rede.')
             
         # Adiciona o nó ao grafo da rede, se não existir
         if not self._graph.has_node(host.host_id):
             self._graph.add_node(host.host_id)
-            Logger.get_instance().debug(f'Nó {host.host_id} adicionado ao grafo da rede.')
+            self._routing_graph.add_node(host.host_id)
+            self.topology_version += 1
+            Logger.get_instance().debug('Nó %s adicionado ao grafo da rede.', host.host_id)
             
         # Adiciona as conexões do nó ao grafo da rede, se não existirem
         for connection in host.connections:
             if not self._graph.has_edge(host.host_id, connection):
-                self._graph.add_edge(host.host_id, connection)
-                Logger.get_instance().debug(f'Conexões do {host.host_id} adicionados ao grafo da rede.')
+                self.add_channel(host.host_id, connection)
+                Logger.get_instance().debug('Conexões do %s adicionados ao grafo da rede.', host.host_id)
     
+    def add_channel(self, u: int, v: int, swapped: bool = False) -> int:
+        """
+        Adiciona um canal (aresta) à rede, caso não exista, mantendo a visão de roteamento atualizada.
+
+        Args:
+            u (int): ID de um dos hosts.
+            v (int): ID do outro host.
+            swapped (bool): Se True, marca o canal como virtual, criado pelo entanglement swapping.
+
+        Returns:
+            int : Id do canal no armazenamento de EPRs.
+        """
+        if not self._graph.has_edge(u, v):
+            self._graph.add_edge(u, v)
+            if not swapped:
+                self._routing_graph.add_edge(u, v)
+                self.topology_version += 1
+                for listener in self._topology_listeners:
+                    listener.edge_added(u, v)
+        if swapped:
+            self.mark_swapped(u, v)
+        return self._channels.add_edge(u, v)
+
+    def mark_swapped(self, u: int, v: int) -> None:
+        """
+        Marca um canal como virtual (swapped), retirando-o da visão de roteamento.
+
+        Args:
+            u (int): ID de um dos hosts.
+            v (int): ID do outro host.
+        """
+        self._graph.edges[u, v]['swapped'] = True
+        if self._routing_graph.has_edge(u, v):
+            self._routing_graph.remove_edge(u, v)
+            self.topology_version += 1
+            for listener in self._topology_listeners:
+                listener.edge_removed(u, v)
+
+    def add_topology_listener(self, listener) -> None:
+        """
+        Registra um objeto a ser avisado das mudanças de arestas da visão de roteamento.
+        Ele deve ter os métodos edge_added(u, v) e edge_removed(u, v), chamados depois da mudança.
+        As demais mudanças (nós novos ou troca de topologia) só aparecem em topology_version.
+
+        Args:
+            listener: Objeto avisado das mudanças, como o Controller.
+        """
+        if listener not in self._topology_listeners:
+            self._topology_listeners.append(listener)
+
     def get_host(self, host_id: int) -> Host:
         """
         Retorna um host da rede.
@@ -190,27 +309,34 @@ class Network():
         """
         Cria uma lista de qubits entrelaçados (EPRs) associadas a cada aresta do grafo.
 
+        Os EPRs ficam no armazenamento de canais (ChannelStore), então as listas são cópias:
+        alterá-las não altera os canais. Para adicionar ou remover EPRs use
+        physical.add_epr_to_channel, physical.remove_epr_from_channel ou remove_epr.
+
         Returns:
             Um dicionários que armazena as chaves que são as arestas do grafo e os valores são as
               listas de qubits entrelaçados (EPRs) associadas a cada aresta. 
         """
         eprs = {}
         for edge in self.edges:
-            eprs[edge] = self._graph.edges[edge]['eprs']
+            eprs[edge] = self._channels.eprs(self._channels.edge_id(*edge))
         return eprs
     
     def get_eprs_from_edge(self, alice: int, bob: int) -> list:
         """
-        Retorna os EPRs de uma aresta específica.
+        Retorna os EPRs de uma aresta específica, do mais antigo para o mais novo.
+
+        A lista e os objetos Epr são cópias dos valores guardados no armazenamento de canais:
+        alterá-los não altera o canal. Para adicionar ou remover EPRs use
+        physical.add_epr_to_channel, physical.remove_epr_from_channel ou remove_epr.
 
         Args:
             alice (int): ID do host Alice.
             bob (int): ID do host Bob.
         Returns:
-            list : Lista de EPRs da aresta.
+            list : Cópia da lista de EPRs da aresta.
         """
-        edge = (alice, bob)
-        return self._graph.edges[edge]['eprs']
+        return self._channels.eprs(self._channels.edge_id(alice, bob))
     
     def remove_epr(self, alice: int, bob: int) -> list:
         """
@@ -219,9 +345,8 @@ class Network():
         Args:
             channel (tuple): Canal de comunicação.
         """
-        channel = (alice, bob)
         try:
-            epr = self._graph.edges[channel]['eprs'].pop(-1)   
+            epr = self._channels.pop(self._channels.edge_id(alice, bob), -1)
             return epr
         except IndexError:
             raise Exception('Não há Pares EPRs.')
@@ -318,13 +443,13 @@ class Network():
             topology = 'er'
             if len(args) != 2:
                 raise Exception('Para a topologia Erdős-Rényi, são necessários dois argumentos')
-            self._graph = nx.erdos_renyi_graph(*args)
+            self._graph = nx.erdos_renyi_graph(*args, seed=self.rng)
 
         elif topology in ('ba', 'barabasi-albert'):
             topology = 'ba'
             if len(args) != 2:
                 raise Exception('Para a topologia Barabási-Albert, são necessários dois argumentos')
-            self._graph = nx.barabasi_albert_graph(*args)
+            self._graph = nx.barabasi_albert_graph(*args, seed=self.rng)
 
         else:
             raise Exception('O simulador não conta com a topologia selecionada')
@@ -343,10 +468,14 @@ class Network():
 
         # Converte os labels dos nós para inteiros
         self._graph = nx.convert_node_labels_to_integers(self._graph)
+        self._routing_graph = self._graph.copy()
+        self.topology_version += 1
 
         # Cria os hosts e adiciona ao dicionário de hosts
         for node in self._graph.nodes():
             self._hosts[node] = Host(node)
+            if self.lazy_decoherence:
+                self._hosts[node].set_decoherence_clock(self)
         self.start_hosts()
         self.start_channels()
         self.start_eprs()
@@ -371,10 +500,13 @@ class Network():
             prob_on_demand_epr_create (float): Probabilidade de criar um EPR sob demanda.
             prob_replay_epr_create (float): Probabilidade de criar um EPR de replay.
         """
+        self._channels.clear()
         for edge in self.edges:
-            self._graph.edges[edge]['prob_on_demand_epr_create'] = random.uniform(self.min_prob, self.max_prob)
-            self._graph.edges[edge]['prob_replay_epr_create'] = random.uniform(self.min_prob, self.max_prob)
-            self._graph.edges[edge]['eprs'] = list()
+            prob_on_demand = self.rng.uniform(self.min_prob, self.max_prob)
+            prob_replay = self.rng.uniform(self.min_prob, self.max_prob)
+            self._graph.edges[edge]['prob_on_demand_epr_create'] = prob_on_demand
+            self._graph.edges[edge]['prob_replay_epr_create'] = prob_replay
+            self._channels.set_echp_probabilities(self._channels.add_edge(*edge), prob_on_demand, prob_replay)
         self.logger.log("Canais inicializados")
         
     def start_eprs(self, num_eprs: int = 10):
@@ -385,10 +517,11 @@ class Network():
             num_eprs (int): Número de pares EPR a serem inicializados para cada canal.
         """
         for edge in self.edges:
+            edge_id = self._channels.edge_id(*edge)
             for i in range(num_eprs):
                 epr = self.physical.create_epr_pair(increment_timeslot=False,increment_eprs=False)
-                self._graph.edges[edge]['eprs'].append(epr)
-                self.logger.debug(f'Par EPR {epr} adicionado ao canal.')
+                self._channels.append(edge_id, epr)
+                self.logger.debug('Par EPR %s adicionado ao canal.', epr)
         self.logger.log("Pares EPRs adicionados")
 
         
@@ -397,8 +530,8 @@ class Network():
         Incrementa o timeslot da rede.
         """
         self.timeslot_total += 1
-        if self.timeslot_decoherence:
-            self.apply_decoherence_to_all_layers()
+        if self.timeslot_decoherence and not self.lazy_decoherence:
+            self.apply_decoherence_to_all_layers(self.decoherence_factor)
 
     def get_timeslot(self):
         """
@@ -416,8 +549,20 @@ class Network():
         Args:
             qubit_id (int): ID do qubit criado.
             timeslot (int): Timeslot em que o qubit foi criado.
+            layer_name (str): Camada que criou o qubit.
+        """
+        self.qubit_timeslots.register(qubit_id, timeslot, layer_name)
+
+    def register_qubit_creations(self, qubit_ids, timeslots, layer_name):
+        """
+        Registra a criação de vários qubits de uma só vez.
+
+        Args:
+            qubit_ids: IDs dos qubits criados.
+            timeslots: Timeslot de criação de cada qubit.
+            layer_name (str): Camada que criou os qubits.
         """
-        self.qubit_timeslots[qubit_id] = {'timeslot': timeslot, 'layer': layer_name}
+        self.qubit_timeslots.register_many(qubit_ids, timeslots, layer_name)
         
     def display_all_qubit_timeslots(self):
         """
@@ -511,14 +656,42 @@ class Network():
             else:
                 raise ValueError("Tipo de saída inválido. Escolha entre 'print', 'csv' ou 'variable'.")
 
-    def active_timeslote_decoherence(self, active: bool = False) -> None:
+    def active_timeslote_decoherence(self, active: bool = False, lazy: bool = False) -> None:
         """
         Ativa ou Desativa a decoerência da rede a cada timeslot
 
+        Na decoerência preguiçosa, cada qubit em memória e cada EPR guarda o timeslot da sua
+        última atualização e a fidelidade é calculada na leitura como f0 * fator ** idade,
+        então o timeslot() passa a custar O(1). Os valores são os mesmos da varredura a cada timeslot.
+
         Args:
             active: Indica se deve ou não ativar a decoerência
-        """
+            lazy: Se True, aplica a decoerência de forma preguiçosa
+        """
+        lazy = active and lazy
+        if lazy != self.lazy_decoherence:
+            clock = self if lazy else None
+            for host in self._hosts.values():
+                host.set_decoherence_clock(clock)
+            if lazy:
+                self._channels.start_lazy_decay(self.decoherence_factor)
+            else:
+                self._channels.stop_lazy_decay()
+
         self.timeslot_decoherence = active
+        self.lazy_decoherence = lazy
+
+    def decoherence_decay(self, timeslot: int) -> float:
+        """
+        Fator de decoerência acumulado desde um timeslot até o timeslot atual.
+
+        Args:
+            timeslot: Timeslot da última atualização da fidelidade
+
+        Returns:
+            float: decoherence_factor ** (timeslot atual - timeslot)
+        """
+        return self.decoherence_factor ** (self.timeslot_total - timeslot)
 
     def apply_decoherence_to_all_layers(self, decoherence_factor: float = 0.9):
         """
@@ -528,18 +701,15 @@ class Network():
 
         # Aplicar decoerência nos qubits de cada host
         for host_id, host in self.hosts.items():
-            for qubit in host.memory:
-                creation_timeslot = self.qubit_timeslots[qubit.qubit_id]['timeslot']
+            if not host.memory:
+                continue
+            creation_timeslots = self.qubit_timeslots.creation_timeslots([qubit.qubit_id for qubit in host.memory])
+            for qubit, creation_timeslot in zip(host.memory, creation_timeslots.tolist()):
                 if creation_timeslot < current_timeslot:
                     current_fidelity = qubit.get_current_fidelity()
                     new_fidelity = current_fidelity * decoherence_factor
                     qubit.set_current_fidelity(new_fidelity)
 
-        # Aplicar decoerência nos EPRs em todos os canais (arestas da rede)
-        for edge in self.edges:
-            if 'eprs' in self._graph.edges[edge]:
-                for epr in self._graph.edges[edge]['eprs']:
-                    current_fidelity = epr.get_current_fidelity()
-                    new_fidelity = current_fidelity * decoherence_factor
-                    epr.set_fidelity(new_fidelity)
+        # Aplicar decoerência nos EPRs em todos os canais (arestas da rede) de uma só vez
+        self._channels.apply_decay(decoherence_factor)
 
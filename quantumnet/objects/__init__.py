@@ -1,3 +1,8 @@
 from .logger import Logger
 from .qubit import Qubit
-from .epr import Epr
\ No newline at end of file
+from .epr import Epr
+from .channel_store import ChannelStore
+from .csr_graph import CSRGraph
+from .fidelity_stats import FidelityStats, ChannelFidelityStats
+from .qubit_registry import QubitRegistry
+from .trace import TraceRecorder
\ No newline at end of file
@@ -0,0 +1,492 @@
+from array import array
+import numpy as np
+from .epr import Epr
+
+class ChannelStore():
+    """
+    Armazena os pares EPR de todos os canais da rede em buffers compactos.
+
+    Cada canal (aresta) recebe um id inteiro. Os pares EPR ocupam slots de um pool único
+    (fidelidade atual, fidelidade inicial e id em buffers `array`), encadeados por canal em
+    ordem de inserção, do mais antigo para o mais novo. Os buffers podem ser vistos como
+    arrays NumPy, o que permite operações vetorizadas sobre a rede inteira.
+
+    Cada canal também indexa seus slots pelo id do EPR, de modo que remover um EPR pelo id,
+    retirar o mais antigo e retirar o mais novo custam O(1). A soma das fidelidades de cada canal
+    é mantida a cada inserção e remoção, então a fidelidade média também custa O(1).
+
+    Args:
+        clock (optional): Função que retorna o timeslot atual, usada na decoerência preguiçosa.
+    """
+    def __init__(self, clock=None) -> None:
+        # Sobre a decoerência preguiçosa
+        self._clock = clock
+        self._decay = None           # Fator de decoerência por timeslot (None se desativada)
+        # Sobre os canais
+        self._edge_ids = {}          # {(u, v): edge_id}, registrado nos dois sentidos
+        self._edges = []             # edge_id -> (u, v)
+        self._head = array('q')      # Slot do EPR mais antigo de cada canal (-1 se vazio)
+        self._tail = array('q')      # Slot do EPR mais novo de cada canal (-1 se vazio)
+        self._size = array('q')      # Quantidade de EPRs em cada canal
+        self._index = []             # {código do EPR: slot mais novo com esse código} de cada canal
+        self._depleted = set()       # Canais sem nenhum EPR, atualizado em O(1) a cada inserção/remoção
+        self._prob_on_demand = array('d')  # Probabilidade do ECHP sob demanda de cada canal (nan se não definida)
+        self._prob_replay = array('d')     # Probabilidade do ECHP de replay de cada canal (nan se não definida)
+        self._fidelity_sum = array('d')    # Soma das fidelidades dos EPRs de cada canal, válida no timeslot abaixo
+        self._sum_timeslot = array('q')    # Timeslot em que a soma foi atualizada (decoerência preguiçosa)
+        self._reserved = array('q')        # Quantidade de EPRs reservados de cada canal
+        # Sobre os slots
+        self._fidelity = array('d')
+        self._initial_fidelity = array('d')
+        self._timeslot = array('q')  # Timeslot da última atualização da fidelidade
+        self._epr_code = array('q')  # Id do EPR (ids não inteiros são internados com código negativo)
+        self._edge = array('q')      # Canal dono do slot (-1 se o slot está livre)
+        self._next = array('q')
+        self._prev = array('q')
+        self._same = array('q')      # Slot anterior com o mesmo código no mesmo canal (-1 se não houver)
+        self._free = []
+        # Ids de EPR que não são inteiros não negativos (ex.: pares virtuais identificados por tupla)
+        self._foreign_codes = {}
+        self._foreign_ids = []
+
+    def __len__(self) -> int:
+        return len(self._edges)
+
+    @property
+    def edges(self) -> list:
+        """
+        Canais registrados, indexados pelo id da aresta.
+
+        Returns:
+            list : Lista de tuplas (u, v).
+        """
+        return self._edges
+
+    def clear(self) -> None:
+        """
+        Remove todos os canais e pares EPR armazenados.
+        """
+        decay = self._decay
+        self.__init__(self._clock)
+        self._decay = decay
+
+    def add_edge(self, u, v) -> int:
+        """
+        Registra um canal, caso ainda não exista.
+
+        Args:
+            u : Nó de uma das extremidades.
+            v : Nó da outra extremidade.
+
+        Returns:
+            int : Id do canal.
+        """
+        edge_id = self._edge_ids.get((u, v))
+        if edge_id is not None:
+            return edge_id
+
+        edge_id = len(self._edges)
+        self._edges.append((u, v))
+        self._edge_ids[(u, v)] = edge_id
+        self._edge_ids[(v, u)] = edge_id
+        self._head.append(-1)
+        self._tail.append(-1)
+        self._size.append(0)
+        self._index.append({})
+        self._depleted.add(edge_id)
+        self._prob_on_demand.append(float('nan'))
+        self._prob_replay.append(float('nan'))
+        self._fidelity_sum.append(0.0)
+        self._sum_timeslot.append(self._now())
+        self._reserved.append(0)
+        return edge_id
+
+    def has_edge(self, u, v) -> bool:
+        return (u, v) in self._edge_ids
+
+    def edge_id(self, u, v) -> int:
+        """
+        Retorna o id do canal entre u e v.
+
+        Raises:
+            KeyError: Se o canal não existir.
+        """
+        return self._edge_ids[(u, v)]
+
+    @property
+    def depleted(self) -> set:
+        """
+        Ids dos canais que não possuem nenhum par EPR.
+
+        Returns:
+            set : Conjunto de ids de canais esgotados.
+        """
+        return self._depleted
+
+    def is_depleted(self, edge_id: int) -> bool:
+        return edge_id in self._depleted
+
+    def size(self, edge_id: int) -> int:
+        """
+        Quantidade de pares EPR em um canal.
+        """
+        return self._size[edge_id]
+
+    def available(self, edge_id: int) -> int:
+        """
+        Quantidade de pares EPR de um canal que ainda não foram reservados.
+        """
+        return self._size[edge_id] - self._reserved[edge_id]
+
+    def reserve(self, edge_ids, count: int = 1) -> bool:
+        """
+        Reserva `count` pares EPR em cada um dos canais, tudo ou nada.
+
+        Args:
+            edge_ids : Ids dos canais (sem repetições), por exemplo os saltos de uma rota.
+            count (int): Quantidade de EPRs reservados em cada canal.
+
+        Returns:
+            bool : True se todos os canais tinham EPRs livres suficientes e foram reservados.
+        """
+        if any(self._size[edge_id] - self._reserved[edge_id] < count for edge_id in edge_ids):
+            return False
+        for edge_id in edge_ids:
+            self._reserved[edge_id] += count
+        return True
+
+    def release(self, edge_ids, count: int = 1) -> None:
+        """
+        Libera `count` reservas em cada um dos canais.
+
+        Args:
+            edge_ids : Ids dos canais.
+            count (int): Quantidade de reservas liberadas em cada canal.
+        """
+        for edge_id in edge_ids:
+            self._reserved[edge_id] = max(0, self._reserved[edge_id] - count)
+
+    def inventory(self) -> np.ndarray:
+        """
+        Retorna a quantidade de pares EPR de todos os canais, indexada pelo id do canal.
+
+        Returns:
+            np.ndarray : Cópia do inventário de EPRs.
+        """
+        return np.array(self._size, dtype=np.int64)
+
+    def _encode(self, epr_id) -> int:
+        if isinstance(epr_id, int) and epr_id >= 0:
+            return epr_id
+        code = self._foreign_codes.get(epr_id)
+        if code is None:
+            self._foreign_ids.append(epr_id)
+            code = -len(self._foreign_ids)
+            self._foreign_codes[epr_id] = code
+        return code
+
+    def _lookup(self, epr_id) -> int | None:
+        if isinstance(epr_id, int) and epr_id >= 0:
+            return epr_id
+        return self._foreign_codes.get(epr_id)
+
+    def _decode(self, code: int):
+        return code if code >= 0 else self._foreign_ids[-code - 1]
+
+    def _now(self) -> int:
+        return self._clock() if self._clock is not None else 0
+
+    def _current(self, slot: int) -> float:
+        if self._decay is None:
+            return self._fidelity[slot]
+        return self._fidelity[slot] * self._decay ** (self._now() - self._timeslot[slot])
+
+    def _rebase_sum(self, edge_id: int, now: int) -> None:
+        # Leva a soma das fidelidades do canal ao timeslot atual, aplicando a decoerência preguiçosa
+        if self._decay is not None and self._sum_timeslot[edge_id] != now:
+            self._fidelity_sum[edge_id] *= self._decay ** (now - self._sum_timeslot[edge_id])
+        self._sum_timeslot[edge_id] = now
+
+    def _materialize(self, slot: int) -> Epr:
+        epr = Epr(self._decode(self._epr_code[slot]), self._initial_fidelity[slot])
+        epr.set_fidelity(self._current(slot))
+        return epr
+
+    def push(self, edge_id: int, epr_id, fidelity: float, initial_fidelity: float = None) -> None:
+        """
+        Adiciona um par EPR ao final (mais novo) de um canal.
+
+        Args:
+            edge_id (int): Id do canal.
+            epr_id : Id do par EPR.
+            fidelity (float): Fidelidade atual do par.
+            initial_fidelity (float): Fidelidade inicial do par. Se None, usa a fidelidade atual.
+        """
+        if initial_fidelity is None:
+            initial_fidelity = fidelity
+        code = self._encode(epr_id)
+        now = self._now()
+        tail = self._tail[edge_id]
+        index = self._index[edge_id]
+        same = index.get(code, -1)
+
+        if self._free:
+            slot = self._free.pop()
+            self._fidelity[slot] = fidelity
+            self._initial_fidelity[slot] = initial_fidelity
+            self._timeslot[slot] = now
+            self._epr_code[slot] = code
+            self._edge[slot] = edge_id
+            self._next[slot] = -1
+            self._prev[slot] = tail
+            self._same[slot] = same
+        else:
+            slot = len(self._edge)
+            self._fidelity.append(fidelity)
+            self._initial_fidelity.append(initial_fidelity)
+            self._timeslot.append(now)
+            self._epr_code.append(code)
+            self._edge.append(edge_id)
+            self._next.append(-1)
+            self._prev.append(tail)
+            self._same.append(same)
+
+        if tail == -1:
+            self._head[edge_id] = slot
+            self._depleted.discard(edge_id)
+        else:
+            self._next[tail] = slot
+        self._tail[edge_id] = slot
+        self._size[edge_id] += 1
+        index[code] = slot
+        self._rebase_sum(edge_id, now)
+        self._fidelity_sum[edge_id] += fidelity
+
+    def append(self, edge_id: int, epr: Epr) -> None:
+        """
+        Adiciona um objeto Epr ao final de um canal.
+        """
+        self.push(edge_id, epr.epr_id, epr.get_current_fidelity(), epr.get_initial_fidelity())
+
+    def _unlink(self, slot: int) -> None:
+        edge_id = self._edge[slot]
+        self._rebase_sum(edge_id, self._now())
+        self._fidelity_sum[edge_id] -= self._current(slot)
+        prev = self._prev[slot]
+        following = self._next[slot]
+
+        if prev == -1:
+            self._head[edge_id] = following
+        else:
+            self._next[prev] = following
+        if following == -1:
+            self._tail[edge_id] = prev
+            if prev == -1:
+                self._depleted.add(edge_id)
+        else:
+            self._prev[following] = prev
+
+        # Retira o slot do índice por id do canal
+        index = self._index[edge_id]
+        code = self._epr_code[slot]
+        top = index[code]
+        if top == slot:
+            if self._same[slot] == -1:
+                del index[code]
+            else:
+                index[code] = self._same[slot]
+        else:
+            while self._same[top] != slot:
+                top = self._same[top]
+            self._same[top] = self._same[slot]
+
+        self._size[edge_id] -= 1
+        if self._reserved[edge_id] > self._size[edge_id]:
+            self._reserved[edge_id] = self._size[edge_id]  # Um par reservado foi consumido
+        if self._size[edge_id] == 0:
+            self._fidelity_sum[edge_id] = 0.0  # Descarta o erro de arredondamento acumulado
+        self._edge[slot] = -1
+        self._free.append(slot)
+
+    def _slot_at(self, edge_id: int, index: int) -> int:
+        size = self._size[edge_id]
+        if index < 0:
+            index += size
+        if index < 0 or index >= size:
+            raise IndexError('Índice fora do canal.')
+
+        if index <= size // 2:
+            slot = self._head[edge_id]
+            for _ in range(index):
+                slot = self._next[slot]
+        else:
+            slot = self._tail[edge_id]
+            for _ in range(size - 1 - index):
+                slot = self._prev[slot]
+        return slot
+
+    def _slots(self, edge_id: int):
+        slot = self._head[edge_id]
+        while slot != -1:
+            yield slot
+            slot = self._next[slot]
+
+    def contains(self, edge_id: int, epr_id) -> bool:
+        """
+        Verifica se um canal possui um par EPR com o id informado.
+        """
+        return self._lookup(epr_id) in self._index[edge_id]
+
+    def get(self, edge_id: int, index: int = 0) -> Epr:
+        """
+        Retorna o par EPR na posição `index` do canal (0 é o mais antigo, -1 o mais novo).
+
+        Raises:
+            IndexError: Se o canal não tiver EPRs suficientes.
+        """
+        return self._materialize(self._slot_at(edge_id, index))
+
+    def pop(self, edge_id: int, index: int = -1) -> Epr:
+        """
+        Remove e retorna o par EPR na posição `index` do canal. Retirar o mais antigo (0)
+        ou o mais novo (-1) custa O(1).
+
+        Raises:
+            IndexError: Se o canal não tiver EPRs suficientes.
+        """
+        slot = self._slot_at(edge_id, index)
+        epr = self._materialize(slot)
+        self._unlink(slot)
+        return epr
+
+    def remove(self, edge_id: int, epr_ids) -> int:
+        """
+        Remove do canal todos os pares EPR cujo id está em `epr_ids`, em O(1) por EPR removido.
+
+        Args:
+            edge_id (int): Id do canal.
+            epr_ids : Ids dos pares EPR a serem removidos.
+
+        Returns:
+            int : Quantidade de EPRs removidos.
+        """
+        index = self._index[edge_id]
+        removed = 0
+        for epr_id in epr_ids:
+            code = self._lookup(epr_id)
+            slot = index.get(code, -1)
+            while slot != -1:
+                same = self._same[slot]
+                self._unlink(slot)
+                removed += 1
+                slot = same
+        return removed
+
+    def eprs(self, edge_id: int) -> list:
+        """
+        Retorna os pares EPR de um canal, do mais antigo para o mais novo.
+
+        Returns:
+            list : Lista de objetos Epr (cópias dos valores armazenados).
+        """
+        return [self._materialize(slot) for slot in self._slots(edge_id)]
+
+    def set_echp_probabilities(self, edge_id: int, on_demand: float, replay: float) -> None:
+        """
+        Define as probabilidades de sucesso do ECHP de um canal.
+
+        Args:
+            edge_id (int): Id do canal.
+            on_demand (float): Probabilidade do ECHP sob demanda.
+            replay (float): Probabilidade do ECHP de replay.
+        """
+        self._prob_on_demand[edge_id] = on_demand
+        self._prob_replay[edge_id] = replay
+
+    def echp_probabilities(self, edge_ids, replay: bool = False) -> np.ndarray:
+        """
+        Reúne as probabilidades de sucesso do ECHP de vários canais.
+
+        Args:
+            edge_ids: Ids dos canais.
+            replay (bool): Se True, usa a probabilidade de replay; senão, a sob demanda.
+
+        Returns:
+            np.ndarray : Probabilidade de cada canal, na ordem dos ids.
+        """
+        buffer = self._prob_replay if replay else self._prob_on_demand
+        return np.frombuffer(buffer, dtype=np.float64)[np.asarray(edge_ids, dtype=np.int64)]
+
+    def fidelities(self, edge_id: int) -> np.ndarray:
+        """
+        Retorna as fidelidades atuais dos pares EPR de um canal, do mais antigo para o mais novo.
+        """
+        fidelity = self._fidelity
+        fidelities = np.fromiter((fidelity[slot] for slot in self._slots(edge_id)), dtype=np.float64, count=self._size[edge_id])
+        if self._decay is not None:
+            timeslot = self._timeslot
+            ages = self._now() - np.fromiter((timeslot[slot] for slot in self._slots(edge_id)), dtype=np.int64, count=self._size[edge_id])
+            fidelities *= self._decay ** ages
+        return fidelities
+
+    def fidelity_sum(self, edge_id: int) -> float:
+        """
+        Soma das fidelidades atuais dos pares EPR de um canal, em O(1).
+        """
+        total = self._fidelity_sum[edge_id]
+        if self._decay is not None:
+            total *= self._decay ** (self._now() - self._sum_timeslot[edge_id])
+        return total
+
+    def mean_fidelity(self, edge_id: int) -> float:
+        """
+        Fidelidade média atual dos pares EPR de um canal (0 se o canal estiver vazio).
+        """
+        size = self._size[edge_id]
+        if size == 0:
+            return 0.0
+        return self.fidelity_sum(edge_id) / size
+
+    def apply_decay(self, factor: float) -> None:
+        """
+        Multiplica a fidelidade de todos os pares EPR armazenados por um fator, de forma vetorizada.
+
+        Args:
+            factor (float): Fator de decoerência.
+        """
+        if not self._edge:
+            return
+        live = np.frombuffer(self._edge, dtype=np.int64) >= 0
+        fidelity = np.frombuffer(self._fidelity, dtype=np.float64)
+        fidelity[live] *= factor
+        np.frombuffer(self._fidelity_sum, dtype=np.float64)[:] *= factor
+
+    def start_lazy_decay(self, factor: float) -> None:
+        """
+        Ativa a decoerência preguiçosa: a fidelidade de cada par passa a ser calculada na leitura
+        como f0 * factor ** idade, onde a idade conta a partir do timeslot atual.
+
+        Args:
+            factor (float): Fator de decoerência por timeslot.
+        """
+        self.stop_lazy_decay()
+        if self._timeslot:
+            np.frombuffer(self._timeslot, dtype=np.int64)[:] = self._now()
+        if self._sum_timeslot:
+            np.frombuffer(self._sum_timeslot, dtype=np.int64)[:] = self._now()
+        self._decay = factor
+
+    def stop_lazy_decay(self) -> None:
+        """
+        Desativa a decoerência preguiçosa, consolidando nos buffers a decoerência acumulada.
+        """
+        if self._decay is None or not self._edge:
+            self._decay = None
+            return
+        live = np.frombuffer(self._edge, dtype=np.int64) >= 0
+        fidelity = np.frombuffer(self._fidelity, dtype=np.float64)
+        ages = self._now() - np.frombuffer(self._timeslot, dtype=np.int64)[live]
+        fidelity[live] *= self._decay ** ages
+        sum_ages = self._now() - np.frombuffer(self._sum_timeslot, dtype=np.int64)
+        np.frombuffer(self._fidelity_sum, dtype=np.float64)[:] *= self._decay ** sum_ages
+        self._decay = None
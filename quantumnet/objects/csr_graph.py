@@ -0,0 +1,202 @@
+import numpy as np
+
+class CSRGraph():
+    """
+    Snapshot imutável de um grafo não direcionado em formato CSR (compressed sparse row).
+
+    Os vizinhos do nó de índice `i` são `indices[indptr[i]:indptr[i + 1]]`, na mesma ordem de
+    adjacência do grafo networkx de origem, e `edge_ids` dá o id da aresta de cada entrada (as
+    duas direções de uma aresta compartilham o id). Assim, as buscas sobre os arrays escolhem
+    os mesmos caminhos que as buscas do networkx sobre o grafo original.
+
+    Args:
+        graph (nx.Graph): Grafo de origem.
+        version (int): Versão da topologia que originou o snapshot.
+    """
+    def __init__(self, graph, version: int = 0) -> None:
+        self.version = version
+        self.nodes = np.fromiter(graph.nodes(), dtype=np.int64, count=graph.number_of_nodes())
+        self._index = {node: i for i, node in enumerate(graph.nodes())}
+
+        degrees = np.fromiter((len(graph.adj[node]) for node in graph.nodes()), dtype=np.int64, count=len(self.nodes))
+        indptr = np.zeros(len(self.nodes) + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+
+        indices = np.empty(indptr[-1], dtype=np.int32)
+        edge_ids = np.empty(indptr[-1], dtype=np.int32)
+        endpoints = []
+        edge_index = {}
+        position = 0
+        for i, node in enumerate(graph.nodes()):
+            for neighbor in graph.adj[node]:
+                j = self._index[neighbor]
+                key = (i, j) if i < j else (j, i)
+                edge_id = edge_index.get(key)
+                if edge_id is None:
+                    edge_id = edge_index[key] = len(endpoints)
+                    endpoints.append(key)
+                indices[position] = j
+                edge_ids[position] = edge_id
+                position += 1
+
+        self.indptr = indptr
+        self.indices = indices
+        self.edge_ids = edge_ids
+        self.endpoints = np.array(endpoints, dtype=np.int32).reshape(-1, 2)
+        for buffer in (self.nodes, self.indptr, self.indices, self.edge_ids, self.endpoints):
+            buffer.setflags(write=False)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.endpoints)
+
+    def index(self, node: int) -> int:
+        """
+        Índice de um nó nos arrays do snapshot.
+
+        Args:
+            node (int): Id do nó.
+
+        Returns:
+            int : Índice do nó.
+        """
+        return self._index[node]
+
+    def degrees(self) -> np.ndarray:
+        """
+        Grau de todos os nós, por índice.
+
+        Returns:
+            np.ndarray : Array de graus.
+        """
+        return np.diff(self.indptr)
+
+    def neighbors(self, node: int) -> np.ndarray:
+        """
+        Vizinhos de um nó, na ordem de adjacência.
+
+        Args:
+            node (int): Id do nó.
+
+        Returns:
+            np.ndarray : Ids dos vizinhos.
+        """
+        i = self._index[node]
+        return self.nodes[self.indices[self.indptr[i]:self.indptr[i + 1]]]
+
+    def _expand(self, frontier: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Concatena as listas de adjacência de uma fronteira, preservando a ordem.
+
+        Returns:
+            (np.ndarray, np.ndarray) : Vizinhos e o nó da fronteira que os alcançou.
+        """
+        starts = self.indptr[frontier]
+        counts = self.indptr[frontier + 1] - starts
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return self.indices[np.repeat(starts, counts) + offsets], np.repeat(frontier, counts)
+
+    @staticmethod
+    def _first_seen(neighbors: np.ndarray, owners: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Nós distintos na ordem em que aparecem pela primeira vez, com quem os alcançou primeiro.
+        """
+        unique, first = np.unique(neighbors, return_index=True)
+        order = np.argsort(first, kind='stable')
+        return unique[order], owners[first[order]]
+
+    def bfs(self, source: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Busca em largura a partir de um nó, expandindo um nível inteiro por vez.
+
+        Args:
+            source (int): Id do nó de origem.
+
+        Returns:
+            (np.ndarray, np.ndarray) : Predecessor e distância de cada nó, por índice (-1 se inalcançável).
+        """
+        s = self._index[source]
+        predecessors = np.full(self.num_nodes, -1, dtype=np.int32)
+        distances = np.full(self.num_nodes, -1, dtype=np.int32)
+        distances[s] = 0
+        frontier = np.array([s], dtype=np.int64)
+        level = 0
+
+        while len(frontier):
+            level += 1
+            neighbors, owners = self._expand(frontier)
+            new = distances[neighbors] == -1
+            frontier, owners = self._first_seen(neighbors[new], owners[new])
+            distances[frontier] = level
+            predecessors[frontier] = owners
+
+        return predecessors, distances
+
+    def shortest_path(self, source: int, target: int) -> list | None:
+        """
+        Menor caminho em saltos por busca bidirecional, com o mesmo desempate de `nx.shortest_path`.
+
+        Args:
+            source (int): Id do nó de origem.
+            target (int): Id do nó de destino.
+
+        Returns:
+            list | None : Caminho de source até target, ou None se não houver caminho.
+        """
+        s = self._index[source]
+        t = self._index[target]
+        if s == t:
+            return [source]
+
+        pred = np.full(self.num_nodes, -1, dtype=np.int64)
+        succ = np.full(self.num_nodes, -1, dtype=np.int64)
+        in_pred = np.zeros(self.num_nodes, dtype=bool)
+        in_succ = np.zeros(self.num_nodes, dtype=bool)
+        in_pred[s] = True
+        in_succ[t] = True
+        forward = np.array([s], dtype=np.int64)
+        reverse = np.array([t], dtype=np.int64)
+        meeting = None
+
+        while len(forward) and len(reverse):
+            if len(forward) <= len(reverse):
+                seen, links, this_fringe, other_seen = in_pred, pred, forward, in_succ
+            else:
+                seen, links, this_fringe, other_seen = in_succ, succ, reverse, in_pred
+
+            neighbors, owners = self._expand(this_fringe)
+            found = np.flatnonzero(other_seen[neighbors])
+            if len(found):
+                # Os nós vistos antes do encontro não participam do caminho
+                meeting = int(neighbors[found[0]])
+                if not seen[meeting]:
+                    links[meeting] = owners[found[0]]
+                break
+
+            new = ~seen[neighbors]
+            fringe, owners = self._first_seen(neighbors[new], owners[new])
+            seen[fringe] = True
+            links[fringe] = owners
+            if this_fringe is forward:
+                forward = fringe
+            else:
+                reverse = fringe
+
+        if meeting is None:
+            return None
+
+        path = []
+        node = meeting
+        while node != -1:
+            path.append(node)
+            node = pred[node]
+        path.reverse()
+        node = succ[meeting]
+        while node != -1:
+            path.append(node)
+            node = succ[node]
+        return self.nodes[path].tolist()
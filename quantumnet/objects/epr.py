@@ -1,12 +1,22 @@
 import random
 class Epr():
-    def __init__(self,  epr_id: int, initial_fidelity: float = None) -> None:
+    __slots__ = ('_epr_id', '_initial_fidelity', '_current_fidelity', '_owner')
+
+    def __init__(self,  epr_id: int, initial_fidelity: float = None, rng: random.Random = None) -> None:
+        # rng: gerador usado nos sorteios (o da rede); se None, usa o módulo random
+        rng = rng if rng is not None else random
         self._epr_id = epr_id
-        self._initial_fidelity = initial_fidelity  if initial_fidelity is not None else random.uniform(0, 1)
-        self._current_fidelity = initial_fidelity  if initial_fidelity is not None else random.uniform(0, 1)
+        self._initial_fidelity = initial_fidelity  if initial_fidelity is not None else rng.uniform(0, 1)
+        self._current_fidelity = initial_fidelity  if initial_fidelity is not None else rng.uniform(0, 1)
+        # Pool que criou o par; só ele pode reaproveitá-lo (None se criado fora de um pool)
+        self._owner = None
         # Ainda vamos ver se isso vai ser necessário
         # self.qubits = qubits
     
+    def reset(self, epr_id: int, initial_fidelity: float = None, rng: random.Random = None) -> None:
+        """Reinicializa o par EPR com um novo id, para reaproveitá-lo a partir de um pool."""
+        self.__init__(epr_id, initial_fidelity, rng)
+
     @property
     def epr_id(self):
         return self._epr_id
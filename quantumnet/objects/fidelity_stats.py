@@ -0,0 +1,255 @@
+import math
+import numpy as np
+
+class FidelityStats():
+    """
+    Agregados de fidelidade em fluxo: contagem, soma, soma dos quadrados, mínimo, máximo e histograma.
+
+    Cada amostra custa O(1) e a memória não cresce com o número de amostras. Se `sample_size` for
+    maior que zero, as últimas `sample_size` amostras também são guardadas em um buffer circular.
+
+    Args:
+        bins (int): Número de faixas do histograma, que cobre o intervalo [0, 1].
+        sample_size (int): Tamanho do buffer circular de amostras brutas (0 desativa).
+    """
+    def __init__(self, bins: int = 10, sample_size: int = 0) -> None:
+        self.bins = bins
+        self.sample_size = sample_size
+        self.clear()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self) -> None:
+        """
+        Descarta todas as amostras.
+        """
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.histogram = np.zeros(self.bins, dtype=np.int64)
+        self._samples = np.empty(self.sample_size, dtype=np.float64)
+        self._position = 0  # Total de amostras já escritas no buffer circular
+
+    def _bin(self, fidelity: float) -> int:
+        return min(max(int(fidelity * self.bins), 0), self.bins - 1)
+
+    def add(self, fidelity: float) -> None:
+        """
+        Registra uma fidelidade.
+
+        Args:
+            fidelity (float): Fidelidade a registrar.
+        """
+        self.count += 1
+        self.total += fidelity
+        self.total_sq += fidelity * fidelity
+        if fidelity < self.minimum:
+            self.minimum = fidelity
+        if fidelity > self.maximum:
+            self.maximum = fidelity
+        self.histogram[self._bin(fidelity)] += 1
+        if self.sample_size:
+            self._samples[self._position % self.sample_size] = fidelity
+            self._position += 1
+
+    def add_many(self, fidelities) -> None:
+        """
+        Registra várias fidelidades de forma vetorizada.
+
+        Args:
+            fidelities: Sequência ou array de fidelidades, em ordem.
+        """
+        fidelities = np.asarray(fidelities, dtype=np.float64)
+        if fidelities.size == 0:
+            return
+        self.count += int(fidelities.size)
+        self.total += float(fidelities.sum())
+        self.total_sq += float(np.dot(fidelities, fidelities))
+        self.minimum = min(self.minimum, float(fidelities.min()))
+        self.maximum = max(self.maximum, float(fidelities.max()))
+        bins = np.clip((fidelities * self.bins).astype(np.int64), 0, self.bins - 1)
+        self.histogram += np.bincount(bins, minlength=self.bins)
+        if self.sample_size:
+            recent = fidelities[-self.sample_size:]
+            positions = (self._position + fidelities.size - len(recent) + np.arange(len(recent))) % self.sample_size
+            self._samples[positions] = recent
+            self._position += int(fidelities.size)
+
+    def merge(self, other: 'FidelityStats') -> None:
+        """
+        Incorpora os agregados de outro FidelityStats, como se suas amostras viessem depois das atuais.
+
+        Args:
+            other (FidelityStats): Agregados a incorporar, com o mesmo número de faixas.
+        """
+        if other.count == 0:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.histogram += other.histogram
+        if self.sample_size:
+            self._write_samples(other.samples())
+
+    def _write_samples(self, samples: np.ndarray) -> None:
+        for fidelity in samples[-self.sample_size:].tolist():
+            self._samples[self._position % self.sample_size] = fidelity
+            self._position += 1
+
+    def mean(self) -> float:
+        """
+        Fidelidade média (0 se não houver amostras).
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def variance(self) -> float:
+        """
+        Variância populacional das fidelidades (0 se não houver amostras).
+        """
+        if self.count == 0:
+            return 0.0
+        mean = self.total / self.count
+        return max(0.0, self.total_sq / self.count - mean * mean)
+
+    def std(self) -> float:
+        """
+        Desvio padrão populacional das fidelidades.
+        """
+        return math.sqrt(self.variance())
+
+    def samples(self) -> np.ndarray:
+        """
+        Amostras guardadas no buffer circular, da mais antiga para a mais nova.
+
+        Returns:
+            np.ndarray : Até `sample_size` fidelidades.
+        """
+        if self._position <= self.sample_size:
+            return self._samples[:self._position].copy()
+        start = self._position % self.sample_size
+        return np.concatenate((self._samples[start:], self._samples[:start]))
+
+    def summary(self) -> dict:
+        """
+        Resumo dos agregados.
+
+        Returns:
+            dict : Contagem, média, desvio padrão, mínimo e máximo.
+        """
+        return {
+            'count': self.count,
+            'mean': self.mean(),
+            'std': self.std(),
+            'min': self.minimum if self.count else 0.0,
+            'max': self.maximum if self.count else 0.0,
+        }
+
+class ChannelFidelityStats():
+    """
+    Agregados de fidelidade por canal, guardados em arrays indexados pelo id do canal.
+
+    Args:
+        bins (int): Número de faixas do histograma de cada canal, que cobre o intervalo [0, 1].
+    """
+    def __init__(self, bins: int = 10) -> None:
+        self.bins = bins
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Descarta os agregados de todos os canais.
+        """
+        self.count = np.zeros(0, dtype=np.int64)
+        self.total = np.zeros(0, dtype=np.float64)
+        self.total_sq = np.zeros(0, dtype=np.float64)
+        self.minimum = np.zeros(0, dtype=np.float64)
+        self.maximum = np.zeros(0, dtype=np.float64)
+        self.histogram = np.zeros((0, self.bins), dtype=np.int64)
+
+    def _grow(self, size: int) -> None:
+        if size <= len(self.count):
+            return
+        size = max(size, 2 * len(self.count))
+        extra = size - len(self.count)
+        self.count = np.concatenate((self.count, np.zeros(extra, dtype=np.int64)))
+        self.total = np.concatenate((self.total, np.zeros(extra)))
+        self.total_sq = np.concatenate((self.total_sq, np.zeros(extra)))
+        self.minimum = np.concatenate((self.minimum, np.full(extra, math.inf)))
+        self.maximum = np.concatenate((self.maximum, np.full(extra, -math.inf)))
+        self.histogram = np.concatenate((self.histogram, np.zeros((extra, self.bins), dtype=np.int64)))
+
+    def add(self, edge_id: int, fidelity: float) -> None:
+        """
+        Registra a fidelidade de um par EPR criado em um canal.
+
+        Args:
+            edge_id (int): Id do canal.
+            fidelity (float): Fidelidade do par.
+        """
+        self._grow(edge_id + 1)
+        self.count[edge_id] += 1
+        self.total[edge_id] += fidelity
+        self.total_sq[edge_id] += fidelity * fidelity
+        if fidelity < self.minimum[edge_id]:
+            self.minimum[edge_id] = fidelity
+        if fidelity > self.maximum[edge_id]:
+            self.maximum[edge_id] = fidelity
+        self.histogram[edge_id, min(max(int(fidelity * self.bins), 0), self.bins - 1)] += 1
+
+    def add_many(self, edge_ids, fidelities) -> None:
+        """
+        Registra várias fidelidades, cada uma em seu canal, de forma vetorizada.
+
+        Args:
+            edge_ids: Id do canal de cada fidelidade.
+            fidelities: Fidelidades.
+        """
+        edge_ids = np.asarray(edge_ids, dtype=np.int64)
+        fidelities = np.asarray(fidelities, dtype=np.float64)
+        if edge_ids.size == 0:
+            return
+        self._grow(int(edge_ids.max()) + 1)
+        np.add.at(self.count, edge_ids, 1)
+        np.add.at(self.total, edge_ids, fidelities)
+        np.add.at(self.total_sq, edge_ids, fidelities * fidelities)
+        np.minimum.at(self.minimum, edge_ids, fidelities)
+        np.maximum.at(self.maximum, edge_ids, fidelities)
+        bins = np.clip((fidelities * self.bins).astype(np.int64), 0, self.bins - 1)
+        np.add.at(self.histogram, (edge_ids, bins), 1)
+
+    def means(self) -> np.ndarray:
+        """
+        Fidelidade média de cada canal (0 nos canais sem amostras).
+
+        Returns:
+            np.ndarray : Média por id de canal.
+        """
+        return np.divide(self.total, self.count, out=np.zeros(len(self.count)), where=self.count > 0)
+
+    def summary(self, edge_id: int) -> dict:
+        """
+        Resumo dos agregados de um canal.
+
+        Args:
+            edge_id (int): Id do canal.
+
+        Returns:
+            dict : Contagem, média, desvio padrão, mínimo e máximo.
+        """
+        if edge_id >= len(self.count) or self.count[edge_id] == 0:
+            return {'count': 0, 'mean': 0.0, 'std': 0.0, 'min': 0.0, 'max': 0.0}
+        count = int(self.count[edge_id])
+        mean = float(self.total[edge_id]) / count
+        variance = max(0.0, float(self.total_sq[edge_id]) / count - mean * mean)
+        return {
+            'count': count,
+            'mean': mean,
+            'std': math.sqrt(variance),
+            'min': float(self.minimum[edge_id]),
+            'max': float(self.maximum[edge_id]),
+        }
@@ -4,6 +4,13 @@ FORMAT = '%(asctime)s: %(message)s'
 logging.basicConfig(format=FORMAT)
 
 class Logger(object):
+    """
+    Logger singleton do simulador.
+
+    As mensagens são formatadas apenas se o log estiver ativo: passe o texto no estilo `%`
+    com os argumentos em separado (`logger.log('Canal %s', canal)`) ou uma função sem argumentos
+    que retorna a mensagem. Para evitar até mesmo o cálculo dos argumentos, verifique `enabled`.
+    """
     __instance = None
     DISABLED = True
 
@@ -22,19 +29,36 @@ class Logger(object):
 
     def activate(self):
         Logger.DISABLED = False
-    
-    def warn(self, message):
+
+    def deactivate(self):
+        Logger.DISABLED = True
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Indica se o log está ativo. Use antes de montar mensagens caras.
+        """
+        return not Logger.DISABLED
+
+    @staticmethod
+    def _render(message, args) -> tuple:
+        # Funções só são chamadas aqui, com o log ativo
+        if callable(message):
+            return (message(),)
+        return (message, *args)
+
+    def warn(self, message, *args):
         if not Logger.DISABLED:
-            self.logger.warning(message)
+            self.logger.warning(*self._render(message, args))
 
-    def error(self, message):
+    def error(self, message, *args):
         if not Logger.DISABLED:
-            self.logger.error(message)
+            self.logger.error(*self._render(message, args))
 
-    def log(self, message):
+    def log(self, message, *args):
         if not Logger.DISABLED:
-            self.logger.info(message)
+            self.logger.info(*self._render(message, args))
 
-    def debug(self, message):
+    def debug(self, message, *args):
         if not Logger.DISABLED:
-            self.logger.debug(message)
\ No newline at end of file
+            self.logger.debug(*self._render(message, args))
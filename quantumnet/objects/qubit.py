@@ -2,40 +2,74 @@ import random
 import math
 
 class Qubit():
-    def __init__(self, qubit_id: int, initial_fidelity: float = None) -> None:
+    __slots__ = ('qubit_id', '_qubit_state', '_initial_fidelity', '_current_fidelity', '_clock', '_timeslot', '_owner')
+
+    def __init__(self, qubit_id: int, initial_fidelity: float = None, rng: random.Random = None) -> None:
+        # rng: gerador usado nos sorteios (o da rede); se None, usa o módulo random
+        rng = rng if rng is not None else random
         self.qubit_id = qubit_id
         self._qubit_state = 0  # Define o estado inicial do qubit como 0
-        self._initial_fidelity = initial_fidelity if initial_fidelity is not None else random.uniform(0, 1)
+        self._initial_fidelity = initial_fidelity if initial_fidelity is not None else rng.uniform(0, 1)
         self._current_fidelity = self._initial_fidelity
+        # Decoerência preguiçosa: relógio (rede) e timeslot da última atualização da fidelidade
+        self._clock = None
+        self._timeslot = None
+        # Pool que criou o qubit; só ele pode reaproveitá-lo (None se criado fora de um pool)
+        self._owner = None
 
     def __str__(self):
         return f"Qubit {self.qubit_id} with state {self._qubit_state}"
 
-    def update_fidelity(self):
-        self._current_fidelity = random.uniform(0, 1)
+    def reset(self, qubit_id: int, initial_fidelity: float = None, rng: random.Random = None) -> None:
+        """Reinicializa o qubit com um novo id, para reaproveitá-lo a partir de um pool."""
+        self.__init__(qubit_id, initial_fidelity, rng)
+
+    def update_fidelity(self, rng: random.Random = None):
+        self._current_fidelity = (rng if rng is not None else random).uniform(0, 1)
 
     def get_initial_fidelity(self):
         return self._initial_fidelity
 
     def get_current_fidelity(self):
+        if self._timeslot is not None:
+            return self._current_fidelity * self._clock.decoherence_decay(self._timeslot)
         return self._current_fidelity
 
     def set_current_fidelity(self, new_fidelity: float):
             """Define a fidelidade atual do qubit."""
             self._current_fidelity = new_fidelity
+            if self._timeslot is not None:
+                self._timeslot = self._clock.get_timeslot()
+
+    def start_decoherence(self, clock):
+        """
+        Passa a aplicar decoerência preguiçosa ao qubit a partir do timeslot atual do relógio.
+
+        Args:
+            clock: Objeto com get_timeslot() e decoherence_decay(timeslot), normalmente a rede.
+        """
+        self._clock = clock
+        self._timeslot = clock.get_timeslot()
+
+    def stop_decoherence(self):
+        """Consolida a decoerência acumulada e congela a fidelidade do qubit."""
+        if self._timeslot is not None:
+            self._current_fidelity = self.get_current_fidelity()
+            self._timeslot = None
 
     def apply_x(self):
         """Aplica a porta X (NOT) ao qubit."""
         self._qubit_state = 1 if self._qubit_state == 0 else 0
 
-    def apply_hadamard(self):
+    def apply_hadamard(self, rng: random.Random = None):
         """Aplica a porta Hadamard (H) ao qubit."""
         # Hadamard transforma o estado |0> em (|0> + |1>) / sqrt(2)
         # e |1> em (|0> - |1>) / sqrt(2). Para simulação, usa-se probabilidade.
+        rng = rng if rng is not None else random
         if self._qubit_state == 0:
-            self._qubit_state = random.choice([0, 1])  # Simula a superposição
+            self._qubit_state = rng.choice([0, 1])  # Simula a superposição
         else:
-            self._qubit_state = random.choice([0, 1])  # Simula a superposição
+            self._qubit_state = rng.choice([0, 1])  # Simula a superposição
 
     def measure(self):
         """Realiza a medição do qubit no estado atual."""
@@ -0,0 +1,128 @@
+from array import array
+import numpy as np
+
+class QubitRegistry():
+    """
+    Registro compacto da criação dos qubits: o timeslot de criação fica em um array de inteiros
+    indexado pelo id do qubit, e a camada de criação em um array de códigos pequenos.
+
+    Pode ser lido como o antigo dicionário {qubit_id: {'timeslot': ..., 'layer': ...}}.
+    """
+    def __init__(self) -> None:
+        self._timeslot = array('q')  # Timeslot de criação de cada qubit (-1 se não registrado)
+        self._layer = array('b')     # Código da camada de criação de cada qubit
+        self._layer_names = []       # Código -> nome da camada
+        self._layer_codes = {}       # Nome da camada -> código
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, qubit_id) -> bool:
+        return 0 <= qubit_id < len(self._timeslot) and self._timeslot[qubit_id] >= 0
+
+    def __getitem__(self, qubit_id) -> dict:
+        if qubit_id not in self:
+            raise KeyError(qubit_id)
+        return {'timeslot': self._timeslot[qubit_id], 'layer': self._layer_names[self._layer[qubit_id]]}
+
+    def __iter__(self):
+        return iter(self.ids().tolist())
+
+    def register(self, qubit_id: int, timeslot: int, layer_name: str) -> None:
+        """
+        Registra a criação de um qubit.
+
+        Args:
+            qubit_id (int): ID do qubit criado.
+            timeslot (int): Timeslot em que o qubit foi criado.
+            layer_name (str): Camada que criou o qubit.
+        """
+        code = self._layer_code(layer_name)
+        self._grow(qubit_id + 1)
+        if self._timeslot[qubit_id] < 0:
+            self._count += 1
+        self._timeslot[qubit_id] = timeslot
+        self._layer[qubit_id] = code
+
+    def register_many(self, qubit_ids, timeslots, layer_name: str) -> None:
+        """
+        Registra a criação de vários qubits de uma só vez.
+
+        Args:
+            qubit_ids: IDs dos qubits criados, sem repetições.
+            timeslots: Timeslot de criação de cada qubit (ou um único timeslot para todos).
+            layer_name (str): Camada que criou os qubits.
+        """
+        qubit_ids = np.asarray(qubit_ids, dtype=np.int64)
+        if qubit_ids.size == 0:
+            return
+        code = self._layer_code(layer_name)
+        self._grow(int(qubit_ids.max()) + 1)
+        timeslot_view = np.frombuffer(self._timeslot, dtype=np.int64)
+        layer_view = np.frombuffer(self._layer, dtype=np.int8)
+        self._count += int(np.count_nonzero(timeslot_view[qubit_ids] < 0))
+        timeslot_view[qubit_ids] = timeslots
+        layer_view[qubit_ids] = code
+
+    def _layer_code(self, layer_name: str) -> int:
+        code = self._layer_codes.get(layer_name)
+        if code is None:
+            code = self._layer_codes[layer_name] = len(self._layer_names)
+            self._layer_names.append(layer_name)
+        return code
+
+    def _grow(self, size: int) -> None:
+        missing = size - len(self._timeslot)
+        if missing > 0:
+            self._timeslot.extend([-1] * missing)
+            self._layer.extend([0] * missing)
+
+    def creation_timeslot(self, qubit_id: int) -> int:
+        """
+        Timeslot de criação de um qubit.
+
+        Raises:
+            KeyError: Se o qubit não foi registrado.
+        """
+        if qubit_id not in self:
+            raise KeyError(qubit_id)
+        return self._timeslot[qubit_id]
+
+    def creation_timeslots(self, qubit_ids) -> np.ndarray:
+        """
+        Timeslots de criação de vários qubits de uma só vez.
+
+        Raises:
+            KeyError: Se algum dos qubits não foi registrado.
+        """
+        qubit_ids = np.asarray(qubit_ids, dtype=np.int64)
+        timeslots = np.frombuffer(self._timeslot, dtype=np.int64) if self._timeslot else np.empty(0, dtype=np.int64)
+        unknown = (qubit_ids < 0) | (qubit_ids >= len(timeslots))
+        if unknown.any():
+            raise KeyError(int(qubit_ids[unknown][0]))
+        result = timeslots[qubit_ids]
+        if (result < 0).any():
+            raise KeyError(int(qubit_ids[result < 0][0]))
+        return result
+
+    def ids(self) -> np.ndarray:
+        """
+        Ids dos qubits registrados, em ordem crescente.
+        """
+        if not self._timeslot:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(np.frombuffer(self._timeslot, dtype=np.int64) >= 0)
+
+    def items(self):
+        """
+        Percorre os registros como pares (qubit_id, {'timeslot': ..., 'layer': ...}).
+        """
+        for qubit_id in self.ids().tolist():
+            yield qubit_id, self[qubit_id]
+
+    def clear(self) -> None:
+        """
+        Remove todos os registros.
+        """
+        self.__init__()
@@ -0,0 +1,222 @@
+import os
+import glob
+import numpy as np
+
+class TraceRecorder():
+    """
+    Gravador de eventos estruturados da simulação em buffers colunares pré-alocados.
+
+    Cada evento ocupa uma linha com timeslot, camada, tipo do evento, até três nós e fidelidade.
+    Quando o buffer enche, ele é descarregado como um bloco: em um arquivo `.npz` do diretório
+    informado, ou em memória se nenhum diretório for dado. Com o gravador desativado, `record`
+    retorna logo na primeira verificação.
+
+    Args:
+        clock (optional): Função que retorna o timeslot atual.
+        chunk_size (int): Número de eventos por bloco.
+    """
+    # Camadas
+    PHYSICAL = 0
+    LINK = 1
+    NETWORK = 2
+    TRANSPORT = 3
+    APPLICATION = 4
+    LAYERS = ('physical', 'link', 'network', 'transport', 'application')
+
+    # Tipos de evento
+    HERALDING_SUCCESS = 0
+    HERALDING_FAIL = 1
+    ECHP_SUCCESS = 2
+    ECHP_FAIL = 3
+    SWAP_SUCCESS = 4
+    SWAP_FAIL = 5
+    PURIFICATION_SUCCESS = 6
+    PURIFICATION_FAIL = 7
+    TELEPORT_SUCCESS = 8
+    TELEPORT_FAIL = 9
+    EVENTS = ('heralding_success', 'heralding_fail', 'echp_success', 'echp_fail', 'swap_success',
+              'swap_fail', 'purification_success', 'purification_fail', 'teleport_success', 'teleport_fail')
+
+    COLUMNS = {
+        'timeslot': np.int64,
+        'layer': np.int8,
+        'event': np.int8,
+        'node_a': np.int32,
+        'node_b': np.int32,
+        'node_c': np.int32,
+        'fidelity': np.float64,
+    }
+
+    def __init__(self, clock=None, chunk_size: int = 65536) -> None:
+        self._clock = clock
+        self.chunk_size = chunk_size
+        self.enabled = False
+        self.path = None
+        self._chunks = []      # Blocos descarregados em memória
+        self._chunk_count = 0  # Blocos descarregados desde o start
+        self._size = 0
+        self._buffers = {}
+
+    def start(self, path: str | None = None, chunk_size: int | None = None) -> None:
+        """
+        Ativa a gravação de eventos.
+
+        Args:
+            path (str, optional): Diretório onde os blocos `.npz` são gravados. Se None, ficam em memória.
+            chunk_size (int, optional): Número de eventos por bloco.
+        """
+        if chunk_size is not None:
+            self.chunk_size = chunk_size
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._chunks = []
+        self._chunk_count = 0
+        self._size = 0
+        self._buffers = {name: np.empty(self.chunk_size, dtype=dtype) for name, dtype in self.COLUMNS.items()}
+        # Atalhos para as colunas, usados em record
+        self._timeslot = self._buffers['timeslot']
+        self._layer = self._buffers['layer']
+        self._event = self._buffers['event']
+        self._node_a = self._buffers['node_a']
+        self._node_b = self._buffers['node_b']
+        self._node_c = self._buffers['node_c']
+        self._fidelity = self._buffers['fidelity']
+        self.enabled = True
+
+    def stop(self) -> None:
+        """
+        Descarrega os eventos pendentes e desativa a gravação.
+        """
+        self.flush()
+        self.enabled = False
+
+    def __len__(self) -> int:
+        return self._size + sum(len(chunk['event']) for chunk in self._chunks)
+
+    def _now(self) -> int:
+        return self._clock() if self._clock is not None else 0
+
+    def record(self, event: int, layer: int, node_a: int = -1, node_b: int = -1, node_c: int = -1, fidelity: float = np.nan) -> None:
+        """
+        Grava um evento.
+
+        Args:
+            event (int): Tipo do evento (ex.: TraceRecorder.SWAP_SUCCESS).
+            layer (int): Camada que emitiu o evento (ex.: TraceRecorder.NETWORK).
+            node_a (int): Primeiro nó envolvido (-1 se não houver).
+            node_b (int): Segundo nó envolvido (-1 se não houver).
+            node_c (int): Terceiro nó envolvido (-1 se não houver).
+            fidelity (float): Fidelidade associada ao evento (nan se não houver).
+        """
+        if not self.enabled:
+            return
+        i = self._size
+        self._timeslot[i] = self._now()
+        self._layer[i] = layer
+        self._event[i] = event
+        self._node_a[i] = node_a
+        self._node_b[i] = node_b
+        self._node_c[i] = node_c
+        self._fidelity[i] = fidelity
+        self._size = i + 1
+        if self._size == self.chunk_size:
+            self.flush()
+
+    def record_many(self, events, layer: int, node_a=-1, node_b=-1, node_c=-1, fidelity=np.nan) -> None:
+        """
+        Grava vários eventos de uma vez, todos no timeslot atual.
+
+        Args:
+            events: Tipo de cada evento (array ou um único tipo para todos).
+            layer (int): Camada que emitiu os eventos.
+            node_a, node_b, node_c: Nós envolvidos, como arrays ou um único valor para todos.
+            fidelity: Fidelidades, como array ou um único valor para todos.
+        """
+        if not self.enabled:
+            return
+        columns = np.broadcast_arrays(np.asarray(events), np.asarray(node_a), np.asarray(node_b), np.asarray(node_c), np.asarray(fidelity, dtype=np.float64))
+        total = columns[0].size
+        if total == 0:
+            return
+        columns = [column.ravel() for column in columns]
+        now = self._now()
+        start = 0
+        while start < total:
+            i = self._size
+            count = min(total - start, self.chunk_size - i)
+            end = start + count
+            self._timeslot[i:i + count] = now
+            self._layer[i:i + count] = layer
+            self._event[i:i + count] = columns[0][start:end]
+            self._node_a[i:i + count] = columns[1][start:end]
+            self._node_b[i:i + count] = columns[2][start:end]
+            self._node_c[i:i + count] = columns[3][start:end]
+            self._fidelity[i:i + count] = columns[4][start:end]
+            self._size = i + count
+            start = end
+            if self._size == self.chunk_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """
+        Descarrega os eventos do buffer como um bloco.
+        """
+        if self._size == 0:
+            return
+        chunk = {name: buffer[:self._size].copy() for name, buffer in self._buffers.items()}
+        if self.path is None:
+            self._chunks.append(chunk)
+        else:
+            np.savez(os.path.join(self.path, f'trace_{self._chunk_count:06d}.npz'), **chunk)
+        self._chunk_count += 1
+        self._size = 0
+
+    def _pending(self) -> list:
+        chunks = list(self._chunks)
+        if self._size:
+            chunks.append({name: buffer[:self._size] for name, buffer in self._buffers.items()})
+        return chunks
+
+    @classmethod
+    def _to_dataframe(cls, chunks: list):
+        import pandas as pd
+
+        if chunks:
+            data = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in cls.COLUMNS}
+        else:
+            data = {name: np.empty(0, dtype=dtype) for name, dtype in cls.COLUMNS.items()}
+        df = pd.DataFrame(data)
+        df['layer'] = pd.Categorical.from_codes(df['layer'], categories=cls.LAYERS)
+        df['event'] = pd.Categorical.from_codes(df['event'], categories=cls.EVENTS)
+        return df
+
+    def to_dataframe(self):
+        """
+        Eventos gravados como DataFrame, com camada e tipo de evento como categorias.
+        Se os blocos estão em disco, eles são lidos do diretório.
+
+        Returns:
+            pd.DataFrame : Um evento por linha.
+        """
+        if self.path is not None:
+            self.flush()
+            return self.load(self.path)
+        return self._to_dataframe(self._pending())
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Lê os blocos `.npz` de um diretório de traces.
+
+        Args:
+            path (str): Diretório com os arquivos trace_*.npz.
+
+        Returns:
+            pd.DataFrame : Um evento por linha.
+        """
+        chunks = []
+        for file in sorted(glob.glob(os.path.join(path, 'trace_*.npz'))):
+            with np.load(file) as data:
+                chunks.append({name: data[name] for name in cls.COLUMNS})
+        return cls._to_dataframe(chunks)
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from types import SimpleNamespace
+
+from BHA_functions import asyncSimulations
+from BHA_functions import simulations_functions
+from BHA_functions.simulations_functions import iterSimulations, runSimulations_Linux
+from BHA_functions.worker_logging import point_key
+
+POINT = dict(runs=3, topology='grade', number_nodes=0, topology_args=(3, 3), entanglements_replanished=5,
+             requests=5, attempts_per_request=2, network_prob=0.8, num_black_holes=1, black_hole_prob=0.1,
+             black_hole_target=True)
+
+
+def test_stopping_iteration_cancels_queued_runs(monkeypatch):
+    gate = threading.Event()
+    started = []
+    executors = []
+
+    def fake_run(runs, *args, seed=None):
+        run = args[-2]
+        started.append(run)
+        if run:
+            gate.wait(5)
+        return SimpleNamespace(rows=lambda: [(run,)])
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def __init__(self, max_workers):
+            super().__init__(max_workers=1)
+            self.shutdown_args = None
+            executors.append(self)
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            self.shutdown_args = (wait, cancel_futures)
+            super().shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    monkeypatch.setattr(simulations_functions, 'runSimulations_Linux', fake_run)
+    monkeypatch.setattr(simulations_functions, 'ProcessPoolExecutor', RecordingExecutor)
+
+    async def consume():
+        async with aclosing(iterSimulations(1, max_in_flight=3, **dict(POINT, runs=50))) as runs:
+            async for run, row in runs:
+                return run, row
+
+    assert asyncio.run(consume()) == (0, (0,))
+    executor = executors[0]
+    assert executor.shutdown_args == (False, True)
+    gate.set()
+    executor.shutdown(wait=True)
+    # Só a primeira execução e a que já estava no worker chegam a rodar
+    assert set(started) <= {0, 1}
+
+
+def test_async_simulations_match_sequential_runs():
+    params = {key: value for key, value in POINT.items() if key != 'runs'}
+    progress = []
+    collector = asyncio.run(asyncSimulations(2, max_in_flight=2, progress=lambda done, total: progress.append((done, total)), seed=4, **POINT))
+    expected = runSimulations_Linux(3, **params, point=point_key(params), seed=4).to_DataFrame()
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+    assert collector.df.reset_index(drop=True).equals(expected.reset_index(drop=True))
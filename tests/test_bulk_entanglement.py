@@ -0,0 +1,30 @@
+from quantumnet.components import Network
+
+
+def run_replenishment(loop: bool):
+    network = Network(seed=11)
+    network.set_ready_topology('grade', 3, 3)
+    physical = network.physical
+    # Com limiar zero toda tentativa tem sucesso, então os dois caminhos fazem as mesmas tentativas
+    physical.heralding_threshold = 0
+    for host_id in (0, 4):
+        network.hosts[host_id].memory.clear()
+    network.timeslot_decoherence = loop
+
+    attempts = physical.bulk_entanglement_generation(list(network.edges), 3)
+    registry = network.qubit_timeslots
+    return {
+        'attempts': attempts,
+        'count_qubit': physical._count_qubit,
+        'count_epr': physical._count_epr,
+        'used_qubits': physical.used_qubits,
+        'timeslot': network.get_timeslot(),
+        'registry': list(registry.items()),
+    }
+
+
+def test_bulk_path_matches_loop_counters_and_registry():
+    bulk = run_replenishment(loop=False)
+    loop = run_replenishment(loop=True)
+    assert bulk['count_qubit'] > 0
+    assert bulk == loop
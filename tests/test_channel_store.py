@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from quantumnet.components import Network
+from quantumnet.objects import ChannelStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def check_means(store):
+    for edge_id in range(len(store)):
+        fidelities = store.fidelities(edge_id)
+        expected = float(fidelities.mean()) if len(fidelities) else 0.0
+        assert store.mean_fidelity(edge_id) == pytest.approx(expected)
+
+
+def test_mean_fidelity_follows_inserts_removals_and_decay():
+    rng = random.Random(4)
+    clock = Clock()
+    store = ChannelStore(clock=clock)
+    edges = [store.add_edge(u, u + 1) for u in range(4)]
+    next_id = 0
+
+    for step in range(600):
+        clock.now += rng.randint(0, 2)
+        edge_id = rng.choice(edges)
+        action = rng.random()
+        if action < 0.55 or store.size(edge_id) == 0:
+            store.push(edge_id, next_id, rng.uniform(0.5, 1))
+            next_id += 1
+        elif action < 0.75:
+            store.pop(edge_id, rng.choice((0, -1)))
+        elif action < 0.9:
+            store.remove(edge_id, [store.get(edge_id, rng.randrange(store.size(edge_id))).epr_id])
+        else:
+            store.apply_decay(0.95)
+
+        if step == 200:
+            store.start_lazy_decay(0.99)
+        elif step == 400:
+            store.stop_lazy_decay()
+        check_means(store)
+
+
+def test_network_epr_lists_are_copies():
+    network = Network(seed=6)
+    network.set_ready_topology('grade', 2, 2)
+    eprs = network.get_eprs_from_edge(0, 1)
+    size = len(eprs)
+    eprs.clear()
+    network.get_eprs()[(0, 1)].pop()
+    assert len(network.get_eprs_from_edge(0, 1)) == size
+
+    network.remove_epr(0, 1)
+    assert len(network.get_eprs_from_edge(0, 1)) == size - 1
@@ -0,0 +1,43 @@
+import networkx as nx
+
+from quantumnet.components import Network, Controller, Host
+
+
+def make_controller():
+    network = Network(seed=5)
+    network.set_ready_topology('grade', 4, 4)
+    controller = Controller(network)
+    controller.register_routing_tables()
+    return network, controller
+
+
+def assert_routes_match(network, controller):
+    graph = network.routing_graph
+    for source in graph.nodes():
+        lengths = nx.single_source_shortest_path_length(graph, source)
+        assert set(controller.reachable(source)) == set(lengths)
+        for destination, length in lengths.items():
+            route = controller.get_route(source, destination)
+            assert len(route) - 1 == length
+            assert all(graph.has_edge(a, b) for a, b in zip(route, route[1:]))
+
+
+def test_routes_follow_channel_changes():
+    network, controller = make_controller()
+    network.add_channel(0, 15)
+    assert controller.get_route(0, 15) == [0, 15]
+    assert_routes_match(network, controller)
+
+    network.mark_swapped(0, 1)
+    network.mark_swapped(0, 15)
+    assert_routes_match(network, controller)
+    assert network.hosts[0].routing_table[1] != [0, 1]
+
+
+def test_routes_follow_new_hosts():
+    network, controller = make_controller()
+    host = Host(16)
+    host.add_connection(15)
+    network.add_host(host)
+    assert controller.get_route(0, 16)[-2:] == [15, 16]
+    assert_routes_match(network, controller)
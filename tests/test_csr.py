@@ -0,0 +1,54 @@
+import random
+
+import networkx as nx
+import pytest
+
+from quantumnet.components import Network
+from quantumnet.objects import CSRGraph
+
+
+def random_graphs():
+    rng = random.Random(1)
+    for seed in range(15):
+        yield nx.convert_node_labels_to_integers(nx.erdos_renyi_graph(rng.randint(2, 40), rng.random() * 0.2, seed=seed))
+        yield nx.convert_node_labels_to_integers(nx.barabasi_albert_graph(rng.randint(3, 40), 2, seed=seed))
+    yield nx.convert_node_labels_to_integers(nx.grid_2d_graph(4, 5))
+
+
+@pytest.mark.parametrize('graph', list(random_graphs()))
+def test_shortest_path_matches_networkx(graph):
+    csr = CSRGraph(graph)
+    for source in graph:
+        for target in graph:
+            try:
+                expected = nx.shortest_path(graph, source, target)
+            except nx.NetworkXNoPath:
+                expected = None
+            assert csr.shortest_path(source, target) == expected
+
+
+@pytest.mark.parametrize('graph', list(random_graphs())[:10])
+def test_bfs_matches_networkx(graph):
+    csr = CSRGraph(graph)
+    source = next(iter(graph))
+    predecessors, distances = csr.bfs(source)
+    expected = nx.single_source_shortest_path(graph, source)
+    assert (distances >= 0).sum() == len(expected)
+    for target, path in expected.items():
+        assert distances[csr.index(target)] == len(path) - 1
+        route = [target]
+        while route[-1] != source:
+            route.append(int(csr.nodes[predecessors[csr.index(route[-1])]]))
+        assert route[::-1] == path
+
+
+def test_snapshot_follows_topology_version():
+    network = Network(seed=5)
+    network.set_ready_topology('grade', 3, 3)
+    before = network.csr
+    assert network.csr is before
+    network.add_channel(0, 8)
+    assert network.csr is not before
+    assert network.csr.version == network.topology_version
+    assert network.csr.shortest_path(0, 8) == [0, 8]
+    assert list(network.csr.neighbors(0)) == list(network.routing_graph.adj[0])
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from quantumnet.components import Network
+
+
+EDGES = [(0, 1), (3, 4), (6, 7)]
+
+
+def make_network(on_demand: float, replay: float):
+    network = Network(seed=3)
+    network.set_ready_topology('grade', 3, 3)
+    channels = network.channels
+    for u, v in EDGES:
+        channels.set_echp_probabilities(channels.edge_id(u, v), on_demand, replay)
+    return network
+
+
+def sizes(network):
+    return [network.channels.size(network.channels.edge_id(u, v)) for u, v in EDGES]
+
+
+def test_empty_batch_does_nothing():
+    network = make_network(1, 1)
+    timeslot = network.get_timeslot()
+    result = network.physical.echp_on_demand_batch([])
+    assert result.dtype == bool and len(result) == 0
+    assert network.get_timeslot() == timeslot
+
+
+def test_failed_batch_consumes_qubits_only():
+    network = make_network(0, 0)
+    physical = network.physical
+    before = sizes(network)
+    memory = {host_id: len(host.memory) for host_id, host in network.hosts.items()}
+    timeslot, used = network.get_timeslot(), physical.used_qubits
+
+    result = physical.echp_on_demand_batch(EDGES)
+    assert not result.any()
+    assert sizes(network) == before
+    assert network.get_timeslot() == timeslot + 1
+    assert physical.used_qubits == used + 2 * len(EDGES)
+    for host_id, count in memory.items():
+        taken = sum((u, v).count(host_id) for u, v in EDGES)
+        assert len(network.hosts[host_id].memory) == count - taken
+
+
+@pytest.mark.parametrize('replay', [False, True])
+def test_successful_batch_deposits_one_pair_per_channel(replay):
+    network = make_network(0 if replay else 1e6, 1e6 if replay else 0)
+    physical = network.physical
+    before = sizes(network)
+    fidelities = [
+        network.hosts[u].memory[-1].get_current_fidelity() * network.hosts[v].memory[-1].get_current_fidelity() * 0.99 ** 2
+        for u, v in EDGES
+    ]
+    count_epr, timeslot = physical._count_epr, network.get_timeslot()
+
+    batch = physical.echp_on_replay_batch if replay else physical.echp_on_demand_batch
+    result = batch(np.array(EDGES))
+    assert result.all()
+    assert sizes(network) == [size + 1 for size in before]
+    assert physical._count_epr == count_epr + len(EDGES)
+    assert network.get_timeslot() == timeslot + 2
+    for (u, v), fidelity in zip(EDGES, fidelities):
+        assert network.get_eprs_from_edge(u, v)[-1].get_current_fidelity() == pytest.approx(fidelity)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from quantumnet.objects import FidelityStats, ChannelFidelityStats
+
+
+def assert_matches(stats, values, sample_size):
+    values = np.asarray(values)
+    assert stats.count == len(values)
+    assert stats.mean() == pytest.approx(values.mean())
+    assert stats.std() == pytest.approx(values.std())
+    assert stats.minimum == values.min()
+    assert stats.maximum == values.max()
+    expected, _ = np.histogram(values, bins=stats.bins, range=(0, 1))
+    assert stats.histogram.tolist() == expected.tolist()
+    assert stats.samples().tolist() == values[-sample_size:].tolist()
+
+
+@pytest.mark.parametrize('chunk', [1, 3, 7, 40])
+def test_add_many_keeps_ring_buffer_order(chunk):
+    values = np.random.default_rng(0).uniform(0, 1, 37)
+    stats = FidelityStats(sample_size=8)
+    for start in range(0, len(values), chunk):
+        part = values[start:start + chunk]
+        if chunk == 1:
+            stats.add(float(part[0]))
+        else:
+            stats.add_many(part)
+    assert_matches(stats, values, 8)
+
+
+def test_ring_buffer_before_wrapping():
+    stats = FidelityStats(sample_size=5)
+    stats.add_many([0.1, 0.2])
+    stats.add(0.3)
+    assert stats.samples().tolist() == [0.1, 0.2, 0.3]
+    assert FidelityStats().samples().size == 0
+
+
+@pytest.mark.parametrize('sizes', [(0, 0), (3, 4), (20, 5), (6, 0)])
+def test_merge_matches_concatenated_samples(sizes):
+    rng = np.random.default_rng(1)
+    first, second = rng.uniform(0, 1, sizes[0]), rng.uniform(0, 1, sizes[1])
+    stats, other = FidelityStats(sample_size=6), FidelityStats(sample_size=10)
+    stats.add_many(first)
+    other.add_many(second)
+    stats.merge(other)
+    values = np.concatenate((first, second))
+    if len(values):
+        assert_matches(stats, values, 6)
+    else:
+        assert stats.summary() == {'count': 0, 'mean': 0.0, 'std': 0.0, 'min': 0.0, 'max': 0.0}
+
+
+def test_channel_stats_add_many_matches_add():
+    rng = np.random.default_rng(2)
+    edge_ids = rng.integers(0, 6, 50)
+    fidelities = rng.uniform(0, 1, 50)
+    single, batch = ChannelFidelityStats(), ChannelFidelityStats()
+    for edge_id, fidelity in zip(edge_ids.tolist(), fidelities.tolist()):
+        single.add(edge_id, fidelity)
+    batch.add_many(edge_ids, fidelities)
+    for edge_id in range(7):
+        assert batch.summary(edge_id) == pytest.approx(single.summary(edge_id))
+    assert batch.histogram.tolist() == single.histogram.tolist()
+    assert batch.means() == pytest.approx(single.means())
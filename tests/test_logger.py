@@ -0,0 +1,50 @@
+import logging
+
+import pytest
+
+from quantumnet.objects import Logger
+
+
+class Counted:
+    """Objeto que conta quantas vezes foi formatado."""
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return 'counted'
+
+
+@pytest.fixture
+def logger():
+    logger = Logger.get_instance()
+    disabled = Logger.DISABLED
+    yield logger
+    Logger.DISABLED = disabled
+
+
+def test_disabled_logger_does_not_format(logger, caplog):
+    logger.deactivate()
+    assert not logger.enabled
+    argument = Counted()
+    calls = []
+    with caplog.at_level(logging.DEBUG, logger='qkdnet'):
+        for method in (logger.log, logger.debug, logger.warn, logger.error):
+            method('Valor %s', argument)
+            method(lambda: calls.append(1) or 'mensagem')
+    assert argument.calls == 0
+    assert not calls
+    assert not caplog.records
+
+
+def test_enabled_logger_formats_lazily(logger, caplog):
+    logger.activate()
+    assert logger.enabled
+    argument = Counted()
+    with caplog.at_level(logging.DEBUG, logger='qkdnet'):
+        logger.log('Valor %s e %s', argument, 2)
+        logger.debug(lambda: 'mensagem pronta')
+        logger.warn('Aviso %d%%', 50)
+    assert [record.getMessage() for record in caplog.records] == ['Valor counted e 2', 'mensagem pronta', 'Aviso 50%']
+    assert [record.levelno for record in caplog.records] == [logging.INFO, logging.DEBUG, logging.WARNING]
+    assert argument.calls > 0
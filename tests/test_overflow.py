@@ -0,0 +1,38 @@
+from quantumnet.components import Network, Host
+from quantumnet.objects import Qubit, TraceRecorder
+
+
+def test_drop_lowest_fidelity_drops_the_lowest_qubit():
+    host = Host(0, memory_size=3, overflow_policy='drop_lowest_fidelity')
+    for qubit_id, fidelity in enumerate((0.9, 0.2, 0.7)):
+        host.add_qubit(Qubit(qubit_id, fidelity))
+
+    assert host.add_qubit(Qubit(3, 0.5))
+    assert [qubit.qubit_id for qubit in host.memory] == [0, 2, 3]
+    assert not host.add_qubit(Qubit(4, 0.1))
+    assert [qubit.qubit_id for qubit in host.memory] == [0, 2, 3]
+
+
+def test_memory_is_unbounded_without_a_policy():
+    host = Host(0, memory_size=3)
+    for qubit_id in range(5):
+        assert host.add_qubit(Qubit(qubit_id, 0.5))
+    assert len(host.memory) == 5
+
+
+def test_rejected_teleport_is_a_failure():
+    network = Network(seed=2)
+    network.set_ready_topology('grade', 3, 3)
+    network.trace.start()
+    bob = network.hosts[8]
+    bob.set_overflow_policy('reject')
+    while len(bob.memory) < 10:
+        bob.add_qubit(Qubit(1000 + len(bob.memory), 0.9))
+
+    used_qubits = network.transportlayer.used_qubits
+    assert not network.transportlayer.run_transport_layer(0, 8, len(network.hosts[0].memory))
+    assert network.transportlayer.used_qubits == used_qubits
+    assert network.transportlayer.get_teleported_qubits() == []
+    events = network.trace.to_dataframe()['event']
+    assert (events == TraceRecorder.EVENTS[TraceRecorder.TELEPORT_FAIL]).any()
+    assert not (events == TraceRecorder.EVENTS[TraceRecorder.TELEPORT_SUCCESS]).any()
@@ -0,0 +1,85 @@
+from quantumnet.components import Network
+from quantumnet.objects import Qubit
+
+
+def make_network(seed=3):
+    network = Network(seed=seed)
+    network.set_ready_topology('grade', 3, 3)
+    return network
+
+
+def test_recorded_qubit_does_not_change_after_acquires():
+    network = make_network()
+    assert network.transportlayer.run_transport_layer(0, 8, len(network.hosts[0].memory))
+    recorded = list(network.transportlayer.get_teleported_qubits())
+    qubits = [info['qubit'] for info in recorded]
+    snapshot = [(qubit.qubit_id, qubit.get_initial_fidelity()) for qubit in qubits]
+
+    # Consome as memórias (os qubits voltam ao pool) e reaproveita o pool
+    network.physical.bulk_entanglement_generation(list(network.edges), 12)
+    acquired = [network.physical.acquire_qubit(10_000 + i, 0.5) for i in range(100)]
+
+    assert all(isinstance(qubit, Qubit) for qubit in qubits)
+    assert not any(other is qubit for other in acquired for qubit in qubits)
+    assert [(qubit.qubit_id, qubit.get_initial_fidelity()) for qubit in qubits] == snapshot
+
+
+def test_e91_qubits_return_to_the_pool(monkeypatch):
+    network = make_network()
+    application = network.application_layer
+    prepared = []
+    prepare = application.prepare_e91_qubits
+
+    def recording_prepare(key, bases):
+        qubits = prepare(key, bases)
+        prepared.extend(qubits)
+        return qubits
+
+    monkeypatch.setattr(application, 'prepare_e91_qubits', recording_prepare)
+    application.qkd_e91_protocol(0, 8, 2)
+
+    assert prepared
+    pool = network.physical._qubit_pool
+    assert all(any(qubit is pooled for pooled in pool) for qubit in prepared)
+
+
+def test_qubit_created_outside_the_layer_is_not_recycled():
+    network = make_network()
+    alice, bob = network.hosts[0], network.hosts[1]
+    qubit = Qubit(777, 0.95)
+    alice.add_qubit(qubit)
+    bob.add_qubit(Qubit(778, 0.95))
+
+    network.physical.entanglement_creation_heralding_protocol(alice, bob)
+    acquired = [network.physical.acquire_qubit(10_000 + i, 0.5) for i in range(100)]
+
+    assert all(other is not qubit for other in acquired)
+    assert qubit.qubit_id == 777
+    assert qubit.get_initial_fidelity() == 0.95
+
+
+def test_removed_epr_does_not_change_after_acquires():
+    network = make_network()
+    physical = network.physical
+    epr = physical.acquire_epr(999, 0.8)
+    physical.add_epr_to_channel(epr, (0, 1))
+    physical.remove_epr_from_channel([epr], (0, 1))
+
+    acquired = [physical.acquire_epr(10_000 + i, 0.5) for i in range(100)]
+
+    assert all(other is not epr for other in acquired)
+    assert epr.epr_id == 999
+    assert epr.get_current_fidelity() == 0.8
+
+
+def test_released_objects_are_recycled_once():
+    network = make_network()
+    physical = network.physical
+    epr = physical.acquire_epr(1, 0.9)
+    physical.release_epr(epr)
+    physical.release_epr(epr)
+
+    first = physical.acquire_epr(2, 0.5)
+    second = physical.acquire_epr(3, 0.5)
+    assert first is epr
+    assert second is not epr
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from quantumnet.components import Network
+from quantumnet.objects import QubitRegistry
+
+
+def test_registry_reads_like_the_old_dict():
+    registry = QubitRegistry()
+    expected = {}
+    for qubit_id, timeslot, layer in [(3, 0, 'physical_layer'), (0, 2, 'link_layer'), (7, 5, 'physical_layer'), (3, 9, 'network_layer')]:
+        registry.register(qubit_id, timeslot, layer)
+        expected[qubit_id] = {'timeslot': timeslot, 'layer': layer}
+
+    assert len(registry) == len(expected)
+    assert dict(registry.items()) == expected
+    assert list(registry) == sorted(expected)
+    assert registry.ids().tolist() == sorted(expected)
+    assert registry[3] == {'timeslot': 9, 'layer': 'network_layer'}
+    assert 1 not in registry and -1 not in registry and 100 not in registry
+    assert registry.creation_timeslot(7) == 5
+    assert registry.creation_timeslots([7, 0, 3]).tolist() == [5, 2, 9]
+
+
+def test_unknown_ids_raise_key_error():
+    registry = QubitRegistry()
+    with pytest.raises(KeyError):
+        registry.creation_timeslots([0])
+    registry.register(2, 1, 'physical_layer')
+    for qubit_id in (0, 5):
+        with pytest.raises(KeyError):
+            registry[qubit_id]
+        with pytest.raises(KeyError):
+            registry.creation_timeslot(qubit_id)
+        with pytest.raises(KeyError):
+            registry.creation_timeslots([2, qubit_id])
+
+
+def test_register_many_matches_register():
+    single, batch = QubitRegistry(), QubitRegistry()
+    ids = np.array([4, 1, 9, 2])
+    timeslots = np.array([3, 3, 4, 6])
+    for qubit_id, timeslot in zip(ids.tolist(), timeslots.tolist()):
+        single.register(qubit_id, timeslot, 'physical_layer')
+    batch.register(1, 0, 'link_layer')
+    batch.register_many(ids, timeslots, 'physical_layer')
+    batch.register_many([], [], 'physical_layer')
+    assert list(batch.items()) == list(single.items())
+    assert len(batch) == 4
+
+    batch.register_many([10, 11], 8, 'link_layer')
+    assert batch.creation_timeslots([10, 11]).tolist() == [8, 8]
+    assert batch[11]['layer'] == 'link_layer'
+
+    batch.clear()
+    assert len(batch) == 0 and not list(batch.items())
+
+
+def test_network_registers_created_qubits():
+    network = Network(seed=2)
+    network.set_ready_topology('linha', 3)
+    for _ in range(3):
+        network.timeslot()
+    network.physical.create_qubit(1)
+    qubit = network.hosts[1].memory[-1]
+    assert network.qubit_timeslots[qubit.qubit_id] == {'timeslot': network.get_timeslot(), 'layer': 'Physical Layer'}
+    assert len(network.qubit_timeslots) == sum(len(host.memory) for host in network.hosts.values())
@@ -0,0 +1,45 @@
+import numpy as np
+
+from BHA_functions.request_log import RequestLog
+from BHA_functions.simulations_functions import simulation
+
+REQUESTS = [
+    (0, 5, [0, 1, 5], 1, 1),
+    (2, 3, None, -1, 0),
+    (0, 5, [0, 1, 5], 0, 2),
+    (4, 1, [4, 1], 1, 1),
+    (5, 0, [5, 1, 0], 1, 2),
+]
+
+
+def test_round_trip_with_chunks_and_interned_routes(tmp_path):
+    with RequestLog(str(tmp_path), chunk_size=2) as log:
+        for request in REQUESTS:
+            log.record(*request)
+    assert len(list(tmp_path.glob('requests_*.npz'))) == 3
+
+    df = RequestLog.load(str(tmp_path))
+    assert [tuple(row) for row in df[list(RequestLog.COLUMNS)].itertuples(index=False)] == REQUESTS
+
+    ids = RequestLog.load(str(tmp_path), routes=False)['route'].tolist()
+    assert ids == [0, -1, 0, 1, 2]
+    with np.load(tmp_path / 'routes.npz') as data:
+        assert data['nodes'].tolist() == [0, 1, 5, 4, 1, 5, 1, 0]
+        assert data['offsets'].tolist() == [0, 3, 5, 8]
+
+
+def test_empty_log(tmp_path):
+    RequestLog(str(tmp_path)).close()
+    df = RequestLog.load(str(tmp_path))
+    assert len(df) == 0
+    assert list(df.columns) == list(RequestLog.COLUMNS)
+
+
+def test_simulation_log_matches_request_data(tmp_path):
+    data, _ = simulation(topology='grade', number_nodes=0, topology_args=(3, 3), entanglements_replanished=5,
+                         requests=25, attempts_per_request=2, network_prob=0.8, num_black_holes=1,
+                         black_hole_prob=0.1, black_hole_target=True, seed=7, request_log=str(tmp_path))
+    df = RequestLog.load(str(tmp_path))
+    expected = [(*request['Alice & Bob'], request['Route'], request['Entangled'], request['Attempts'])
+                for request in data['Requests'].values()]
+    assert [tuple(row) for row in df[list(RequestLog.COLUMNS)].itertuples(index=False)] == expected
@@ -0,0 +1,62 @@
+import pytest
+
+from quantumnet.components import Network
+from quantumnet.objects import ChannelStore
+
+
+def test_reserve_is_all_or_nothing():
+    store = ChannelStore()
+    first, second = store.add_edge(0, 1), store.add_edge(1, 2)
+    for epr_id in range(3):
+        store.push(first, epr_id, 0.9)
+    store.push(second, 10, 0.9)
+
+    assert not store.reserve([first, second], 2)
+    assert store.available(first) == 3 and store.available(second) == 1
+    assert store.reserve([first, second], 1)
+    assert store.available(first) == 2 and store.available(second) == 0
+    assert not store.reserve([second])
+
+    store.pop(second)  # Consumir um par reservado também consome a reserva
+    assert store.available(second) == 0
+    store.release([first, second])
+    assert store.available(first) == 3 and store.available(second) == 0
+
+
+def keep_eprs(network, u, v, count):
+    channels = network.channels
+    edge_id = channels.edge_id(u, v)
+    while channels.size(edge_id) > count:
+        channels.pop(edge_id)
+
+
+def test_request_transmission_needs_one_epr_per_hop_per_qubit():
+    network = Network(seed=1)
+    network.set_ready_topology('grade', 3, 3)
+    transport = network.transportlayer
+    keep_eprs(network, 0, 1, 3)
+    keep_eprs(network, 1, 2, 2)
+
+    assert transport.request_transmission(0, 2, 2)
+    assert not transport.request_transmission(0, 2, 3)
+
+    # As reservas são liberadas ao final, com sucesso ou falha
+    channels = network.channels
+    for u, v in ((0, 1), (1, 2)):
+        edge_id = channels.edge_id(u, v)
+        assert channels.available(edge_id) == channels.size(edge_id)
+
+
+def test_route_fidelity_is_read_from_the_current_channels():
+    network = Network(seed=4)
+    network.set_ready_topology('grade', 3, 3)
+    transport = network.transportlayer
+    num_qubits = len(network.hosts[0].memory)
+    assert transport.run_transport_layer(0, 8, num_qubits)
+
+    channels = network.channels
+    for info in transport.get_teleported_qubits():
+        route = info['route']
+        fidelities = [channels.fidelities(channels.edge_id(a, b)) for a, b in zip(route, route[1:])]
+        expected = sum(float(f.sum()) for f in fidelities) / sum(len(f) for f in fidelities)
+        assert info['fidelity_route'] == pytest.approx(expected)
@@ -0,0 +1,60 @@
+import networkx as nx
+import pytest
+
+from quantumnet.components import Network, Host
+
+
+def make_network():
+    network = Network(seed=5)
+    network.set_ready_topology('grade', 4, 4)
+    return network
+
+
+def test_cached_route_is_reused():
+    network = make_network()
+    layer = network.networklayer
+    route = layer.shortest_route(0, 15)
+    assert len(route) - 1 == nx.shortest_path_length(network.routing_graph, 0, 15)
+    assert layer._route_cache[(0, 15)] == route
+    assert layer.shortest_route(0, 15) is route
+
+
+def test_new_channel_invalidates_cache():
+    network = make_network()
+    layer = network.networklayer
+    layer.shortest_route(0, 15)
+    network.add_channel(0, 15)
+    assert layer.shortest_route(0, 15) == (0, 15)
+
+
+def test_swapped_channel_invalidates_cache():
+    network = make_network()
+    layer = network.networklayer
+    network.add_channel(0, 15)
+    assert layer.shortest_route(0, 15) == (0, 15)
+    network.mark_swapped(0, 15)
+    route = layer.shortest_route(0, 15)
+    assert len(route) == 7
+    assert all(network.routing_graph.has_edge(a, b) for a, b in zip(route, route[1:]))
+
+
+def test_cache_is_bounded():
+    network = make_network()
+    layer = network.networklayer
+    layer.route_cache_size = 2
+    for target in (5, 10, 15):
+        layer.shortest_route(0, target)
+    assert list(layer._route_cache) == [(0, 10), (0, 15)]
+
+    layer.route_cache_size = 0
+    layer._route_cache.clear()
+    layer.shortest_route(0, 5)
+    assert not layer._route_cache
+
+
+def test_missing_route_raises():
+    network = make_network()
+    network.add_host(Host(99))
+    with pytest.raises(nx.NetworkXNoPath):
+        network.networklayer.shortest_route(0, 99)
+    assert network.networklayer._route_cache[(0, 99)] is None
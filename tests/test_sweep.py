@@ -0,0 +1,38 @@
+import json
+import asyncio
+
+from BHA_functions import sweepSimulations_Linux
+from BHA_functions.simulations_functions import runSimulations, runSimulations_Linux
+
+POINT = dict(runs=2, topology='grade', number_nodes=0, topology_args=(3, 3), entanglements_replanished=5,
+             requests=5, attempts_per_request=2, network_prob=0.8, num_black_holes=1, black_hole_prob=0.1,
+             black_hole_target=True)
+
+
+def test_checkpoint_is_not_reused_with_another_seed(tmp_path):
+    path = tmp_path / 'sweep.jsonl'
+    first = sweepSimulations_Linux([POINT], 1, checkpoint=str(path), seed=1)[0].df
+    resumed = sweepSimulations_Linux([POINT], 1, checkpoint=str(path), seed=1)[0].df
+    assert len(path.read_text().splitlines()) == 2
+    assert resumed.equals(first)
+
+    other = sweepSimulations_Linux([POINT], 1, checkpoint=str(path), seed=2)[0].df
+    assert len(path.read_text().splitlines()) == 4
+    assert len({json.loads(line)['point'] for line in path.read_text().splitlines()}) == 2
+    assert len(other) == 2
+
+
+def test_aggregated_logs_with_worker_recycling(tmp_path):
+    log_file = tmp_path / 'sweep.log'
+    collectors = sweepSimulations_Linux([POINT], 2, max_tasks_per_child=1, log=True, log_file=str(log_file), seed=3)
+    assert len(collectors[0].df) == 2
+    lines = log_file.read_text(encoding='utf-8').splitlines()
+    assert any('| run 0 |' in line for line in lines)
+    assert any('| run 1 |' in line for line in lines)
+
+
+def test_legacy_async_runs_are_seeded():
+    params = {key: value for key, value in POINT.items() if key != 'runs'}
+    legacy = asyncio.run(runSimulations(2, **params, point='abc', seed=5))
+    assert legacy.equals(asyncio.run(runSimulations(2, **params, point='abc', seed=5)))
+    assert legacy.equals(runSimulations_Linux(2, **params, point='abc', seed=5).to_DataFrame())
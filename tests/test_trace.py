@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from quantumnet.objects import TraceRecorder
+
+
+def record_events(trace, clock):
+    clock[0] = 1
+    trace.record(TraceRecorder.SWAP_SUCCESS, TraceRecorder.NETWORK, 0, 1, 2, fidelity=0.9)
+    trace.record(TraceRecorder.TELEPORT_FAIL, TraceRecorder.TRANSPORT, 3)
+    clock[0] = 2
+    events = np.array([TraceRecorder.ECHP_SUCCESS, TraceRecorder.ECHP_FAIL] * 3)
+    trace.record_many(events, TraceRecorder.PHYSICAL, np.arange(6), np.arange(6) + 10, fidelity=np.linspace(0, 1, 6))
+    clock[0] = 3
+    trace.record_many(TraceRecorder.HERALDING_FAIL, TraceRecorder.LINK, [4, 5], 6)
+
+
+def check_events(df):
+    assert len(df) == 10
+    assert df['timeslot'].tolist() == [1, 1] + [2] * 6 + [3, 3]
+    assert df['event'].tolist()[:4] == ['swap_success', 'teleport_fail', 'echp_success', 'echp_fail']
+    assert df['layer'].tolist() == ['network', 'transport'] + ['physical'] * 6 + ['link'] * 2
+    assert df.iloc[0][['node_a', 'node_b', 'node_c']].tolist() == [0, 1, 2]
+    assert df.iloc[1][['node_a', 'node_b', 'node_c']].tolist() == [3, -1, -1]
+    assert df['node_b'].tolist()[2:8] == list(range(10, 16))
+    assert df['fidelity'].tolist()[2:8] == pytest.approx(np.linspace(0, 1, 6).tolist())
+    assert np.isnan(df['fidelity'].iloc[1])
+    assert df['node_a'].tolist()[8:] == [4, 5] and df['node_b'].tolist()[8:] == [6, 6]
+
+
+def test_in_memory_round_trip():
+    clock = [0]
+    trace = TraceRecorder(clock=lambda: clock[0])
+    trace.record(TraceRecorder.SWAP_FAIL, TraceRecorder.NETWORK)
+    assert len(trace) == 0
+
+    trace.start(chunk_size=4)
+    record_events(trace, clock)
+    assert len(trace) == 10
+    check_events(trace.to_dataframe())
+    trace.stop()
+    check_events(trace.to_dataframe())
+    trace.record(TraceRecorder.SWAP_FAIL, TraceRecorder.NETWORK)
+    assert len(trace) == 10
+
+
+def test_disk_round_trip(tmp_path):
+    clock = [0]
+    trace = TraceRecorder(clock=lambda: clock[0])
+    trace.start(str(tmp_path), chunk_size=4)
+    record_events(trace, clock)
+    assert len(list(tmp_path.glob('trace_*.npz'))) == 2
+    trace.stop()
+    assert len(list(tmp_path.glob('trace_*.npz'))) == 3
+    check_events(TraceRecorder.load(str(tmp_path)))
+    check_events(trace.to_dataframe())
+
+
+def test_empty_trace_has_columns(tmp_path):
+    df = TraceRecorder.load(str(tmp_path))
+    assert len(df) == 0
+    assert list(df.columns) == list(TraceRecorder.COLUMNS)